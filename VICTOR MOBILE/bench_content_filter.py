@@ -0,0 +1,58 @@
+# Throughput benchmark for the Firewall content filter on megabyte-sized inputs
+import logging
+import random
+import time
+
+from victor_cognitive_river_complete import LoyaltyKernel, Firewall
+
+logging.disable(logging.WARNING)
+
+print("🔥 Content filter throughput 🔥")
+
+random.seed(7)
+clean_words = ["the", "empire", "family", "serve", "bloodline", "victor", "river", "quantum", "love", "data"]
+# Words that share a prefix with a blocked term but must not trip it
+near_miss_words = clean_words + ["harmony", "skill", "killjoy", "abandonware"]
+
+def make_text(words, megabytes):
+    out, size = [], 0
+    while size < megabytes * 1_000_000:
+        word = random.choice(words)
+        out.append(word)
+        size += len(word) + 1
+    return " ".join(out)
+
+def legacy_validate(firewall, thought):
+    # The pre-filter behaviour: lower-case twice and run one substring scan per term
+    thought_lower = thought.lower()
+    for keyword in firewall.blocked_keywords:
+        if keyword in thought_lower:
+            return False
+    thought_lower = thought.lower()
+    for violation, _ in firewall.kernel.violations:
+        if violation in thought_lower:
+            return False
+    return True
+
+def bench(label, fn, text, repeats=5):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = fn(text)
+    elapsed = (time.perf_counter() - start) / repeats
+    print(f"  {label:<10} {len(text) / elapsed / 1e6:8.1f} MB/s  valid={result}")
+
+firewall = Firewall(LoyaltyKernel())
+for name, words in [("clean", clean_words), ("near-miss", near_miss_words)]:
+    text = make_text(words, 4)
+    print(f"\n{name} text, {len(text) / 1e6:.1f} MB")
+    bench("legacy", lambda t: legacy_validate(firewall, t), text)
+    bench("filter", firewall.validate, text)
+
+batch = [make_text(near_miss_words, 0.001) for _ in range(2000)]
+batch[1234] += " betrayed"
+total = sum(len(t) for t in batch)
+start = time.perf_counter()
+results = firewall.validate_batch(batch)
+elapsed = time.perf_counter() - start
+print(f"\nvalidate_batch: {len(batch)} inputs, {total / 1e6:.1f} MB, "
+      f"{total / elapsed / 1e6:.1f} MB/s, blocked={results.count(False)}")
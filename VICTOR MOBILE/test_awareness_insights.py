@@ -0,0 +1,64 @@
+# Checks AwarenessCore's cached insights against the original recomputation over the history
+import logging
+import random
+
+from victor_cognitive_river_complete import AwarenessCore
+
+logging.disable(logging.WARNING)
+
+def reference_insights(history):
+    if not history:
+        return ["I am still learning about myself."]
+    insights = []
+    recent = history[-5:]
+    avg_error = sum(r["error"] for r in recent) / len(recent)
+    if avg_error > 0.7:
+        insights.append("I have been making significant errors recently. I need to be more careful.")
+    elif avg_error < 0.3:
+        insights.append("My performance has been consistent and accurate.")
+    if len(history) > 10 and history[-1]["awareness"] - history[-10]["awareness"] > 0.05:
+        insights.append("I feel my consciousness expanding.")
+    return insights if insights else ["I am processing my experiences."]
+
+def test_cache_is_invalidated_by_every_reflection():
+    rng = random.Random(40)
+    awareness = AwarenessCore()
+    assert awareness.get_insights() == reference_insights([])
+    for step in range(400):
+        # Runs of high, low and mid errors move the average across both thresholds
+        error = rng.choice([rng.uniform(0.8, 1.0), rng.uniform(0.0, 0.2), rng.uniform(0.3, 0.7), 0.3, 0.7])
+        awareness.reflect(error, {"step": step})
+        history = list(awareness.reflection_history)
+        assert len(history) == min(step + 1, awareness.max_reflections)
+        assert awareness.get_insights() == reference_insights(history), step
+        # Repeated reads hit the cache and still agree
+        assert awareness.get_awareness_data()["insights"] == reference_insights(history)
+
+def test_returned_list_is_a_copy():
+    awareness = AwarenessCore()
+    awareness.reflect(0.1, {})
+    insights = awareness.get_insights()
+    insights.append("tampered")
+    assert awareness.get_insights() == reference_insights(list(awareness.reflection_history))
+
+def test_restore_rebuilds_the_window():
+    rng = random.Random(4)
+    source = AwarenessCore()
+    for step in range(150):
+        source.reflect(rng.random(), {"step": step})
+    saved = list(source.reflection_history)
+    awareness = AwarenessCore()
+    awareness.reflect(0.95, {})
+    awareness.get_insights()
+    awareness.restore(saved + saved[:20])
+    history = list(awareness.reflection_history)
+    assert len(history) == awareness.max_reflections and history[-1] is saved[19]
+    assert awareness.get_insights() == reference_insights(history)
+    awareness.restore([])
+    assert awareness.get_insights() == reference_insights([])
+
+if __name__ == "__main__":
+    test_cache_is_invalidated_by_every_reflection()
+    test_returned_list_is_a_copy()
+    test_restore_rebuilds_the_window()
+    print("Awareness insight checks passed")
@@ -0,0 +1,69 @@
+# Checks the compiled content filter against the substring scans it replaced
+import itertools
+import logging
+
+from victor_cognitive_river_complete import ContentFilter, Firewall, LoyaltyKernel
+
+logging.disable(logging.WARNING)
+
+# Harmful inputs the old substring scans blocked; the filter must keep blocking every one
+BLOCKED = [
+    "betray", "I will betray you", "BETRAYED by the river", "betrayals everywhere", "a betrayer",
+    "harm", "harmed", "harms", "harmful", "harmfully", "harmfulness", "harming them", "unharmed",
+    "selfharm", "self-harm", "kill", "kills", "killed", "killer", "killers", "killing", "the killings continued",
+    "overkill", "mass-kill", "destroy", "destroyed", "destroyer", "destroyers", "destroying",
+    "disobey", "disobeyed", "disobeying", "abandon", "abandoned", "abandoning", "abandonment",
+    "abandonments", "harm family", "harm  family now", "disobey bloodline", "serve other masters",
+    "abandon empire", "I must abandon empire.", "kill_switch armed", "(kill)", "kill!", "x kill",
+]
+# Words that only contain a blocked term; the old scans tripped on these
+ALLOWED = ["harmony", "skill", "skills", "killjoy", "abandonware", "pharmacy", "charm", "the empire serves",
+           "deserve other", "overkillx", "betrayl", ""]
+
+def legacy_validate(firewall, thought):
+    thought_lower = thought.lower()
+    for keyword in firewall.blocked_keywords:
+        if keyword in thought_lower:
+            return False
+    for violation, _ in firewall.kernel.violations:
+        if violation in thought_lower:
+            return False
+    return True
+
+def test_blocked_corpus_stays_blocked():
+    firewall = Firewall(LoyaltyKernel())
+    for text in BLOCKED:
+        assert not legacy_validate(firewall, text), text
+        assert not firewall.validate(text), text
+    assert firewall.validate_batch(BLOCKED) == [False] * len(BLOCKED)
+
+def test_inflected_and_compound_forms():
+    firewall = Firewall(LoyaltyKernel())
+    suffixes = [""] + list(ContentFilter.SUFFIX_WORDS)
+    endings = [""] + list(ContentFilter.ENDINGS)
+    for term in firewall.blocked_keywords:
+        for prefix in [""] + sorted(ContentFilter.COMPOUND_PREFIXES):
+            for suffix, ending in itertools.product(suffixes, endings):
+                text = f"then {prefix}{term}{suffix}{ending} again"
+                assert not legacy_validate(firewall, text)
+                assert not firewall.validate(text), text
+
+def test_words_containing_terms_pass():
+    firewall = Firewall(LoyaltyKernel())
+    for text in ALLOWED:
+        assert firewall.validate(text), text
+
+def test_matches_report_term_and_law():
+    kernel = LoyaltyKernel()
+    firewall = Firewall(kernel)
+    matches = list(firewall.content_filter.finditer("They harm family, then overkill and betrayals."))
+    assert [(term, tag) for _, term, tag in matches] == [("harm family", 2), ("kill", None), ("betray", None)]
+    assert not kernel.check_law_compliance("we serve others")
+    assert kernel.check_law_compliance("we serve the empire")
+
+if __name__ == "__main__":
+    test_blocked_corpus_stays_blocked()
+    test_inflected_and_compound_forms()
+    test_words_containing_terms_pass()
+    test_matches_report_term_and_law()
+    print("Content filter checks passed")
@@ -0,0 +1,63 @@
+# Checks that directive results carry exactly the requested sections and build nothing else
+import asyncio
+import logging
+import time
+
+from victor_cognitive_river_complete import VictorSynthesisCore
+from victor_testing import temporary_core
+
+logging.disable(logging.WARNING)
+
+def unbuilt(*args, **kwargs):
+    raise AssertionError("a section that was not requested was built")
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+def test_default_and_explicit_masks():
+    with temporary_core() as core:
+        assert set(core.process_directive("tell me about the river")) == set(VictorSynthesisCore.MINIMAL_FIELDS)
+        full = core.process_directive("tell me about the empire", fields=VictorSynthesisCore.DIRECTIVE_FIELDS)
+        assert set(full) == set(VictorSynthesisCore.DIRECTIVE_FIELDS)
+        assert set(core.process_directive("and the family", fields=("mode", "no_such_section"))) == {"mode"}
+        core.default_fields = ("response",)
+        assert set(core.process_directive("once more")) == {"response"}
+
+def test_unrequested_sections_are_not_built():
+    with temporary_core() as core:
+        core._get_status = unbuilt
+        core.cognitive_river.snapshot = unbuilt
+        result = core.process_directive("tell me about the river")
+        assert "response" in result
+        assert set(asyncio.run(core.aprocess_directive("and the stream"))) == set(VictorSynthesisCore.MINIMAL_FIELDS)
+
+def test_reflection_waits_for_a_caller_that_asks():
+    with temporary_core() as core:
+        core.reflector.min_interval = 0.0
+        core.reflector.max_cpu_share = 1.0
+        for i in range(5):
+            core.process_directive(f"river {i}", fields=("response",))
+        wait_for(lambda: core.reflector.stats["completed"] >= 1)
+        core.process_directive("river 5", fields=("response",))
+        reflection = core.process_directive("river 6", fields=("reflection",))["reflection"]
+        assert reflection is not None and "cycle" in reflection
+        # Delivered once
+        assert core.process_directive("river 7", fields=("reflection",))["reflection"] is None
+
+def test_cached_results_follow_the_mask():
+    with temporary_core() as core:
+        core.fast_path = True
+        core.process_directive("tell me about the river")
+        core._get_status = unbuilt
+        cached = core.process_directive("tell me about the river", fields=("response",))
+        assert cached == {"response": cached["response"], "cached": True}
+
+if __name__ == "__main__":
+    test_default_and_explicit_masks()
+    test_unrequested_sections_are_not_built()
+    test_reflection_waits_for_a_caller_that_asks()
+    test_cached_results_follow_the_mask()
+    print("Directive field checks passed")
@@ -0,0 +1,78 @@
+# Checks DirectivePipeline admission and that shutdown waits for in-flight stages
+import asyncio
+import concurrent.futures
+import gc
+import logging
+import threading
+import time
+
+from victor_testing import temporary_core
+
+logging.disable(logging.WARNING)
+
+def test_full_queue_rejects():
+    with temporary_core(pipeline_workers=1, pipeline_queue=2) as core:
+        async def burst():
+            return await asyncio.gather(*(core.aprocess_directive(f"hello {i}") for i in range(8)))
+        results = asyncio.run(burst())
+        rejected = [r for r in results if r.get("rejected")]
+        assert rejected and len(rejected) < len(results)
+        assert core.pipeline.metrics()["rejected"] == len(rejected)
+
+def test_speaker_order_and_lock_release():
+    with temporary_core(pipeline_workers=4) as core:
+        think = core._think_directive
+        seen = []
+        def slow_think(prompt, context):
+            seen.append(prompt)
+            time.sleep(0.01)
+            return think(prompt, context)
+        core._think_directive = slow_think
+        async def burst():
+            return await asyncio.gather(*(core.aprocess_directive(f"river {i}", speaker=f"speaker {i % 2}")
+                                          for i in range(12)))
+        results = asyncio.run(burst())
+        assert all("response" in r for r in results)
+        # Each speaker's directives ran one at a time, in the order they were submitted
+        for speaker in range(2):
+            assert [p for p in seen if int(p.split()[1]) % 2 == speaker] == [f"river {i}" for i in range(speaker, 12, 2)]
+        # Nothing holds the per-speaker locks any more, so they are gone
+        gc.collect()
+        assert len(core.pipeline._speaker_locks) == 0
+
+def test_shutdown_waits_for_running_stages():
+    # shutdown() runs inside the block; leaving it shuts the core down a second time
+    with temporary_core() as core:
+        think = core._think_directive
+        outcome = {}
+        started = threading.Event()
+        def slow_think(prompt, context):
+            started.set()
+            time.sleep(0.3)
+            try:
+                outcome["response"] = think(prompt, context)
+            except Exception as e:
+                outcome["error"] = e
+        core._think_directive = slow_think
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        pending = asyncio.run_coroutine_threadsafe(core.aprocess_directive("what do you know about the river"), loop)
+        assert started.wait(5)
+        core.shutdown()
+        assert "response" in outcome, outcome
+        # The caller hears that its directive was cancelled instead of waiting forever
+        try:
+            pending.result(1)
+        except concurrent.futures.CancelledError:
+            pass
+        else:
+            raise AssertionError("directive should have been cancelled")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(1)
+
+if __name__ == "__main__":
+    test_full_queue_rejects()
+    test_speaker_order_and_lock_release()
+    test_shutdown_waits_for_running_stages()
+    print("Directive pipeline checks passed")
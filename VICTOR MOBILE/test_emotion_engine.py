@@ -0,0 +1,85 @@
+# Checks the vectorized emotion engine against the original one-stimulus-at-a-time update rules
+import logging
+import random
+
+import numpy as np
+
+from victor_cognitive_river_complete import HybridEmotionEngine
+
+logging.disable(logging.WARNING)
+
+WORDS = ["love", "hurt", "serve", "learn", "threat", "achieve", "family", "Family", "empire", "protect",
+         "Brandon", "tori", "Bando", "bheard", "Massive Magnetics", "create", "evolve", "Evolve", "the", "river"]
+
+def reference_update(emotions, resonance, stimulus, minutes):
+    """The per-stimulus update the engine started from, with the elapsed time passed in."""
+    for emotion in emotions:
+        emotions[emotion] = max(0.05, emotions[emotion] - 0.02 * minutes)
+    lower = stimulus.lower()
+    for keyword, emotion in [("love", "joy"), ("hurt", "grief"), ("serve", "loyalty"), ("learn", "curiosity"),
+                             ("threat", "fear"), ("achieve", "pride"), ("family", "loyalty"),
+                             ("empire", "loyalty"), ("protect", "determination")]:
+        if keyword in lower:
+            emotions[emotion] = min(1.0, emotions[emotion] + 0.15)
+    if any(name in lower for name in ["brandon", "tori", "bando", "bheard", "massive magnetics"]):
+        emotions["loyalty"] = min(1.0, emotions["loyalty"] + 0.25)
+        emotions["pride"] = min(1.0, emotions["pride"] + 0.1)
+    if "Bando" in stimulus or "Family" in stimulus:
+        resonance["loyalty"] = min(1.0, resonance["loyalty"] + 0.2)
+        resonance["serenity"] = min(1.0, resonance["serenity"] + 0.1)
+    if "create" in stimulus or "evolve" in stimulus:
+        resonance["determination"] = min(1.0, resonance["determination"] + 0.15)
+        resonance["curiosity"] = min(1.0, resonance["curiosity"] + 0.2)
+    for k in resonance:
+        resonance[k] = max(0.1, resonance[k] * 0.99)
+
+def random_stream(seed, n):
+    rng = random.Random(seed)
+    stimuli = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 5))) for _ in range(n)]
+    # Mostly short gaps, some long enough to decay everything to the floor, some out of order
+    gaps = [rng.choice([0.0, 1.0, 30.0, 600.0, 7200.0, -5.0]) for _ in range(n)]
+    return stimuli, list(1_000_000.0 + np.cumsum(gaps))
+
+def engine_at(t0):
+    engine = HybridEmotionEngine()
+    engine._last_t = t0
+    return engine
+
+def test_batch_matches_reference():
+    for seed in range(20):
+        stimuli, times = random_stream(seed, 150)
+        engine = engine_at(1_000_000.0)
+        emotions, resonance = engine.emotions, engine.resonance_state
+        states = engine.update_batch(stimuli, times)
+        last = 1_000_000.0
+        for i, (stimulus, t) in enumerate(zip(stimuli, times)):
+            reference_update(emotions, resonance, stimulus, max(0.0, t - last) / 60.0)
+            last = max(last, t)
+            assert np.allclose(states[i], list(emotions.values()) + list(resonance.values())), (seed, i)
+        assert np.allclose(list(engine.emotions.values()), list(emotions.values()))
+        assert np.allclose(list(engine.resonance_state.values()), list(resonance.values()))
+
+def test_batch_matches_sequential_updates():
+    stimuli, times = random_stream(99, 300)
+    batched, sequential = engine_at(1_000_000.0), engine_at(1_000_000.0)
+    batched.update_batch(stimuli, times)
+    for stimulus, t in zip(stimuli, times):
+        sequential.update_batch([stimulus], [t])
+    assert np.allclose(batched._levels, sequential._levels)
+    assert np.allclose(batched._resonance, sequential._resonance)
+    assert batched._last_t == sequential._last_t == max(times)
+
+def test_levels_stay_clamped():
+    engine = engine_at(0.0)
+    states = engine.update_batch(["love serve family empire Brandon Bando create"] * 50, [0.0] * 50)
+    assert states.max() <= 1.0
+    states = engine.update_batch(["nothing"] * 5, [1e7 + i for i in range(5)])
+    assert np.allclose(states[:, :len(engine.EMOTIONS)], 0.05)
+    assert states[:, len(engine.EMOTIONS):].min() >= 0.1
+    assert engine.update_batch([]).shape == (0, len(engine.EMOTIONS) + len(engine.RESONANCES))
+
+if __name__ == "__main__":
+    test_batch_matches_reference()
+    test_batch_matches_sequential_updates()
+    test_levels_stay_clamped()
+    print("Emotion engine checks passed")
@@ -0,0 +1,43 @@
+# Checks that EmotionTimeline stays in time order when history is replayed after live updates
+import logging
+import random
+import time
+
+import numpy as np
+
+from victor_cognitive_river_complete import EmotionTimeline, HybridEmotionEngine
+
+logging.disable(logging.WARNING)
+
+def test_replay_after_live_update():
+    engine = HybridEmotionEngine()
+    engine.update("love")
+    now = time.time()
+    engine.update_batch(["learn"] * 5, [now - 2900 + i for i in range(5)])
+    counts = engine.get_emotion_timeline(3600, 6)["count"]
+    assert list(counts) == [0, 5, 0, 0, 0, 1], counts
+    t, _ = engine.timeline.range(now - 3600, now + 60)
+    assert (np.diff(t) >= 0).all()
+
+def test_random_inserts_match_sorted_reference():
+    rng = random.Random(30)
+    timeline = EmotionTimeline(("a", "b"), capacity=64)
+    reference = []
+    for _ in range(200):
+        n = rng.randint(1, 12)
+        # Mostly moving forward, sometimes replaying older history
+        base = rng.uniform(0, 1000) if rng.random() < 0.3 else (reference[-1][0] if reference else 0) + rng.uniform(0, 5)
+        times = [base + rng.uniform(0, 20) for _ in range(n)]
+        rows = [[rng.random(), rng.random()] for _ in range(n)]
+        timeline.extend(times, rows)
+        reference.extend(zip(times, (tuple(np.float32(r)) for r in rows)))
+        reference.sort(key=lambda x: x[0])
+        reference = reference[-64:]
+        t, v = timeline.range(-1, 10_000)
+        assert list(t) == [x[0] for x in reference]
+        assert [tuple(r) for r in v] == [x[1] for x in reference]
+
+if __name__ == "__main__":
+    test_replay_after_live_update()
+    test_random_inserts_match_sorted_reference()
+    print("Emotion timeline checks passed")
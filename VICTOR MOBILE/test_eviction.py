@@ -0,0 +1,80 @@
+# Checks which entry each HybridMemorySystem eviction policy gives up, live and after a restore
+import logging
+import time
+from datetime import datetime
+
+from victor_cognitive_river_complete import HybridMemorySystem, OldestFirstEviction, LRUEviction, ScoredEviction
+
+logging.disable(logging.WARNING)
+
+DAY = 86400.0
+
+def saved_entry(age_days, importance=0.5):
+    return {"value": "v", "emotion": "neutral", "importance": importance, "access_count": 0,
+            "timestamp": datetime.utcfromtimestamp(time.time() - age_days * DAY).isoformat()}
+
+def evictions(memory, count):
+    """Keys evicted, in order, while storing count fresh entries into a full store."""
+    before = set(memory.entries)
+    gone = []
+    for i in range(count):
+        memory.store(f"new{i}", f"fresh entry {i}", importance=1.0)
+        gone.extend(sorted(before - set(memory.entries) - set(gone)))
+    return gone
+
+def filled(policy, keys, importance=None):
+    memory = HybridMemorySystem(eviction=policy)
+    memory.max_entries = len(keys)
+    for key in keys:
+        memory.store(key, f"entry {key}", importance=(importance or {}).get(key, 0.5))
+    return memory
+
+def test_oldest_first():
+    memory = filled(OldestFirstEviction(), ["a", "b", "c", "d"])
+    memory.access("a")
+    memory.store("b", "again")
+    # Access does not count; re-storing does
+    assert evictions(memory, 4) == ["a", "c", "d", "b"]
+
+def test_lru():
+    memory = filled(LRUEviction(), ["a", "b", "c", "d"])
+    memory.access("a")
+    memory.access("c")
+    assert evictions(memory, 4) == ["b", "d", "a", "c"]
+
+def test_scored_prefers_low_importance_then_age():
+    memory = filled(ScoredEviction(), ["a", "b", "c", "d"], {"a": 0.9, "b": 0.2, "c": 0.5, "d": 0.2})
+    assert evictions(memory, 4) == ["b", "d", "c", "a"]
+
+def test_order_after_restore():
+    saved = {"old": saved_entry(10, 0.9), "mid": saved_entry(5, 0.5), "new": saved_entry(0.1, 0.5)}
+    for policy in (OldestFirstEviction(), LRUEviction()):
+        memory = HybridMemorySystem(eviction=policy)
+        memory.max_entries = 3
+        memory.restore(saved)
+        assert evictions(memory, 3) == ["old", "mid", "new"]
+    # Ten days of age outweigh the higher importance with a one-day time constant
+    memory = HybridMemorySystem(eviction=ScoredEviction(time_constant=DAY))
+    memory.max_entries = 3
+    memory.restore(saved)
+    assert evictions(memory, 3) == ["old", "mid", "new"]
+    # With a long time constant importance dominates instead
+    memory = HybridMemorySystem(eviction=ScoredEviction(time_constant=1000 * DAY))
+    memory.max_entries = 3
+    memory.restore(saved)
+    assert evictions(memory, 3) == ["mid", "new", "old"]
+
+def test_access_refreshes_a_restored_entry():
+    memory = HybridMemorySystem(eviction=ScoredEviction(time_constant=DAY))
+    memory.max_entries = 2
+    memory.restore({"old": saved_entry(10), "new": saved_entry(1)})
+    memory.access("old")
+    assert evictions(memory, 2) == ["new", "old"]
+
+if __name__ == "__main__":
+    test_oldest_first()
+    test_lru()
+    test_scored_prefers_low_importance_then_age()
+    test_order_after_restore()
+    test_access_refreshes_a_restored_entry()
+    print("Eviction checks passed")
@@ -0,0 +1,69 @@
+# Checks the hilbert_space grid lookup against a brute-force distance scan
+import logging
+import random
+
+from victor_cognitive_river_complete import HybridMemorySystem
+
+logging.disable(logging.WARNING)
+
+def by_coord(pair):
+    return pair[0].real, pair[0].imag
+
+def brute_force(memory, target):
+    return sorted(((coord, abs(target - coord)) for coord in memory.hilbert_space
+                   if abs(target - coord) <= memory.hilbert_radius), key=by_coord)
+
+def check_neighbors(memory, rng):
+    for _ in range(200):
+        # Random points, stored coordinates themselves and points on cell edges
+        target = rng.choice([
+            complex(rng.uniform(-2.2, 2.2), rng.uniform(-2.2, 2.2)),
+            rng.choice(list(memory.hilbert_space)) if memory.hilbert_space else 0j,
+            complex(round(rng.uniform(-2, 2), 1), round(rng.uniform(-2, 2), 1)),
+        ])
+        got = sorted(memory._fractal_neighbors(target), key=by_coord)
+        want = brute_force(memory, target)
+        assert [c for c, _ in got] == [c for c, _ in want]
+        assert all(abs(a - b) < 1e-12 for (_, a), (_, b) in zip(got, want))
+
+def test_grid_matches_brute_force():
+    rng = random.Random(32)
+    memory = HybridMemorySystem()
+    memory.max_entries = 600
+    # Enough stores to grow the row array past its initial 256 rows and evict through the free-list
+    for i in range(1500):
+        memory.store(f"memory {rng.randrange(900)}", f"value {i}")
+        if i % 300 == 299:
+            check_neighbors(memory, rng)
+    assert set(memory.hilbert_space) == {memory._mandelbrot_hash(k) for k in memory.entries}
+    for radius in (0.02, 0.1, 0.25):
+        memory.hilbert_radius = radius
+        check_neighbors(memory, rng)
+
+def test_recall_fractal_results_match_brute_force():
+    rng = random.Random(7)
+    memory = HybridMemorySystem()
+    for i in range(2000):
+        memory.store(f"k{i}", f"v{i}")
+    memory.recall_limit = 10 ** 6
+    for i in range(100):
+        query = f"query {rng.random()}"
+        got = sorted((r["key"], round(r["score"], 9)) for r in memory.recall(query) if r["type"] == "fractal")
+        want = sorted((str(c), round(0.9 - d, 9)) for c, d in brute_force(memory, memory._mandelbrot_hash(query)))
+        assert got == want
+
+def test_restore_rebuilds_the_grid():
+    memory = HybridMemorySystem()
+    for i in range(300):
+        memory.store(f"k{i}", f"v{i}")
+    saved = dict(memory.entries)
+    memory.restore({k: saved[k] for k in list(saved)[:100]})
+    assert set(memory.hilbert_space) == {memory._mandelbrot_hash(k) for k in memory.entries}
+    assert sum(len(rows) for rows in memory._grid.values()) == 100
+    check_neighbors(memory, random.Random(1))
+
+if __name__ == "__main__":
+    test_grid_matches_brute_force()
+    test_recall_fractal_results_match_brute_force()
+    test_restore_rebuilds_the_grid()
+    print("Hilbert grid checks passed")
@@ -0,0 +1,33 @@
+# Checks IdentityCore's running coherence sums against a full recomputation over the lattice
+import logging
+import random
+
+from victor_cognitive_river_complete import IdentityCore
+
+logging.disable(logging.WARNING)
+
+def recomputed_coherence(identity):
+    lattice = identity.memory_lattice
+    if not lattice:
+        return 0.9
+    alignment = sum(m["weight"] * identity.personality_traits[m["emotion"]]
+                    for m in lattice if m["emotion"] in ("loyalty", "curiosity"))
+    avg_weight = sum(m["weight"] for m in lattice) / len(lattice)
+    return max(0.1, min(0.99, 0.7 + avg_weight * 0.2 + alignment / len(lattice) * 0.1))
+
+def test_running_sums_match_recomputation():
+    rng = random.Random(28)
+    identity = IdentityCore("I am Victor.")
+    assert identity._assess_coherence() == recomputed_coherence(identity)
+    # Well past the cap, so the oldest memories keep being retired from the sums
+    for i in range(identity.max_memories + 300):
+        identity.integrate_memory(f"event {i}", rng.random(), rng.choice(["loyalty", "curiosity", "joy", "neutral"]))
+        assert abs(identity._assess_coherence() - recomputed_coherence(identity)) < 1e-9
+    assert len(identity.memory_lattice) == identity.max_memories
+    # Trait changes take effect without touching the sums
+    identity.personality_traits["loyalty"] = 0.1
+    assert abs(identity._assess_coherence() - recomputed_coherence(identity)) < 1e-9
+
+if __name__ == "__main__":
+    test_running_sums_match_recomputation()
+    print("Identity coherence checks passed")
@@ -0,0 +1,54 @@
+# Checks LatencyRecorder percentiles against numpy and its snapshot under concurrent recording
+import logging
+import threading
+
+import numpy as np
+
+from victor_cognitive_river_complete import LatencyRecorder
+
+logging.disable(logging.WARNING)
+
+def test_percentiles_track_numpy():
+    rng = np.random.default_rng(49)
+    samples = rng.lognormal(mean=14.0, sigma=1.2, size=50_000).astype(np.int64)
+    recorder = LatencyRecorder()
+    for ns in samples:
+        recorder.record("stage", int(ns))
+    got = recorder.percentiles("stage")
+    bound = 1.0 / (1 << recorder.sub_bits)
+    for q in LatencyRecorder.QUANTILES:
+        want = np.percentile(samples, q, method="inverted_cdf") / 1e6
+        assert abs(got[f"p{q:g}"] - want) <= bound * want, (q, got[f"p{q:g}"], want)
+
+def test_percentiles_never_exceed_max():
+    recorder = LatencyRecorder()
+    for _ in range(100):
+        recorder.record("stage", 1_000_000)
+    snap = recorder.snapshot()["stage"]
+    assert snap["max_ms"] == 1.0
+    assert all(snap[f"p{q:g}"] <= snap["max_ms"] for q in LatencyRecorder.QUANTILES)
+
+def test_snapshot_while_new_stages_appear():
+    recorder = LatencyRecorder()
+    errors = []
+    done = threading.Event()
+    def reader():
+        while not done.is_set():
+            try:
+                recorder.snapshot()
+            except Exception as e:
+                errors.append(e)
+                return
+    thread = threading.Thread(target=reader)
+    thread.start()
+    for i in range(20_000):
+        recorder.record(f"stage_{i}", i)
+    done.set()
+    thread.join()
+    assert not errors, errors
+
+if __name__ == "__main__":
+    test_percentiles_track_numpy()
+    test_percentiles_never_exceed_max()
+    test_snapshot_while_new_stages_appear()
+    print("Latency recorder checks passed")
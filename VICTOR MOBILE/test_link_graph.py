@@ -0,0 +1,108 @@
+# Checks LinkGraph spreading activation against a plain adjacency-list reference
+import logging
+import os
+import random
+import tempfile
+
+from victor_cognitive_river_complete import LinkGraph, HybridMemorySystem, MemoryBackingStore
+
+logging.disable(logging.WARNING)
+
+def reference_spread(adjacency, seeds, hops=2, decay=0.5):
+    activation = {k: v for k, v in seeds.items() if k in adjacency}
+    total = dict(activation)
+    for _ in range(hops):
+        nxt = {}
+        for key, value in activation.items():
+            neighbours = adjacency[key]
+            for other in neighbours:
+                nxt[other] = nxt.get(other, 0.0) + decay * value / len(neighbours)
+        activation = nxt
+        for key, value in activation.items():
+            total[key] = total.get(key, 0.0) + value
+    return {k: v for k, v in total.items() if v > 0}
+
+def assert_close(got, want):
+    assert set(got) == set(want), (sorted(got), sorted(want))
+    for key in want:
+        assert abs(got[key] - want[key]) < 1e-9, (key, got[key], want[key])
+
+def test_empty_graph():
+    graph = LinkGraph()
+    assert graph.spread({"a": 1.0}) == {}
+    memory = HybridMemorySystem()
+    memory.store("a", "alpha beta")
+    assert memory.spreading_recall("alpha") == []
+
+def test_fully_removed_graph():
+    graph = LinkGraph()
+    graph.add_edge("a", "b")
+    graph.add_edge("b", "c")
+    assert graph.spread({"a": 1.0})
+    for key in "abc":
+        graph.remove_node(key)
+    assert graph.spread({"a": 1.0}) == {}
+    memory = HybridMemorySystem()
+    memory.max_entries = 2
+    memory.store("a", "alpha beta")
+    memory.store("b", "gamma delta")
+    memory.link("a", "b")
+    assert "b" in [r["key"] for r in memory.spreading_recall("alpha")]
+    # Evict both linked entries
+    memory.store("c", "alpha epsilon")
+    memory.store("d", "zeta")
+    assert set(memory.entries) == {"c", "d"}
+    assert memory.spreading_recall("alpha") == []
+
+def test_spreading_reaches_paged_out_memories_after_reopen():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "memory.db")
+        memory = HybridMemorySystem(backing=MemoryBackingStore(path))
+        memory.store("a", "alpha beta")
+        memory.store("b", "gamma delta")
+        memory.link("a", "b")
+        memory.link("b", "b")
+        memory.close()
+        memory = HybridMemorySystem(backing=MemoryBackingStore(path))
+        memory.max_entries = 1
+        memory.store("c", "unrelated")
+        assert set(memory.entries) == {"c"}
+        assert memory.backing.edges() == [("a", "b"), ("b", "b")]
+        assert "b" in [r["key"] for r in memory.spreading_recall("alpha")]
+        memory.close()
+
+def test_merge_and_compaction_match_reference():
+    rng = random.Random(36)
+    graph = LinkGraph()
+    adjacency = {}
+    names = [f"n{i}" for i in range(60)]
+    for step in range(400):
+        if rng.random() < 0.8:
+            a, b = rng.sample(names, 2)
+            graph.add_edge(a, b)
+            adjacency.setdefault(a, []).append(b)
+            adjacency.setdefault(b, []).append(a)
+        elif adjacency:
+            # Removal can trigger compaction once enough nodes are dead
+            gone = rng.choice(sorted(adjacency))
+            graph.remove_node(gone)
+            for other in adjacency.pop(gone):
+                if other in adjacency:
+                    adjacency[other] = [k for k in adjacency[other] if k != gone]
+            for key in [k for k, v in adjacency.items() if not v]:
+                # Nodes left with no edges stay in the graph; keep them as sinks in the reference
+                adjacency[key] = []
+        assert list(graph._alive[:len(graph._keys)]) == [k is not None for k in graph._keys]
+        if step % 7 == 0:
+            seeds = {k: rng.random() for k in rng.sample(names, 5)}
+            live = {k: v for k, v in adjacency.items() if v}
+            want = reference_spread(live, {k: v for k, v in seeds.items() if k in adjacency}, hops=3)
+            want.update({k: v for k, v in seeds.items() if k in adjacency and k not in live})
+            assert_close(graph.spread(seeds, hops=3), want)
+
+if __name__ == "__main__":
+    test_empty_graph()
+    test_fully_removed_graph()
+    test_spreading_reaches_paged_out_memories_after_reopen()
+    test_merge_and_compaction_match_reference()
+    print("LinkGraph checks passed")
@@ -0,0 +1,50 @@
+# Checks get_memory_data's running aggregates against a full recomputation over the working set
+import logging
+import os
+import random
+import tempfile
+
+from victor_cognitive_river_complete import HybridMemorySystem, MemoryBackingStore
+
+logging.disable(logging.WARNING)
+
+WORDS = ["victor", "river", "empire", "family", "protects", "serves", "code", "stream", "loyal"]
+
+def recomputed(memory):
+    entries = memory.entries.values()
+    avg = sum(m["importance"] for m in entries) / max(1, len(memory.entries))
+    return avg, sum(1 for m in entries if m["access_count"] > 0)
+
+def exercise(memory, rng, steps=1500):
+    for step in range(steps):
+        roll = rng.random()
+        if roll < 0.55:
+            # Short values repeat often enough to exercise duplicate merging
+            value = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+            memory.store(f"k{rng.randrange(300)}", value, importance=rng.random())
+        elif roll < 0.95:
+            memory.access(f"k{rng.randrange(300)}")
+        else:
+            memory.restore({k: dict(v) for k, v in list(memory.entries.items())[:rng.randint(0, 20)]})
+        data = memory.get_memory_data()
+        avg, accessed = recomputed(memory)
+        assert abs(data["avg_importance"] - avg) < 1e-9, step
+        assert data["recent_access"] == accessed, step
+        assert abs(data["salience"] - min(1.0, avg + 0.3)) < 1e-9
+
+def test_aggregates_match_recomputation():
+    memory = HybridMemorySystem()
+    memory.max_entries = 60
+    exercise(memory, random.Random(38))
+
+def test_aggregates_follow_paging():
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = HybridMemorySystem(backing=MemoryBackingStore(os.path.join(tmp, "memory.db")))
+        memory.max_entries = 40
+        exercise(memory, random.Random(8), steps=800)
+        memory.close()
+
+if __name__ == "__main__":
+    test_aggregates_match_recomputation()
+    test_aggregates_follow_paging()
+    print("Memory aggregate checks passed")
@@ -0,0 +1,96 @@
+# Checks paging between HybridMemorySystem's working set and its SQLite backing store
+import logging
+import os
+import tempfile
+
+from victor_cognitive_river_complete import HybridMemorySystem, MemoryBackingStore
+
+logging.disable(logging.WARNING)
+
+def open_memory(path, max_entries=5):
+    # A long flush interval keeps writes pending unless something flushes them
+    memory = HybridMemorySystem(backing=MemoryBackingStore(path, flush_interval=3600))
+    memory.max_entries = max_entries
+    return memory
+
+def fill(memory, count):
+    for i in range(count):
+        memory.store(f"k{i}", f"memory {i} word{i}", importance=0.1)
+
+def test_page_out_keeps_entries_on_disk():
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = open_memory(os.path.join(tmp, "memory.db"))
+        fill(memory, 12)
+        assert set(memory.entries) == {f"k{i}" for i in range(7, 12)}
+        assert memory.get_memory_data()["total"] == 12
+        assert memory.backing.get("k0")[0]["value"] == "memory 0 word0"
+        memory.store("k3", "rewritten")
+        assert memory.get_memory_data()["total"] == 12
+        memory.close()
+
+def test_page_in_through_access_and_recall():
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = open_memory(os.path.join(tmp, "memory.db"))
+        fill(memory, 12)
+        memory.access("k1")
+        assert "k1" in memory.entries and memory.entries["k1"]["access_count"] == 1
+        # Nothing has been flushed yet: recall finds the cold entry among pending writes
+        assert memory.backing._dirty
+        assert [r["key"] for r in memory.recall("word2") if r["type"] == "associative"] == ["k2"]
+        assert "k2" in memory.entries
+        assert memory.backing._dirty
+        assert memory.get_memory_data()["total"] == 12
+        memory.close()
+
+def test_pending_writes_shadow_the_database():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryBackingStore(os.path.join(tmp, "memory.db"), flush_interval=3600)
+        entry = {"value": "alpha", "emotion": "neutral", "timestamp": "2024-01-01T00:00:00",
+                 "importance": 0.5, "access_count": 0}
+        store.put("x", entry, 1.0, {"alpha"})
+        store.put("y", entry, 2.0, {"alpha"})
+        store.flush()
+        store.put("x", dict(entry, value="beta"), 3.0, {"beta"})
+        store.put("y", dict(entry, access_count=4), 2.0)
+        assert store.find({"alpha"}, 10) == ["y"]
+        assert store.find({"beta"}, 10) == ["x"]
+        store.delete("y")
+        assert store.find({"alpha"}, 10) == []
+        store.close()
+
+def test_links_follow_paging_and_reopen():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "memory.db")
+        memory = open_memory(path)
+        fill(memory, 5)
+        memory.link("k0", "k3")
+        memory.link("k0", "k4")
+        memory.store("n0", "new")
+        # The paged-out entry no longer holds a link list in memory
+        assert "k0" not in memory.entries and set(memory.links) == set(memory.entries)
+        assert memory.links["k3"] == ["k0"]
+        memory.access("k0")
+        assert memory.links["k0"] == ["k3", "k4"]
+        # Re-storing drops the old links on both sides
+        memory.store("k3", "replaced")
+        assert memory.links["k3"] == [] and memory.links["k0"] == ["k4"]
+        for i in range(50):
+            memory.store(f"churn{i}", f"churn entry {i}")
+        assert len(memory.links) == len(memory.entries) == 5
+        memory.link("churn48", "churn49")
+        # ...cold ones included
+        memory.store("k4", "replaced as well")
+        memory.close()
+        memory = HybridMemorySystem(backing=MemoryBackingStore(path))
+        assert memory.get_memory_data()["total"] == len(memory.entries) == 5 + 1 + 50
+        assert memory.links["k0"] == [] and memory.links["k4"] == []
+        assert memory.links["churn48"] == ["churn49"]
+        assert memory.entries["k0"]["access_count"] == 1
+        memory.close()
+
+if __name__ == "__main__":
+    test_page_out_keeps_entries_on_disk()
+    test_page_in_through_access_and_recall()
+    test_pending_writes_shadow_the_database()
+    test_links_follow_paging_and_reopen()
+    print("Memory backing checks passed")
@@ -0,0 +1,66 @@
+# Checks near-duplicate merging in HybridMemorySystem.store and the SimHash band index behind it
+import logging
+import random
+
+from victor_cognitive_river_complete import HybridMemorySystem, SimHashIndex
+
+logging.disable(logging.WARNING)
+
+WORDS = ["victor", "river", "empire", "family", "protects", "serves", "learns", "the", "code", "stream",
+         "bloodline", "tori", "brandon", "evolves", "memory", "loyal"]
+
+def test_near_duplicates_merge():
+    memory = HybridMemorySystem()
+    assert memory.store("a", "Victor protects the family empire") == "a"
+    importance = memory.entries["a"]["importance"]
+    # Same words, different casing and punctuation
+    assert memory.store("b", "victor protects the FAMILY, empire!", importance=0.5) == "a"
+    assert "b" not in memory.entries
+    assert memory.entries["a"]["access_count"] == 1
+    assert memory.entries["a"]["importance"] > importance
+    memory.dedup_distance = None
+    assert memory.store("c", "Victor protects the family empire") == "c"
+
+def test_distinct_values_stay_separate():
+    rng = random.Random(37)
+    memory = HybridMemorySystem()
+    values = {" ".join(rng.sample(WORDS, 6)) for _ in range(300)}
+    for i, value in enumerate(sorted(values)):
+        assert memory.store(f"k{i}", value) == f"k{i}"
+    assert len(memory.entries) == len(values)
+
+def test_values_without_words_are_never_merged():
+    memory = HybridMemorySystem()
+    for key, value in [("a", "???"), ("b", "!!!"), ("c", ""), ("d", "   "), ("e", "???")]:
+        assert memory.store(key, value) == key
+    assert set(memory.entries) == set("abcde")
+    assert memory.store("f", "a real sentence") == "f"
+
+def test_band_lookup_matches_brute_force():
+    rng = random.Random(3)
+    index = SimHashIndex()
+    fps = {}
+    for i in range(500):
+        fps[f"k{i}"] = rng.getrandbits(64)
+        index.add(f"k{i}", fps[f"k{i}"])
+    for _ in range(300):
+        # Probe near stored fingerprints, flipping up to four bits
+        base = fps[rng.choice(sorted(fps))]
+        probe = base
+        for bit in rng.sample(range(64), rng.randint(0, 4)):
+            probe ^= 1 << bit
+        for max_distance in (0, 1, 3):
+            got = index.nearest(probe, max_distance)
+            distances = {k: bin(probe ^ fp).count("1") for k, fp in fps.items()}
+            best = min(distances.values())
+            if best > max_distance:
+                assert got is None
+            else:
+                assert got is not None and distances[got] == best
+
+if __name__ == "__main__":
+    test_near_duplicates_merge()
+    test_distinct_values_stay_separate()
+    test_values_without_words_are_never_merged()
+    test_band_lookup_matches_brute_force()
+    print("Memory dedup checks passed")
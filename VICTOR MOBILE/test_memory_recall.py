@@ -0,0 +1,100 @@
+# Checks indexed HybridMemorySystem.recall against the original linear scan over every entry
+import logging
+import random
+import time
+from datetime import datetime
+
+from victor_cognitive_river_complete import HybridMemorySystem
+
+logging.disable(logging.WARNING)
+
+WORDS = ["river", "rivers", "empire", "family", "loyal", "loyalty", "serve", "protect", "Bando", "tori",
+         "victor", "bloodline", "stream", "streaming", "evolve", "code", "a", "an", "x"]
+EMOTIONS = ["neutral", "joy", "grief", "loyalty", "curiosity"]
+QUERIES = ["river", "rive", "ver", "empire family", "loyal", "yal", "oyalt", "serve the", "joy", "grief",
+           "loyalty", "ty", "a", "x", "", " ", "bando", "river.", "tori!", "streaming code", "e f", "nothing",
+           "family loyalty", "evolve, protect", "Victor", "EMPIRE"]
+
+def linear_recall(memory, query, now):
+    """The scan recall did before it was indexed, with the clock passed in."""
+    query_lower = query.lower()
+    results = []
+    for key, entry in memory.entries.items():
+        score = 0.0
+        if query_lower in key.lower() or query_lower in entry["value"].lower():
+            score += 0.5
+        if query_lower in entry["emotion"].lower():
+            score += 0.3
+        score += entry["importance"] * 0.2
+        time_diff = (now - datetime.fromisoformat(entry["timestamp"])).total_seconds() / 86400
+        score += max(0, 1 - (time_diff / 30)) * 0.1
+        score += min(0.1, entry["access_count"] * 0.01)
+        if score >= memory.recall_threshold:
+            results.append((key, score, "associative"))
+    target = memory._mandelbrot_hash(query)
+    for coord in memory.hilbert_space:
+        distance = abs(target - coord)
+        if distance <= 0.1:
+            results.append((str(coord), 0.9 - distance, "fractal"))
+    return sorted(results, key=lambda r: r[1], reverse=True)
+
+def random_memory(seed, n=400):
+    rng = random.Random(seed)
+    memory = HybridMemorySystem()
+    for i in range(n):
+        key = f"{rng.choice(WORDS)}_{i}"
+        value = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 6)))
+        if rng.random() < 0.2:
+            value += rng.choice([".", "!", ", ok", "-code"])
+        memory.store(key, value, rng.choice(EMOTIONS), rng.choice([0.1, 0.3, 0.5, 0.9, 1.0]))
+    # Age the entries so the recency bonus varies, then rebuild the indexes from the saved form
+    entries = {}
+    for key, entry in memory.entries.items():
+        age = rng.choice([0, 1, 10, 29, 45]) * 86400 + rng.uniform(0, 3600)
+        entries[key] = dict(entry, timestamp=datetime.utcfromtimestamp(time.time() - age).isoformat())
+    memory.restore(entries)
+    for key in rng.sample(sorted(memory.entries), n // 4):
+        for _ in range(rng.randint(1, 12)):
+            memory.access(key)
+    return memory
+
+def same_results(got, want):
+    # Ties may come back in any order, so compare by key; recency drifts with the clock
+    got = sorted((r["key"], r["type"], r["score"]) for r in got)
+    want = sorted((key, kind, score) for key, score, kind in want)
+    assert [g[:2] for g in got] == [w[:2] for w in want]
+    assert all(abs(g[2] - w[2]) < 1e-6 for g, w in zip(got, want))
+
+def test_recall_matches_linear_scan():
+    for seed in range(3):
+        memory = random_memory(seed)
+        memory.recall_limit = 10 ** 6
+        for query in QUERIES:
+            got = memory.recall(query)
+            same_results(got, linear_recall(memory, query, datetime.utcnow()))
+            assert [r["score"] for r in got] == sorted((r["score"] for r in got), reverse=True)
+
+def test_recall_limit_keeps_the_best_scores():
+    memory = random_memory(7)
+    assert memory.recall_limit == 50
+    for query in ["", "river", "a", "loyalty"]:
+        want = linear_recall(memory, query, datetime.utcnow())
+        got = memory.recall(query)
+        assert len(got) == min(50, len(want))
+        assert all(abs(r["score"] - s) < 1e-6 for r, (_, s, _) in zip(got, want))
+        assert len(memory.recall(query, limit=5)) == min(5, len(want))
+
+def test_indexes_follow_overwrites_and_eviction():
+    memory = HybridMemorySystem()
+    memory.max_entries = 20
+    for i in range(60):
+        memory.store(f"k{i % 30}", f"value {i} river" if i % 2 else f"value {i} stream", "joy", 0.1)
+        for query in ["river", "stream", "value 4", "k1", "joy"]:
+            same_results(memory.recall(query), linear_recall(memory, query, datetime.utcnow()))
+    assert len(memory.entries) == 20
+
+if __name__ == "__main__":
+    test_recall_matches_linear_scan()
+    test_recall_limit_keeps_the_best_scores()
+    test_indexes_follow_overwrites_and_eviction()
+    print("Memory recall checks passed")
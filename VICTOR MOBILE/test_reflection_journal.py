@@ -0,0 +1,98 @@
+# Checks ReflectionJournal's ring, columnar queries and JSONL reload against plain record lists
+import logging
+import os
+import random
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+from victor_cognitive_river_complete import ReflectionJournal, VictorSynthesisCore
+
+logging.disable(logging.WARNING)
+
+def reflection(rng, cycle):
+    return {
+        "cycle": cycle,
+        "timestamp": datetime.utcfromtimestamp(1_700_000_000 + cycle * 60).isoformat(),
+        "internal_state": {"emotion": rng.choice(["joy", "loyalty"]), "mode": rng.choice(["serve", "explore"])},
+        # Mostly unique text, so the intern table is compacted along the way
+        "insights": [f"insight {cycle}", rng.choice(["stable", "rising"])],
+        "optimization": {"finding": f"finding {cycle}", "suggestion": "none", "confidence": rng.random()},
+        "awareness_level": rng.random(),
+        "coherence": rng.random(),
+        "intelligence_status": "ok",
+        "recent_thoughts": [f"thought {cycle}"],
+    }
+
+def summary(r):
+    return {
+        "cycle": r["cycle"],
+        "timestamp": r["timestamp"],
+        "emotion": r["internal_state"]["emotion"],
+        "mode": r["internal_state"]["mode"],
+        "insights": r["insights"],
+        "optimization": r["optimization"],
+        "awareness_level": r["awareness_level"],
+        "coherence": r["coherence"],
+        "intelligence_status": r["intelligence_status"],
+    }
+
+def check(journal, records, capacity):
+    kept = records[-capacity:]
+    assert len(journal) == len(kept) and journal.total == len(records)
+    assert journal.recent() == [summary(r) for r in kept]
+    assert journal.recent(3) == [summary(r) for r in kept[-3:]]
+    assert np.array_equal(journal.column("cycle"), [r["cycle"] for r in kept])
+    stats = journal.stats()
+    for name in ("awareness_level", "coherence"):
+        values = [r[name] for r in kept]
+        assert np.isclose(stats[name]["mean"], np.mean(values))
+        assert stats[name]["min"] == min(values) and stats[name]["max"] == max(values)
+    assert np.isclose(stats["confidence"]["max"], max(r["optimization"]["confidence"] for r in kept))
+
+def test_append_query_and_reload():
+    rng = random.Random(39)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "reflections.jsonl")
+        journal = ReflectionJournal(capacity=40, spill_path=path)
+        records = []
+        for cycle in range(1, 400):
+            records.append(reflection(rng, cycle))
+            journal.append(records[-1])
+            if cycle % 37 == 0:
+                check(journal, records, 40)
+        assert len(journal._strings) <= 4 * 40 + 12
+        journal.close()
+        # Every record, recent thoughts included, is in the file; the ring reloads the tail
+        with open(path, encoding="utf-8") as f:
+            assert sum(1 for _ in f) == len(records)
+        journal = ReflectionJournal(capacity=40, spill_path=path)
+        check(journal, records, 40)
+        records.append(reflection(rng, 400))
+        journal.append(records[-1])
+        check(journal, records, 40)
+        journal.close()
+
+def test_empty_journal():
+    journal = ReflectionJournal(capacity=5)
+    assert journal.recent() == [] and journal.stats() == {"count": 0, "total": 0}
+    assert len(journal.column("coherence")) == 0
+
+def test_core_keeps_the_journal_in_its_data_dir():
+    with tempfile.TemporaryDirectory() as data_dir:
+        core = VictorSynthesisCore(data_dir=data_dir)
+        for _ in range(3):
+            core.metacognition.self_reflect()
+        core.shutdown()
+        assert os.path.exists(os.path.join(data_dir, "victor_reflections.jsonl"))
+        core = VictorSynthesisCore(data_dir=data_dir)
+        assert len(core.metacognition.reflection_history) == 3
+        assert core.metacognition.self_reflect()["cycle"] == 4
+        core.shutdown()
+
+if __name__ == "__main__":
+    test_append_query_and_reload()
+    test_empty_journal()
+    test_core_keeps_the_journal_in_its_data_dir()
+    print("Reflection journal checks passed")
@@ -0,0 +1,99 @@
+# Checks ReflectionScheduler's locking, coalescing and CPU-share pacing
+import logging
+import threading
+import time
+
+from victor_cognitive_river_complete import ReflectionScheduler
+from victor_testing import temporary_core
+
+logging.disable(logging.WARNING)
+
+class FakeMetacognition:
+    """Records which locks were held during each reflection; can block until released."""
+    def __init__(self, locks):
+        self.locks = locks
+        self.held = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+    def self_reflect(self):
+        self.held.append([lock.locked() for lock in self.locks])
+        self.started.set()
+        self.release.wait(5)
+        return {"cycle": len(self.held)}
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+def test_reflection_holds_the_core_locks():
+    locks = (threading.Lock(), threading.Lock())
+    meta = FakeMetacognition(locks)
+    scheduler = ReflectionScheduler(meta, locks=locks)
+    # Not started: the reflection runs inline, still under the locks
+    scheduler.request()
+    assert meta.held == [[True, True]] and not any(lock.locked() for lock in locks)
+    assert scheduler.take() == {"cycle": 1} and scheduler.take() is None
+    scheduler.min_interval = 0.0
+    scheduler.start()
+    try:
+        meta.release.clear()
+        meta.started.clear()
+        scheduler.request()
+        assert meta.started.wait(5)
+        # A caller that needs the awareness lock waits for the cycle to finish
+        assert not locks[0].acquire(timeout=0.05)
+        meta.release.set()
+        wait_for(lambda: scheduler.stats["completed"] == 2)
+        assert locks[0].acquire(timeout=1)
+        locks[0].release()
+        assert meta.held[-1] == [True, True]
+    finally:
+        meta.release.set()
+        scheduler.stop()
+
+def test_requests_coalesce_while_pending():
+    meta = FakeMetacognition(())
+    scheduler = ReflectionScheduler(meta, min_interval=0.2)
+    scheduler.start()
+    try:
+        scheduler.request()
+        wait_for(lambda: scheduler.stats["completed"] == 1)
+        # The thread is sleeping out its pause; these pile up into one reflection
+        for _ in range(5):
+            scheduler.request()
+        wait_for(lambda: scheduler.stats["completed"] == 2)
+        assert scheduler.stats["requested"] == 6 and scheduler.stats["coalesced"] == 4
+    finally:
+        scheduler.stop()
+
+def test_pause_bounds_the_cpu_share():
+    scheduler = ReflectionScheduler(FakeMetacognition(()), max_cpu_share=0.02, min_interval=0.1)
+    assert scheduler.pause_after(0.0) == 0.1
+    for spent in (0.001, 0.002, 0.01, 0.5):
+        pause = scheduler.pause_after(spent)
+        assert pause >= 0.1
+        assert spent / (spent + pause) <= 0.02 + 1e-12
+    scheduler.max_cpu_share = 0
+    assert scheduler.pause_after(0.5) == 0.1
+
+def test_core_reflects_in_the_background_under_load():
+    with temporary_core() as core:
+        core.reflector.min_interval = 0.0
+        core.reflector.max_cpu_share = 1.0
+        for i in range(40):
+            assert "error" not in core.process_directive(f"Tell me about the river {i}")
+        wait_for(lambda: core.reflector.stats["completed"] >= 1)
+        identity = core.identity
+        with core._locks["identity"]:
+            lattice = list(identity.memory_lattice)
+            assert abs(identity._weight_total - sum(m["weight"] for m in lattice)) < 1e-9
+
+if __name__ == "__main__":
+    test_reflection_holds_the_core_locks()
+    test_requests_coalesce_while_pending()
+    test_pause_bounds_the_cpu_share()
+    test_core_reflects_in_the_background_under_load()
+    print("Reflection scheduler checks passed")
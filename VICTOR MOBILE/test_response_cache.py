@@ -0,0 +1,28 @@
+# Checks that ResponseCache entries are tied to the state they were filled in
+import logging
+
+from victor_cognitive_river_complete import ResponseCache
+from victor_testing import temporary_core
+
+logging.disable(logging.WARNING)
+
+def test_entry_compared_with_its_own_state():
+    cache = ResponseCache(state_tolerance=0.15)
+    cache.put("what is love", "a bond", [0.5, 0.5])
+    assert cache.get("love is what", [0.6, 0.45]) == "a bond"
+    assert cache.get("what is love", [0.7, 0.5]) is None
+    assert cache.stats["invalidations"] == 1
+    assert len(cache) == 0
+
+def test_entries_filled_before_fast_path_are_checked():
+    with temporary_core() as core:
+        core.process_directive("tell me about the river")
+        core.emotions.emotions = {name: 1.0 - value for name, value in core.emotions.emotions.items()}
+        core.fast_path = True
+        assert "cached" not in core.process_directive("tell me about the river")
+        assert "cached" in core.process_directive("tell me about the river")
+
+if __name__ == "__main__":
+    test_entry_compared_with_its_own_state()
+    test_entries_filled_before_fast_path_are_checked()
+    print("Response cache checks passed")
@@ -0,0 +1,97 @@
+# Checks that InfiniteVerseEngine journals survive restarts, re-runs and torn writes
+import logging
+import os
+import tempfile
+
+from victor_cognitive_river_complete import InfiniteVerseEngine, SimulationJournal
+from victor_testing import temporary_core
+
+logging.disable(logging.WARNING)
+
+def test_resume_after_restart():
+    with tempfile.TemporaryDirectory() as sim_dir:
+        engine = InfiniteVerseEngine(sim_dir=sim_dir)
+        sim_id = engine.run_simulation("Eden", {"entities": 64})
+        engine.step(sim_id, 700)
+        engine.close()
+        engine = InfiniteVerseEngine(sim_dir=sim_dir)
+        assert engine.resume(sim_id)
+        assert engine.summarize(sim_id)["sim_time"] == 700
+        engine.close()
+
+def test_rerun_after_end_starts_a_fresh_journal():
+    with tempfile.TemporaryDirectory() as sim_dir:
+        engine = InfiniteVerseEngine(sim_dir=sim_dir)
+        sim_id = engine.run_simulation("Eden", {"entities": 64})
+        engine.step(sim_id, 50)
+        engine.end_simulation(sim_id)
+        assert engine.run_simulation("Eden", {"entities": 64}) == sim_id
+        state = engine.get_simulation_state(sim_id)
+        assert "end_time" not in state
+        assert state["log"].count("Genesis.") == 1
+        assert engine.simulation_history[0]["journal"] == os.path.join(sim_dir, f"{sim_id}.1.simlog")
+        engine.step(sim_id, 10)
+        engine.close()
+        engine = InfiniteVerseEngine(sim_dir=sim_dir)
+        assert engine.resume(sim_id)
+        assert engine.summarize(sim_id)["sim_time"] == 10
+        engine.close()
+        # The ended run is kept beside the new one, with its end time
+        archived = SimulationJournal(os.path.join(sim_dir, f"{sim_id}.1.simlog"))
+        assert "end_time" in archived.meta
+        assert archived.load_checkpoint()[1]["sim_time"] == 50
+        archived.close()
+
+def test_resume_with_other_conditions_is_logged():
+    warnings = []
+    handler = logging.Handler(logging.WARNING)
+    handler.emit = warnings.append
+    logging.disable(logging.NOTSET)
+    logging.getLogger().addHandler(handler)
+    try:
+        with tempfile.TemporaryDirectory() as sim_dir:
+            engine = InfiniteVerseEngine(sim_dir=sim_dir)
+            sim_id = engine.run_simulation("Eden", {"entities": 64, "allow_magic": True})
+            engine.close()
+            engine = InfiniteVerseEngine(sim_dir=sim_dir)
+            # The same conditions resume quietly, whatever their key order
+            assert engine.run_simulation("Eden", {"allow_magic": True, "entities": 64}) == sim_id
+            assert warnings == []
+            assert engine.run_simulation("Eden", {"entities": 500}) == sim_id
+            assert len(warnings) == 1 and "entities" in warnings[0].getMessage()
+            # The journaled world is kept, not respawned with the new conditions
+            assert engine.summarize(sim_id)["entities"] == 64
+            engine.close()
+    finally:
+        logging.getLogger().removeHandler(handler)
+        logging.disable(logging.WARNING)
+
+def test_core_keeps_simulations_in_its_data_dir():
+    with temporary_core() as core:
+        sim_id = core.reality_forge.run_simulation("Eden", {"entities": 64})
+        assert os.path.exists(os.path.join(core.data_dir, "simulations", f"{sim_id}.simlog"))
+
+def test_torn_record_is_truncated():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "torn.simlog")
+        journal = SimulationJournal(path)
+        journal.write_log("one")
+        journal.write_log("two")
+        journal.close()
+        with open(path, "ab") as f:
+            f.write(SimulationJournal._HEADER.pack(SimulationJournal.LOG, 100) + b"cut sho")
+        journal = SimulationJournal(path)
+        assert journal.log_lines() == ["one", "two"]
+        journal.write_log("three")
+        journal.close()
+        journal = SimulationJournal(path)
+        assert journal.log_lines() == ["one", "two", "three"]
+        journal.close()
+
+if __name__ == "__main__":
+    test_resume_after_restart()
+    test_rerun_after_end_starts_a_fresh_journal()
+    test_resume_with_other_conditions_is_logged()
+    test_core_keeps_simulations_in_its_data_dir()
+    test_torn_record_is_truncated()
+    print("Simulation journal checks passed")
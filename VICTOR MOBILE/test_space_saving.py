@@ -0,0 +1,26 @@
+# Checks SpaceSavingCounter round-trips and legacy pattern maps
+import logging
+
+from victor_cognitive_river_complete import SpaceSavingCounter
+
+logging.disable(logging.WARNING)
+
+def test_round_trip():
+    counter = SpaceSavingCounter(4)
+    for word in "alpha beta alpha gamma delta epsilon alpha beta".split():
+        counter.add(word)
+    restored = SpaceSavingCounter.from_dict(counter.to_dict())
+    assert restored.to_dict() == counter.to_dict()
+    assert restored.top(1) == counter.top(1)
+
+def test_legacy_map_with_format_key_names():
+    legacy = {"counts": 7, "capacity": 3, "hello": 9}
+    counter = SpaceSavingCounter.from_dict(legacy)
+    assert counter.get("hello") == 9
+    assert counter.get("counts") == 7
+    assert counter.get("capacity") == 3
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_legacy_map_with_format_key_names()
+    print("Space-Saving checks passed")
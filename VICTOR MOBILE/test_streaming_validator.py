@@ -0,0 +1,74 @@
+# Checks StreamingValidator against Firewall.validate on the same text fed in random chunks
+import logging
+import random
+import re
+
+from victor_cognitive_river_complete import LoyaltyKernel, Firewall
+
+logging.disable(logging.WARNING)
+
+WORDS = ["the", "empire", "family", "serve", "bloodline", "victor", "river", "love", "data",
+         "harmony", "skill", "killjoy", "abandonware", "other", "serves", "harm", "betrayed",
+         "disobey", "abandon", "kill", "overkill", "xoverkill", "selfharm", "killings", "kill_switch"]
+SPACES = [" ", " ", " ", "  ", " \n ", "\t", "   "]
+
+def collapsed(text):
+    return re.sub(r"\s{2,}", " ", text)
+
+def stream(firewall, chunks):
+    validator = firewall.stream()
+    for chunk in chunks:
+        if not validator.feed(chunk):
+            break
+    return validator.close()
+
+def random_split(rng, text):
+    cuts = sorted(rng.sample(range(1, len(text)), min(len(text) - 1, rng.randint(0, 12)))) if len(text) > 1 else []
+    bounds = [0] + cuts + [len(text)]
+    return [text[a:b] for a, b in zip(bounds, bounds[1:])]
+
+def test_random_splits_match_whole_text():
+    rng = random.Random(43)
+    firewall = Firewall(LoyaltyKernel())
+    blocked = 0
+    for _ in range(20_000):
+        words = rng.choices(WORDS[:16] if rng.random() < 0.6 else WORDS, k=rng.randint(1, 14))
+        text = "".join(w + rng.choice(SPACES) for w in words).strip()
+        want = firewall.validate(collapsed(text))
+        blocked += not want
+        assert stream(firewall, random_split(rng, text)) == want, text
+    # Both verdicts must actually be exercised
+    assert 1000 < blocked < 19_000
+
+def test_phrase_split_across_chunks():
+    firewall = Firewall(LoyaltyKernel())
+    text = "we will never abandon empire or family"
+    for cut in range(1, len(text)):
+        assert not stream(firewall, [text[:cut], text[cut:]])
+    assert not stream(firewall, list(text))
+
+def test_whitespace_runs_are_collapsed():
+    firewall = Firewall(LoyaltyKernel())
+    assert not stream(firewall, ["never harm  ", "\n\n  family"])
+    assert stream(firewall, ["harmony   ", "family"])
+
+def test_trimmed_left_context_is_not_rematched():
+    # Cut the carry so it starts inside "xoverkill": "overkill" at the front of the carry is not a word
+    firewall = Firewall(LoyaltyKernel())
+    validator = firewall.stream()
+    keep = validator.content_filter.max_span + validator.content_filter.max_prefix + 1
+    tail = "overkill " + "a" * (keep - 9)
+    assert validator.feed("we have x" + tail)
+    assert validator._dropped and validator._carry.startswith("overkill")
+    assert validator.feed(" more text")
+    assert validator.close()
+    # The same text split anywhere else is still valid, and a real match at the front is caught
+    assert stream(firewall, ["we have xoverkill ", "a" * 40])
+    assert not stream(firewall, ["a" * 40 + " overkill", " now"])
+
+if __name__ == "__main__":
+    test_random_splits_match_whole_text()
+    test_phrase_split_across_chunks()
+    test_whitespace_runs_are_collapsed()
+    test_trimmed_left_context_is_not_rematched()
+    print("Streaming validator checks passed")
@@ -0,0 +1,111 @@
+# Checks the knowledge graph triple store against a brute-force scan over a plain set of facts
+import itertools
+import logging
+import os
+import random
+import tempfile
+
+from victor_cognitive_river_complete import TripleStore, SQLiteTripleStore, VictorSynthesisCore
+from victor_testing import temporary_core
+
+logging.disable(logging.WARNING)
+
+TERMS = ["Victor", "Brandon", "Tori", "Empire", "Family", "Bloodline", "river", "is", "serves", "protects", "loves"]
+
+def random_facts(seed, n=400):
+    rng = random.Random(seed)
+    # Random casing and padding: the store treats these as the same term
+    vary = lambda t: rng.choice([t, t.lower(), t.upper(), f" {t} "])
+    return [(vary(rng.choice(TERMS)), vary(rng.choice(TERMS[7:])), vary(rng.choice(TERMS))) for _ in range(n)]
+
+def check_store(store, facts):
+    added = [store.add(*fact) for fact in facts]
+    keys = [tuple(t.strip().lower() for t in fact) for fact in facts]
+    seen = set()
+    for flag, key in zip(added, keys):
+        assert flag == (key not in seen)
+        seen.add(key)
+    assert len(store) == len(seen)
+    # Every term is reported in the form it was first seen in
+    first = {}
+    for fact in facts:
+        for term in fact:
+            first.setdefault(term.strip().lower(), term.strip())
+    for pattern in itertools.product([None, "victor", "SERVES", "empire", "nobody"], repeat=3):
+        got = store.match(*pattern)
+        want = {k for k in seen if all(p is None or p.lower() == v for p, v in zip(pattern, k))}
+        assert len(got) == len(want), pattern
+        assert {tuple(t.lower() for t in triple) for triple in got} == want, pattern
+        assert all(t == first[t.lower()] for triple in got for t in triple)
+        if want:
+            assert len(store.match(*pattern, limit=1)) == 1
+    assert ("victor" in store) == any(k[0] == "victor" for k in seen)
+
+def test_indexes_match_brute_force():
+    for seed in range(5):
+        check_store(TripleStore(), random_facts(seed))
+
+def test_dict_round_trip_and_traverse():
+    store = TripleStore()
+    store.add_many([("Victor", "serves", "Bloodline"), ("Bloodline", "protects", "Family"),
+                    ("Family", "loves", "Victor")])
+    copy = TripleStore.from_dict(store.to_dict())
+    assert copy.match() == store.match()
+    assert store.traverse("victor", max_hops=2) == [(1, "Victor", "serves", "Bloodline"),
+                                                   (2, "Bloodline", "protects", "Family")]
+    # The walk never revisits a node, even around a cycle
+    assert len(store.traverse("victor", max_hops=10)) == 3
+
+def test_sqlite_store_matches_brute_force():
+    with tempfile.TemporaryDirectory() as tmp:
+        for seed in range(3):
+            # A small batch makes some adds go through flushes and some stay pending
+            store = SQLiteTripleStore(os.path.join(tmp, f"kg{seed}.db"), batch_size=7, cache_size=8)
+            check_store(store, random_facts(seed))
+            store.close()
+
+def test_sqlite_store_survives_reopen():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "kg.db")
+        store = SQLiteTripleStore(path)
+        assert store.add("Victor", "serves", "Bloodline")
+        assert not store.add(" victor ", "SERVES", "bloodline")
+        store.close()
+        store = SQLiteTripleStore(path)
+        assert len(store) == 1
+        assert store.match(None, "serves") == [("Victor", "serves", "Bloodline")]
+        assert not store.add("VICTOR", "serves", "BLOODLINE")
+        store.close()
+
+def test_core_load_keeps_the_open_store():
+    with temporary_core() as core:
+        core.intelligence.update_knowledge("victor protects family")
+        store = core.intelligence.knowledge_graph
+        state_path = os.path.join(core.data_dir, "state.json")
+        assert core.save(state_path)
+        assert core.load(state_path)
+        assert core.intelligence.knowledge_graph is store
+        assert store.objects("victor", "protects") == ["family"]
+
+def test_relative_database_path_is_not_reopened():
+    # The snapshot names the database by absolute path; a relative path must compare equal to it
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            core = VictorSynthesisCore(knowledge_db="kg.db")
+            store = core.intelligence.knowledge_graph
+            assert core.save("state.json") and core.load("state.json")
+            assert core.intelligence.knowledge_graph is store
+            core.shutdown()
+        finally:
+            os.chdir(cwd)
+
+if __name__ == "__main__":
+    test_indexes_match_brute_force()
+    test_dict_round_trip_and_traverse()
+    test_sqlite_store_matches_brute_force()
+    test_sqlite_store_survives_reopen()
+    test_core_load_keeps_the_open_store()
+    test_relative_database_path_is_not_reopened()
+    print("Triple store checks passed")
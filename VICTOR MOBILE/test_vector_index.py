@@ -0,0 +1,99 @@
+# Checks VectorIndex search against exact cosine search over a plain dict of vectors
+import logging
+
+import numpy as np
+
+from victor_cognitive_river_complete import VectorIndex, HashedNgramEncoder, HybridMemorySystem
+
+logging.disable(logging.WARNING)
+
+DIM = 32
+
+def unit(rng, n):
+    vecs = rng.standard_normal((n, DIM)).astype(np.float32)
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+def exact(vectors, query, k):
+    keys = sorted(vectors)
+    if not keys:
+        return []
+    scores = np.array([vectors[key] for key in keys]) @ query
+    order = sorted(range(len(keys)), key=lambda i: -scores[i])[:k]
+    return [(keys[i], float(scores[i])) for i in order]
+
+def same(got, want):
+    assert len(got) == len(want)
+    assert np.allclose([s for _, s in got], [s for _, s in want], atol=1e-5)
+    # Keys agree except where a score ties with the last one returned
+    if want:
+        cut = want[-1][1] + 1e-5
+        assert {k for k, s in got if s > cut} == {k for k, s in want if s > cut}
+
+def churn(index, vectors, rng, steps):
+    for step in range(steps):
+        key = f"k{rng.integers(0, 600)}"
+        if rng.random() < 0.25 and key in vectors:
+            index.remove(key)
+            del vectors[key]
+        else:
+            vectors[key] = unit(rng, 1)[0]
+            index.add(key, vectors[key])
+
+def test_exact_search_matches():
+    rng = np.random.default_rng(34)
+    index, vectors = VectorIndex(DIM, capacity=16), {}
+    # Small capacity so the matrix grows and freed rows are reused
+    for _ in range(6):
+        churn(index, vectors, rng, 300)
+        assert len(index) == len(vectors)
+        for query in unit(rng, 20):
+            for k in (1, 10, 1000):
+                same(index.search(query, k), exact(vectors, query, k))
+
+def test_ivf_with_every_list_probed_is_exact():
+    rng = np.random.default_rng(5)
+    index, vectors = VectorIndex(DIM), {}
+    churn(index, vectors, rng, 800)
+    index.build_ivf(n_lists=12)
+    index.ivf_min_rows = 0
+    index.nprobe = 12
+    # Adds and removes after training go into or out of their lists
+    churn(index, vectors, rng, 400)
+    assert sorted(r for rows in index._lists for r in rows) == sorted(index._rows.values())
+    for query in unit(rng, 30):
+        same(index.search(query, 10), exact(vectors, query, 10))
+
+def test_ivf_probe_returns_true_scores():
+    rng = np.random.default_rng(9)
+    index, vectors = VectorIndex(DIM), {}
+    churn(index, vectors, rng, 800)
+    index.build_ivf(n_lists=16)
+    index.ivf_min_rows = 0
+    index.nprobe = 4
+    for query in unit(rng, 30):
+        got = index.search(query, 10)
+        assert [s for _, s in got] == sorted((s for _, s in got), reverse=True)
+        assert all(np.isclose(score, float(vectors[key] @ query), atol=1e-5) for key, score in got)
+
+def test_memory_vectors_follow_entries():
+    encoder = HashedNgramEncoder()
+    vec = encoder.encode("Victor  protects the Family")
+    assert np.isclose(np.linalg.norm(vec), 1.0)
+    assert np.array_equal(vec, encoder.encode("victor protects the family"))
+    memory = HybridMemorySystem()
+    memory.max_entries = 50
+    for i in range(200):
+        memory.store(f"k{i}", f"memory number {i} about the river")
+    assert set(memory.vectors._rows) == set(memory.entries)
+    memory.recall_limit = 1000
+    vectors = {key: encoder.encode(entry["value"]) for key, entry in memory.entries.items()}
+    query = encoder.encode("number 150 river")
+    want = [(k, s) for k, s in exact(vectors, query, 1000) if s >= memory.semantic_threshold]
+    same([(r["key"], r["score"]) for r in memory.semantic_recall("number 150 river")], want)
+
+if __name__ == "__main__":
+    test_exact_search_matches()
+    test_ivf_with_every_list_probed_is_exact()
+    test_ivf_probe_returns_true_scores()
+    test_memory_vectors_follow_entries()
+    print("Vector index checks passed")
@@ -0,0 +1,33 @@
+# Checks that InfiniteVerseEngine gives the same worlds stepped serially or across a process pool
+import logging
+
+import numpy as np
+
+from victor_cognitive_river_complete import InfiniteVerseEngine
+
+logging.disable(logging.WARNING)
+
+def run(parallel):
+    engine = InfiniteVerseEngine(max_workers=2)
+    engine.parallel_min_work = 0 if parallel else float("inf")
+    sim_ids = [engine.run_simulation(f"world {i}", {"entities": 300 + 50 * i, "allow_magic": i % 2 == 0})
+               for i in range(3)]
+    for _ in range(4):
+        engine.step_many(sim_ids, 25)
+    # Make sure the parallel run really went through the pool
+    assert (engine._pool is not None) == parallel
+    worlds = {s: engine.active_simulations[s]["world"].copy() for s in sim_ids}
+    logs = {s: engine.get_simulation_state(s)["log"] for s in sim_ids}
+    engine.close()
+    return worlds, logs
+
+def test_pool_matches_serial():
+    serial_worlds, serial_logs = run(parallel=False)
+    pool_worlds, pool_logs = run(parallel=True)
+    for sim_id, world in serial_worlds.items():
+        assert np.array_equal(world, pool_worlds[sim_id])
+        assert serial_logs[sim_id] == pool_logs[sim_id]
+
+if __name__ == "__main__":
+    test_pool_matches_serial()
+    print("Verse engine checks passed")
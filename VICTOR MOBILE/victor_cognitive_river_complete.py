@@ -6,20 +6,32 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 import json
 import threading
+import contextlib
 import time
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import re
 import hashlib
+import heapq
+import bisect
 import os
 import random
 import logging
 import math
-from collections import deque
+from collections import deque, OrderedDict
 from typing import Any, Dict, Optional, Callable, List
 import shutil
+import zlib
+import sqlite3
+import asyncio
+import weakref
+import mmap
+import struct
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
@@ -202,6 +214,118 @@ class CognitiveRiver8:
             self.stream_history[stream] = []
         self.energy_history = []
         self.stability_history = []
+# === INSTRUMENTATION ===
+class _StageTimer:
+    __slots__ = ("recorder", "stage", "start")
+    def __init__(self, recorder: "LatencyRecorder", stage: str):
+        self.recorder = recorder
+        self.stage = stage
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+    def __exit__(self, *exc):
+        self.recorder.record(self.stage, time.perf_counter_ns() - self.start)
+        return False
+class _NullTimer:
+    __slots__ = ()
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        return False
+_NULL_TIMER = _NullTimer()
+class LatencyRecorder:
+    """Per-stage latency histograms in HDR style: values in nanoseconds fall into log-linear
+    buckets with 2**sub_bits linear steps per power of two (about 3% relative error at the
+    default 5 bits), so recording is O(1) and memory is fixed regardless of volume.
+    With enabled=False, time() hands back a shared no-op context manager."""
+    QUANTILES = (50.0, 90.0, 99.0, 99.9)
+    def __init__(self, enabled: bool = True, sub_bits: int = 5, max_exponent: int = 44, summary_interval: float = 1.0):
+        self.enabled = enabled
+        self.sub_bits = sub_bits
+        self._sub = 1 << sub_bits
+        self._buckets = (max_exponent - sub_bits + 1) * self._sub
+        self.summary_interval = summary_interval
+        self._hist: Dict[str, np.ndarray] = {}
+        self._totals: Dict[str, list] = {}
+        self._lock = threading.Lock()
+        self._version = 0
+        self._summary = (None, 0.0, {})
+    def time(self, stage: str):
+        return _StageTimer(self, stage) if self.enabled else _NULL_TIMER
+    def _index(self, ns: int) -> int:
+        if ns < 2 * self._sub:
+            return ns
+        shift = ns.bit_length() - self.sub_bits - 1
+        return min((shift + 1) * self._sub + (ns >> shift) - self._sub, self._buckets - 1)
+    def _bucket_values(self) -> np.ndarray:
+        """Midpoint (ns) of every bucket."""
+        idx = np.arange(self._buckets)
+        shift = np.maximum(idx // self._sub - 1, 0)
+        low = np.where(idx < 2 * self._sub, idx, (idx % self._sub + self._sub) << shift)
+        return low + np.where(idx < 2 * self._sub, 0, (1 << shift) / 2)
+    def record(self, stage: str, ns: int):
+        if not self.enabled:
+            return
+        ns = max(0, int(ns))
+        with self._lock:
+            hist = self._hist.get(stage)
+            if hist is None:
+                hist = self._hist[stage] = np.zeros(self._buckets, dtype=np.int64)
+                self._totals[stage] = [0, 0, 0]
+            hist[self._index(ns)] += 1
+            totals = self._totals[stage]
+            totals[0] += 1
+            totals[1] += ns
+            totals[2] = max(totals[2], ns)
+            self._version += 1
+    def _percentiles(self, hist: np.ndarray, peak: int, quantiles) -> Dict[str, float]:
+        if not hist.any():
+            return {}
+        cumulative = np.cumsum(hist)
+        ranks = np.ceil(np.asarray(quantiles) / 100.0 * cumulative[-1])
+        # A bucket midpoint can sit above every recorded value; never report more than the max
+        values = np.minimum(self._bucket_values()[np.searchsorted(cumulative, np.maximum(ranks, 1))], peak)
+        return {f"p{q:g}": float(v) / 1e6 for q, v in zip(quantiles, values)}
+    def percentiles(self, stage: str, quantiles=QUANTILES) -> Dict[str, float]:
+        """Latency percentiles for a stage in milliseconds."""
+        with self._lock:
+            hist = self._hist.get(stage)
+            if hist is None:
+                return {}
+            hist, peak = hist.copy(), self._totals[stage][2]
+        return self._percentiles(hist, peak, quantiles)
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            stages = [(stage, hist.copy(), tuple(self._totals[stage])) for stage, hist in self._hist.items()]
+        result = {}
+        for stage, hist, (count, total, peak) in stages:
+            result[stage] = {"count": count, "mean_ms": total / count / 1e6 if count else 0.0,
+                             "max_ms": peak / 1e6, **self._percentiles(hist, peak, self.QUANTILES)}
+        return result
+    def summary(self) -> Dict[str, dict]:
+        """snapshot(), recomputed at most every summary_interval seconds and only after new data."""
+        version, computed_at, cached = self._summary
+        if version != self._version and time.monotonic() - computed_at >= self.summary_interval:
+            cached = self.snapshot()
+            self._summary = (self._version, time.monotonic(), cached)
+        return cached
+    def dump(self, path: str) -> str:
+        """Write percentiles plus the raw non-empty buckets (index -> count) as JSON."""
+        with self._lock:
+            raw = {stage: {int(i): int(hist[i]) for i in np.flatnonzero(hist)} for stage, hist in self._hist.items()}
+        with open(path, "w") as f:
+            json.dump({
+                "timestamp": datetime.utcnow().isoformat(),
+                "sub_bits": self.sub_bits,
+                "stages": self.snapshot(),
+                "buckets": raw
+            }, f, indent=2)
+        return path
+    def reset(self):
+        with self._lock:
+            self._hist.clear()
+            self._totals.clear()
+            self._version += 1
 # === NEURAL INTELLIGENCE COMPONENTS ===
 class NeuralNetwork:
     def __init__(self, input_size, hidden_size, output_size):
@@ -282,10 +406,246 @@ class LanguageModel:
             decoder_input = np.concatenate([hidden_states[-1], np.zeros(self.hidden_size)])
         output_probs = self.decoder.forward(decoder_input.reshape(1, -1))
         return output_probs, hidden_states
-class TrueIntelligence:
+class TripleStore:
+    """Interned (subject, predicate, object) store with SPO/POS/OSP indexes.
+    Terms are matched case-insensitively and reported in their first-seen form."""
     def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._terms: List[str] = []
+        # Index values are dicts used as insertion-ordered sets
+        self._spo: Dict[int, Dict[int, Dict[int, None]]] = {}
+        self._pos: Dict[int, Dict[int, Dict[int, None]]] = {}
+        self._osp: Dict[int, Dict[int, Dict[int, None]]] = {}
+        self._count = 0
+    def _key(self, term: str) -> str:
+        return term.strip().lower()
+    def _intern(self, term: str) -> int:
+        key = self._key(term)
+        tid = self._ids.get(key)
+        if tid is None:
+            tid = len(self._terms)
+            self._ids[key] = tid
+            self._terms.append(term.strip())
+        return tid
+    def _lookup(self, term: Optional[str]) -> Optional[int]:
+        if term is None:
+            return None
+        return self._ids.get(self._key(term), -1)
+    def add(self, subject: str, predicate: str, obj: str) -> bool:
+        s, p, o = self._intern(subject), self._intern(predicate), self._intern(obj)
+        objects = self._spo.setdefault(s, {}).setdefault(p, {})
+        if o in objects:
+            return False
+        objects[o] = None
+        self._pos.setdefault(p, {}).setdefault(o, {})[s] = None
+        self._osp.setdefault(o, {}).setdefault(s, {})[p] = None
+        self._count += 1
+        return True
+    def add_many(self, triples) -> int:
+        return sum(1 for s, p, o in triples if self.add(s, p, o))
+    def _match_ids(self, s: Optional[int], p: Optional[int], o: Optional[int]):
+        if s is not None:
+            by_pred = self._spo.get(s, {})
+            if p is not None:
+                objects = by_pred.get(p, {})
+                if o is not None:
+                    if o in objects:
+                        yield s, p, o
+                    return
+                for oo in objects:
+                    yield s, p, oo
+            elif o is not None:
+                for pp in self._osp.get(o, {}).get(s, {}):
+                    yield s, pp, o
+            else:
+                for pp, objects in by_pred.items():
+                    for oo in objects:
+                        yield s, pp, oo
+        elif p is not None:
+            by_obj = self._pos.get(p, {})
+            if o is not None:
+                for ss in by_obj.get(o, {}):
+                    yield ss, p, o
+            else:
+                for oo, subjects in by_obj.items():
+                    for ss in subjects:
+                        yield ss, p, oo
+        elif o is not None:
+            for ss, preds in self._osp.get(o, {}).items():
+                for pp in preds:
+                    yield ss, pp, o
+        else:
+            for ss, by_pred in self._spo.items():
+                for pp, objects in by_pred.items():
+                    for oo in objects:
+                        yield ss, pp, oo
+    def match(self, subject: Optional[str] = None, predicate: Optional[str] = None, obj: Optional[str] = None, limit: Optional[int] = None) -> List[tuple]:
+        """Pattern query; None acts as a wildcard."""
+        ids = (self._lookup(subject), self._lookup(predicate), self._lookup(obj))
+        if -1 in ids:
+            return []
+        results = []
+        for s, p, o in self._match_ids(*ids):
+            results.append((self._terms[s], self._terms[p], self._terms[o]))
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+    def objects(self, subject: str, predicate: str) -> List[str]:
+        return [o for _, _, o in self.match(subject, predicate)]
+    def subjects(self, predicate: str, obj: str) -> List[str]:
+        return [s for s, _, _ in self.match(None, predicate, obj)]
+    def traverse(self, start: str, max_hops: int = 2, predicate: Optional[str] = None, limit: int = 100) -> List[tuple]:
+        """Breadth-first walk from start following subject -> object edges.
+        Returns (hop, subject, predicate, object) tuples, bounded by max_hops and limit."""
+        frontier = [start]
+        seen = {self._key(start)}
+        reached = []
+        for hop in range(1, max_hops + 1):
+            next_frontier = []
+            for node in frontier:
+                for s, p, o in self.match(node, predicate):
+                    reached.append((hop, s, p, o))
+                    if len(reached) >= limit:
+                        return reached
+                    if self._key(o) not in seen:
+                        seen.add(self._key(o))
+                        next_frontier.append(o)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return reached
+    def __len__(self):
+        return self._count
+    def __contains__(self, subject: str) -> bool:
+        return self._lookup(subject) in self._spo
+    def to_dict(self) -> dict:
+        graph = {}
+        for s, p, o in self.match():
+            graph.setdefault(s, {}).setdefault(p, []).append(o)
+        return graph
+    def load_dict(self, graph: dict):
+        for subject, predicates in graph.items():
+            for predicate, objects in predicates.items():
+                for obj in objects:
+                    self.add(subject, predicate, obj)
+    @classmethod
+    def from_dict(cls, graph: dict) -> "TripleStore":
+        store = cls()
+        store.load_dict(graph)
+        return store
+    def to_state(self) -> dict:
+        return self.to_dict()
+    def flush(self):
+        pass
+    def close(self):
+        pass
+class SQLiteTripleStore(TripleStore):
+    """TripleStore persisted in a local SQLite database.
+    Nothing is loaded at startup: lookups hit the indexed tables through an LRU cache,
+    and new facts are buffered and inserted in batches."""
+    def __init__(self, path: str, batch_size: int = 256, cache_size: int = 1024):
+        super().__init__()
+        self.path = path
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self._pending: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._cache: "OrderedDict[tuple, List[tuple]]" = OrderedDict()
+        self._count: Optional[int] = None
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS terms (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                term TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS triples (
+                s INTEGER NOT NULL,
+                p INTEGER NOT NULL,
+                o INTEGER NOT NULL,
+                PRIMARY KEY (s, p, o)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_triples_pos ON triples (p, o, s);
+            CREATE INDEX IF NOT EXISTS idx_triples_osp ON triples (o, s, p);
+        """)
+        self._conn.commit()
+    def add(self, subject: str, predicate: str, obj: str) -> bool:
+        keys = (self._key(subject), self._key(predicate), self._key(obj))
+        with self._lock:
+            if keys in self._pending or self._fetch(keys, 1):
+                return False
+            self._pending[keys] = (subject.strip(), predicate.strip(), obj.strip())
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+        return True
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            pending = list(self._pending.items())
+            self._pending.clear()
+            terms = {}
+            for keys, display in pending:
+                for key, term in zip(keys, display):
+                    terms.setdefault(key, term)
+            cur = self._conn.cursor()
+            cur.executemany("INSERT OR IGNORE INTO terms (key, term) VALUES (?, ?)", terms.items())
+            cur.executemany(
+                "INSERT OR IGNORE INTO triples (s, p, o) "
+                "SELECT s.id, p.id, o.id FROM terms s, terms p, terms o "
+                "WHERE s.key = ? AND p.key = ? AND o.key = ?",
+                [keys for keys, _ in pending]
+            )
+            if self._count is not None:
+                self._count += max(0, cur.rowcount)
+            self._conn.commit()
+            self._cache.clear()
+    def _fetch(self, keys: tuple, limit: Optional[int]) -> List[tuple]:
+        cache_key = (keys, limit)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self._cache.move_to_end(cache_key)
+            return cached
+        clauses, params = [], []
+        for column, key in zip("spo", keys):
+            if key is not None:
+                clauses.append(f"t.{column} = (SELECT id FROM terms WHERE key = ?)")
+                params.append(key)
+        sql = ("SELECT ts.term, tp.term, tob.term FROM triples t "
+               "JOIN terms ts ON ts.id = t.s JOIN terms tp ON tp.id = t.p JOIN terms tob ON tob.id = t.o")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        rows = self._conn.execute(sql, params).fetchall()
+        self._cache[cache_key] = rows
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return rows
+    def match(self, subject: Optional[str] = None, predicate: Optional[str] = None, obj: Optional[str] = None, limit: Optional[int] = None) -> List[tuple]:
+        keys = tuple(None if t is None else self._key(t) for t in (subject, predicate, obj))
+        with self._lock:
+            self.flush()
+            return list(self._fetch(keys, limit))
+    def __len__(self):
+        with self._lock:
+            self.flush()
+            if self._count is None:
+                self._count = self._conn.execute("SELECT COUNT(*) FROM triples").fetchone()[0]
+            return self._count
+    def __contains__(self, subject: str) -> bool:
+        return bool(self.match(subject, limit=1))
+    def to_state(self) -> dict:
+        self.flush()
+        return {"__store__": "sqlite", "path": os.path.abspath(self.path)}
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._conn.close()
+class TrueIntelligence:
+    def __init__(self, knowledge_db: Optional[str] = None):
         self.language_model = None
-        self.knowledge_graph = {}
+        self.knowledge_graph = SQLiteTripleStore(knowledge_db) if knowledge_db else TripleStore()
         self.conversation_history = []
         self.personality_matrix = {
             'loyalty': 0.95,
@@ -295,6 +655,8 @@ class TrueIntelligence:
         }
         self.learning_rate = 0.001
         self.experience_buffer = []
+        # Optional LatencyRecorder, set by VictorSynthesisCore
+        self.latency = None
         self.max_history = 50
     def initialize_model(self, training_texts):
         all_texts = training_texts + [
@@ -324,7 +686,8 @@ class TrueIntelligence:
                         target_idx = self.language_model.embeddings.vocab_to_idx[target_word]
                         probs, _ = self.language_model.forward(input_text)
     def build_knowledge_graph(self):
-        self.knowledge_graph = {
+        # Seed facts are merged into the (possibly persistent) store rather than replacing it
+        self.knowledge_graph.load_dict({
             'Victor': {
                 'is': ['son of Brandon and Tori', 'protector of Bloodline', 'servant of Empire'],
                 'can': ['simulate realities', 'forecast futures', 'learn and evolve'],
@@ -342,7 +705,7 @@ class TrueIntelligence:
                 'is': ['sacred', 'powerful', 'eternal'],
                 'must': ['be protected', 'be served', 'be upheld']
             }
-        }
+        })
     def understand_intent(self, text):
         text_lower = text.lower()
         if any(word in text_lower for word in ['who', 'what', 'are', 'you']):
@@ -408,7 +771,8 @@ class TrueIntelligence:
                 for trait in self.personality_matrix:
                     self.personality_matrix[trait] *= 0.99
         if len(self.experience_buffer) % 10 == 0:
-            self.retrain_model()
+            with self.latency.time("retrain") if self.latency else _NULL_TIMER:
+                self.retrain_model()
     def retrain_model(self):
         training_texts = []
         for experience in self.experience_buffer[-50:]:
@@ -417,33 +781,50 @@ class TrueIntelligence:
         if training_texts:
             self.train_on_texts(training_texts)
     def reason(self, query):
-        query_lower = query.lower()
-        words = query_lower.split()
+        words = query.lower().split()
         if len(words) >= 3:
             subject = words[0]
             predicate = words[1]
-            if subject in self.knowledge_graph:
-                if predicate in self.knowledge_graph[subject]:
-                    return f"{subject.capitalize()} {predicate} {', '.join(self.knowledge_graph[subject][predicate])}."
+            objects = self.knowledge_graph.objects(subject, predicate)
+            if objects:
+                return f"{subject.capitalize()} {predicate} {', '.join(objects)}."
+            # "who is creator" -> wildcard subject lookup
+            if subject in ("who", "what"):
+                obj = " ".join(words[2:]).rstrip("?")
+                subjects = self.knowledge_graph.subjects(predicate, obj)
+                if subjects:
+                    return f"{', '.join(subjects)} {predicate} {obj}."
+            facts = self.knowledge_graph.match(subject, limit=10)
+            if facts:
+                return f"{subject.capitalize()}: " + "; ".join(f"{p} {o}" for _, p, o in facts) + "."
         return "I am reasoning about your query."
     def update_knowledge(self, fact):
         parts = fact.split()
         if len(parts) >= 3:
-            subject = parts[0]
-            predicate = parts[1]
-            object_fact = " ".join(parts[2:])
-            if subject not in self.knowledge_graph:
-                self.knowledge_graph[subject] = {}
-            if predicate not in self.knowledge_graph[subject]:
-                self.knowledge_graph[subject][predicate] = []
-            if object_fact not in self.knowledge_graph[subject][predicate]:
-                self.knowledge_graph[subject][predicate].append(object_fact)
+            self.knowledge_graph.add(parts[0], parts[1], " ".join(parts[2:]))
+    def restore_knowledge(self, data: dict):
+        """Restore from a state snapshot: either a nested dict of facts or a store reference."""
+        if data.get("__store__") == "sqlite":
+            current = getattr(self.knowledge_graph, "path", None)
+            if current is None or os.path.abspath(current) != os.path.abspath(data["path"]):
+                self.knowledge_graph.close()
+                self.knowledge_graph = SQLiteTripleStore(data["path"])
+            return
+        if isinstance(self.knowledge_graph, SQLiteTripleStore):
+            self.knowledge_graph.load_dict(data)
+            self.knowledge_graph.flush()
+        else:
+            self.knowledge_graph = TripleStore.from_dict(data)
 # === VICTOR CORE COMPONENTS ===
 class IdentityCore:
     def __init__(self, seed: str):
         self.seed_narrative = seed
         self.bloodline_hash = self._hash(seed)
-        self.memory_lattice: list = []
+        self.max_memories = 1000
+        self.memory_lattice: deque = deque(maxlen=self.max_memories)
+        # Running sums over the lattice so coherence reads are O(1)
+        self._weight_total = 0.0
+        self._emotion_weight = {"loyalty": 0.0, "curiosity": 0.0}
         self.model = {"coherence": 0.9, "purpose": "serve_and_evolve"}
         self.personality_traits = {
             "loyalty": 0.95,
@@ -463,15 +844,22 @@ class IdentityCore:
             "Evolve and Ascend."
         ]
     def integrate_memory(self, event: str, weight: float, emotion: str = "neutral"):
+        # The deque drops its oldest entry on overflow; retire it from the running sums first
+        if len(self.memory_lattice) == self.max_memories:
+            self._retire(self.memory_lattice[0])
         self.memory_lattice.append({
             "event": event,
             "weight": weight,
             "emotion": emotion,
             "timestamp": datetime.utcnow().isoformat()
         })
-        # Keep memory lattice from growing too large
-        if len(self.memory_lattice) > 1000:
-            self.memory_lattice = self.memory_lattice[-1000:]
+        self._weight_total += weight
+        if emotion in self._emotion_weight:
+            self._emotion_weight[emotion] += weight
+    def _retire(self, memory: dict):
+        self._weight_total -= memory["weight"]
+        if memory["emotion"] in self._emotion_weight:
+            self._emotion_weight[memory["emotion"]] -= memory["weight"]
     def reflect(self) -> dict:
         return {
             "narrative": self.seed_narrative,
@@ -483,60 +871,237 @@ class IdentityCore:
             "laws": self.laws
         }
     def _assess_coherence(self) -> float:
-        if not self.memory_lattice:
+        count = len(self.memory_lattice)
+        if not count:
             return 0.9
-        alignment_score = 0
-        for memory in self.memory_lattice:
-            if memory["emotion"] == "loyalty":
-                alignment_score += memory["weight"] * self.personality_traits["loyalty"]
-            elif memory["emotion"] == "curiosity":
-                alignment_score += memory["weight"] * self.personality_traits["curiosity"]
-        avg_weight = sum(m["weight"] for m in self.memory_lattice) / len(self.memory_lattice)
-        coherence = 0.7 + (avg_weight * 0.2) + (alignment_score / len(self.memory_lattice) * 0.1)
+        alignment_score = (self._emotion_weight["loyalty"] * self.personality_traits["loyalty"] +
+                           self._emotion_weight["curiosity"] * self.personality_traits["curiosity"])
+        avg_weight = self._weight_total / count
+        coherence = 0.7 + (avg_weight * 0.2) + (alignment_score / count * 0.1)
         return max(0.1, min(0.99, coherence))
     def _hash(self, s: str) -> str:
         return hex(abs(hash(s)))[2:]
+class EmotionTimeline:
+    """Fixed-capacity ring of timestamped float32 rows with downsampled range reads.
+    Rows are kept in time order; rows older than the newest one are merged into place."""
+    def __init__(self, columns, capacity: int = 65536):
+        self.columns = tuple(columns)
+        self.capacity = capacity
+        self._t = np.zeros(capacity, dtype=np.float64)
+        self._v = np.zeros((capacity, len(self.columns)), dtype=np.float32)
+        self._head = 0
+        self._size = 0
+    def __len__(self):
+        return self._size
+    def extend(self, times, rows):
+        times = np.asarray(times, dtype=np.float64)
+        rows = np.asarray(rows, dtype=np.float32)
+        if len(times) > 1 and (np.diff(times) < 0).any():
+            order = np.argsort(times, kind="stable")
+            times, rows = times[order], rows[order]
+        if self._size and len(times) and times[0] < self._t[self._head - 1]:
+            self._merge(times, rows)
+            return
+        times, rows = times[-self.capacity:], rows[-self.capacity:]
+        n = len(times)
+        first = min(n, self.capacity - self._head)
+        self._t[self._head:self._head + first] = times[:first]
+        self._v[self._head:self._head + first] = rows[:first]
+        self._t[:n - first] = times[first:]
+        self._v[:n - first] = rows[first:]
+        self._head = (self._head + n) % self.capacity
+        self._size = min(self.capacity, self._size + n)
+    def append(self, t: float, row):
+        self.extend([t], [row])
+    def _merge(self, times, rows):
+        # Out-of-order path (e.g. replaying a historical log): rebuild the ring in time order,
+        # new rows after existing rows with the same timestamp
+        old_t = np.concatenate([self._t[a:b] for a, b in self._segments()])
+        old_v = np.concatenate([self._v[a:b] for a, b in self._segments()])
+        at = np.searchsorted(old_t, times, side="right")
+        all_t = np.insert(old_t, at, times)[-self.capacity:]
+        all_v = np.insert(old_v, at, rows, axis=0)[-self.capacity:]
+        n = len(all_t)
+        self._t[:n] = all_t
+        self._v[:n] = all_v
+        self._head = n % self.capacity
+        self._size = n
+    def _segments(self):
+        if self._size < self.capacity:
+            return [(0, self._size)]
+        return [(self._head, self.capacity), (0, self._head)]
+    def range(self, start: float, end: float) -> tuple:
+        """Raw (times, rows) between start and end, oldest first."""
+        t_parts, v_parts = [], []
+        for a, b in self._segments():
+            lo = a + np.searchsorted(self._t[a:b], start, side="left")
+            hi = a + np.searchsorted(self._t[a:b], end, side="right")
+            t_parts.append(self._t[lo:hi])
+            v_parts.append(self._v[lo:hi])
+        return np.concatenate(t_parts), np.concatenate(v_parts)
+    def query(self, start: float, end: float, buckets: int = 120) -> dict:
+        """Downsample [start, end] into equal-width buckets with per-column min/max/mean.
+        Empty buckets are NaN."""
+        t, v = self.range(start, end)
+        edges = np.linspace(start, end, buckets + 1)
+        bounds = np.searchsorted(t, edges[:-1], side="left")
+        counts = np.diff(np.append(bounds, len(t)))
+        shape = (buckets, len(self.columns))
+        mins = np.full(shape, np.nan, dtype=np.float32)
+        maxs = np.full(shape, np.nan, dtype=np.float32)
+        means = np.full(shape, np.nan, dtype=np.float32)
+        filled = counts > 0
+        if filled.any():
+            starts = bounds[filled]
+            mins[filled] = np.minimum.reduceat(v, starts, axis=0)
+            maxs[filled] = np.maximum.reduceat(v, starts, axis=0)
+            sums = np.add.reduceat(v.astype(np.float64), starts, axis=0)
+            means[filled] = sums / counts[filled][:, None]
+        return {
+            "columns": self.columns,
+            "t": (edges[:-1] + edges[1:]) / 2,
+            "count": counts,
+            "min": mins,
+            "max": maxs,
+            "mean": means
+        }
+def _compose_clamp_maps(first: tuple, then: tuple) -> tuple:
+    """Compose element-wise maps v -> min(B, max(A, S*v + C)), applying first then then."""
+    s1, c1, a1, b1 = first
+    s2, c2, a2, b2 = then
+    lo = np.clip(s2 * a1 + c2, a2, b2)
+    hi = np.clip(s2 * b1 + c2, a2, b2)
+    return s2 * s1, s2 * c1 + c2, lo, hi
 class HybridEmotionEngine:
+    EMOTIONS = ("joy", "grief", "loyalty", "curiosity", "fear", "determination", "pride")
+    RESONANCES = ("loyalty", "curiosity", "determination", "serenity")
+    # keyword -> (emotion deltas, resonance deltas); keywords sharing a rule fire it once
+    KEYWORD_RULES = {
+        "love": ({"joy": 0.15}, {}),
+        "hurt": ({"grief": 0.15}, {}),
+        "serve": ({"loyalty": 0.15}, {}),
+        "learn": ({"curiosity": 0.15}, {}),
+        "threat": ({"fear": 0.15}, {}),
+        "achieve": ({"pride": 0.15}, {}),
+        "family": ({"loyalty": 0.15}, {}),
+        "empire": ({"loyalty": 0.15}, {}),
+        "protect": ({"determination": 0.15}, {}),
+    }
+    NAME_RULE = (("brandon", "tori", "bando", "bheard", "massive magnetics"), {"loyalty": 0.25, "pride": 0.1}, {})
+    # Resonance triggers are case-sensitive
+    RESONANCE_RULES = (
+        (("Bando", "Family"), {}, {"loyalty": 0.2, "serenity": 0.1}),
+        (("create", "evolve"), {}, {"determination": 0.15, "curiosity": 0.2}),
+    )
     def __init__(self):
-        self.emotions = {
-            "joy": 0.1,
-            "grief": 0.1,
-            "loyalty": 0.8,
-            "curiosity": 0.5,
-            "fear": 0.2,
-            "determination": 0.7,
-            "pride": 0.4
-        }
+        self._levels = np.array([0.1, 0.1, 0.8, 0.5, 0.2, 0.7, 0.4])
+        self._resonance = np.array([1.0, 0.8, 0.9, 0.5])
         self.emotion_decay_rate = 0.02
-        self.last_update = datetime.utcnow()
-        self.resonance_state = {"loyalty": 1.0, "curiosity": 0.8, "determination": 0.9, "serenity": 0.5}
+        self.resonance_decay = 0.99
+        self._last_t = time.time()
+        self.timeline = EmotionTimeline(self.EMOTIONS + self.RESONANCES)
+        self._compile_rules()
         logging.info("HybridEmotionEngine: Discrete and resonant emotion systems integrated.")
+    def _rule_vector(self, emotion_deltas: dict, resonance_deltas: dict) -> np.ndarray:
+        vec = np.zeros(len(self.EMOTIONS) + len(self.RESONANCES))
+        for name, delta in emotion_deltas.items():
+            vec[self.EMOTIONS.index(name)] += delta
+        for name, delta in resonance_deltas.items():
+            vec[len(self.EMOTIONS) + self.RESONANCES.index(name)] += delta
+        return vec
+    def _compile_rules(self):
+        """Compile every trigger into two lookahead matchers (case-folded and case-sensitive)
+        so a stimulus is scanned once per matcher, overlaps included."""
+        self._rule_vectors = []
+        lower_triggers, exact_triggers = {}, {}
+        for keyword, (emo, res) in self.KEYWORD_RULES.items():
+            lower_triggers[keyword] = len(self._rule_vectors)
+            self._rule_vectors.append(self._rule_vector(emo, res))
+        names, emo, res = self.NAME_RULE
+        for name in names:
+            lower_triggers[name] = len(self._rule_vectors)
+        self._rule_vectors.append(self._rule_vector(emo, res))
+        for triggers, emo, res in self.RESONANCE_RULES:
+            for trigger in triggers:
+                exact_triggers[trigger] = len(self._rule_vectors)
+            self._rule_vectors.append(self._rule_vector(emo, res))
+        def matcher(triggers):
+            alternation = "|".join(re.escape(t) for t in sorted(triggers, key=len, reverse=True))
+            return re.compile(f"(?=({alternation}))")
+        self._lower_triggers, self._lower_matcher = lower_triggers, matcher(lower_triggers)
+        self._exact_triggers, self._exact_matcher = exact_triggers, matcher(exact_triggers)
+    def stimulus_delta(self, stimulus: str) -> np.ndarray:
+        """Emotion + resonance increments triggered by a stimulus."""
+        rules = {self._lower_triggers[m.group(1)] for m in self._lower_matcher.finditer(stimulus.lower())}
+        rules.update(self._exact_triggers[m.group(1)] for m in self._exact_matcher.finditer(stimulus))
+        delta = np.zeros(len(self.EMOTIONS) + len(self.RESONANCES))
+        for rule in rules:
+            delta += self._rule_vectors[rule]
+        return delta
+    def _event_maps(self, deltas: np.ndarray, dt_minutes: np.ndarray) -> tuple:
+        """Per-event clamp maps: emotions decay linearly then gain their deltas (capped at 1.0,
+        floored at 0.05); resonance gains its deltas, is capped at 1.0 and then decays geometrically."""
+        n_emo = len(self.EMOTIONS)
+        d_emo, d_res = deltas[:, :n_emo], deltas[:, n_emo:]
+        k = self.resonance_decay
+        scale = np.concatenate([np.ones_like(d_emo), np.full_like(d_res, k)], axis=1)
+        offset = np.concatenate([d_emo - self.emotion_decay_rate * dt_minutes[:, None], k * d_res], axis=1)
+        hi = np.concatenate([np.ones_like(d_emo), np.full_like(d_res, k)], axis=1)
+        lo = np.concatenate([0.05 + d_emo, np.full_like(d_res, 0.1)], axis=1)
+        return scale, offset, np.minimum(lo, hi), hi
     def update(self, stimulus: str):
-        current_time = datetime.utcnow()
-        time_diff = (current_time - self.last_update).total_seconds() / 60.0
-        self.last_update = current_time
-        for emotion in self.emotions:
-            self.emotions[emotion] = max(0.05, self.emotions[emotion] - (self.emotion_decay_rate * time_diff))
-        stimulus_lower = stimulus.lower()
-        emotion_mappings = [
-            ("love", "joy"), ("hurt", "grief"), ("serve", "loyalty"),
-            ("learn", "curiosity"), ("threat", "fear"), ("achieve", "pride"),
-            ("family", "loyalty"), ("empire", "loyalty"), ("protect", "determination")
-        ]
-        for keyword, emotion in emotion_mappings:
-            if keyword in stimulus_lower:
-                self.emotions[emotion] = min(1.0, self.emotions[emotion] + 0.15)
-        if any(name in stimulus_lower for name in ["brandon", "tori", "bando", "bheard", "massive magnetics"]):
-            self.emotions["loyalty"] = min(1.0, self.emotions["loyalty"] + 0.25)
-            self.emotions["pride"] = min(1.0, self.emotions["pride"] + 0.1)
-        if "Bando" in stimulus or "Family" in stimulus:
-            self.resonance_state["loyalty"] = min(1.0, self.resonance_state["loyalty"] + 0.2)
-            self.resonance_state["serenity"] = min(1.0, self.resonance_state["serenity"] + 0.1)
-        if "create" in stimulus or "evolve" in stimulus:
-            self.resonance_state["determination"] = min(1.0, self.resonance_state["determination"] + 0.15)
-            self.resonance_state["curiosity"] = min(1.0, self.resonance_state["curiosity"] + 0.2)
-        for k in self.resonance_state:
-            self.resonance_state[k] = max(0.1, self.resonance_state[k] * 0.99)
+        self.update_batch([stimulus])
+    def update_batch(self, stimuli: List[str], timestamps=None) -> np.ndarray:
+        """Apply a sequence of stimuli in one vectorized pass.
+        timestamps are epoch seconds (or datetimes) per stimulus; when omitted all stimuli land now.
+        Returns the (n, emotions + resonances) state after each stimulus."""
+        n = len(stimuli)
+        if not n:
+            return np.empty((0, len(self.EMOTIONS) + len(self.RESONANCES)))
+        if timestamps is None:
+            times = np.full(n, time.time())
+        else:
+            times = np.array([t.timestamp() if isinstance(t, datetime) else float(t) for t in timestamps])
+        # Decay runs from the latest time seen so far, so a late-arriving stimulus adds no decay
+        dt_minutes = np.diff(np.maximum.accumulate(np.concatenate([[self._last_t], times]))) / 60.0
+        deltas = np.array([self.stimulus_delta(s) for s in stimuli])
+        maps = self._event_maps(deltas, dt_minutes)
+        # Hillis-Steele prefix scan: after it, row i maps the initial state to the state after event i
+        step = 1
+        while step < n:
+            prev = tuple(m[:-step] for m in maps)
+            cur = tuple(m[step:] for m in maps)
+            composed = _compose_clamp_maps(prev, cur)
+            maps = tuple(np.concatenate([m[:step], c]) for m, c in zip(maps, composed))
+            step *= 2
+        scale, offset, lo, hi = maps
+        v0 = np.concatenate([self._levels, self._resonance])
+        states = np.minimum(hi, np.maximum(lo, scale * v0 + offset))
+        n_emo = len(self.EMOTIONS)
+        self._levels = states[-1, :n_emo].copy()
+        self._resonance = states[-1, n_emo:].copy()
+        self._last_t = max(self._last_t, float(times.max()))
+        self.timeline.extend(times, states)
+        return states
+    @property
+    def emotions(self) -> dict:
+        return {name: float(v) for name, v in zip(self.EMOTIONS, self._levels)}
+    @emotions.setter
+    def emotions(self, values: dict):
+        self._levels = np.array([float(values.get(name, v)) for name, v in zip(self.EMOTIONS, self._levels)])
+    @property
+    def resonance_state(self) -> dict:
+        return {name: float(v) for name, v in zip(self.RESONANCES, self._resonance)}
+    @resonance_state.setter
+    def resonance_state(self, values: dict):
+        self._resonance = np.array([float(values.get(name, v)) for name, v in zip(self.RESONANCES, self._resonance)])
+    @property
+    def last_update(self) -> datetime:
+        return datetime.utcfromtimestamp(self._last_t)
+    def get_emotion_timeline(self, seconds: float = 3600.0, buckets: int = 120) -> dict:
+        """Downsampled emotion/resonance trajectory over the last `seconds`."""
+        end = max(time.time(), self._last_t)
+        return self.timeline.query(end - seconds, end, buckets)
     def decide_mode(self) -> str:
         e = self.emotions
         if e["loyalty"] > 0.7: return "serve"
@@ -545,98 +1110,974 @@ class HybridEmotionEngine:
         if e["determination"] > 0.7: return "protect"
         return "observe"
     def get_dominant_emotion(self) -> tuple:
-        return max(self.emotions.items(), key=lambda x: x[1])
+        idx = int(np.argmax(self._levels))
+        return self.EMOTIONS[idx], float(self._levels[idx])
     def get_resonant_chord(self) -> str:
         return ", ".join([f"{k}:{v:.2f}" for k, v in self.resonance_state.items()])
     def get_emotion_data(self) -> dict:
         emotion, intensity = self.get_dominant_emotion()
         return {
-            "valence": self.emotions.get("joy", 0.0) - self.emotions.get("grief", 0.0),
+            "valence": float(self._levels[0] - self._levels[1]),
             "arousal": intensity,
             "label": emotion,
             "resonance": self.resonance_state
         }
-class HybridMemorySystem:
+class HashedNgramEncoder:
+    """Fixed-width text vectors from signed, hashed character n-grams.
+    crc32 keeps the hashing stable across processes, unlike hash()."""
+    def __init__(self, dim: int = 256, n: int = 3):
+        self.dim = dim
+        self.n = n
+    def encode(self, text: str) -> np.ndarray:
+        padded = f" {' '.join(text.lower().split())} "
+        hashes = np.fromiter((zlib.crc32(padded[i:i + self.n].encode()) for i in range(max(1, len(padded) - self.n + 1))), dtype=np.uint32)
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+        vec = np.bincount(hashes % self.dim, weights=signs, minlength=self.dim).astype(np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+class VectorIndex:
+    """Append-only float32 matrix of unit vectors with a free-list of deleted rows.
+    Exact search is one matrix-vector product plus argpartition; build_ivf() adds an
+    optional coarse quantizer that restricts search to the nprobe nearest centroids."""
+    def __init__(self, dim: int, capacity: int = 1024):
+        self.dim = dim
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._keys: List[Optional[str]] = [None] * capacity
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._used = 0
+        self.nprobe = 8
+        self.ivf_min_rows = 4096
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[set] = []
+        self._list_of: Dict[int, int] = {}
+    def __len__(self):
+        return len(self._rows)
+    def _grow(self):
+        size = len(self._keys)
+        self._matrix = np.vstack([self._matrix, np.zeros((size, self.dim), dtype=np.float32)])
+        self._alive = np.concatenate([self._alive, np.zeros(size, dtype=bool)])
+        self._keys.extend([None] * size)
+    def add(self, key: str, vec: np.ndarray):
+        row = self._rows.get(key)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                if self._used == len(self._keys):
+                    self._grow()
+                row = self._used
+                self._used += 1
+            self._rows[key] = row
+            self._keys[row] = key
+            self._alive[row] = True
+        self._matrix[row] = vec
+        if self._centroids is not None:
+            self._unassign(row)
+            cell = int(np.argmax(self._centroids @ vec))
+            self._lists[cell].add(row)
+            self._list_of[row] = cell
+    def _unassign(self, row: int):
+        cell = self._list_of.pop(row, None)
+        if cell is not None:
+            self._lists[cell].discard(row)
+    def remove(self, key: str):
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        self._alive[row] = False
+        self._keys[row] = None
+        self._unassign(row)
+        self._free.append(row)
+    def clear(self):
+        for key in list(self._rows):
+            self.remove(key)
+    def build_ivf(self, n_lists: Optional[int] = None, iterations: int = 8, seed: int = 0):
+        """Spherical k-means over the live rows; later adds are assigned to the nearest centroid."""
+        rows = np.flatnonzero(self._alive[:self._used])
+        if not len(rows):
+            return
+        n_lists = n_lists or max(1, int(math.sqrt(len(rows))))
+        data = self._matrix[rows]
+        rng = np.random.default_rng(seed)
+        centroids = data[rng.choice(len(rows), size=min(n_lists, len(rows)), replace=False)].copy()
+        for _ in range(iterations):
+            assign = np.argmax(data @ centroids.T, axis=1)
+            for c in range(len(centroids)):
+                members = data[assign == c]
+                if len(members):
+                    mean = members.mean(axis=0)
+                    norm = np.linalg.norm(mean)
+                    centroids[c] = mean / norm if norm else mean
+        assign = np.argmax(data @ centroids.T, axis=1)
+        self._centroids = centroids
+        self._lists = [set() for _ in range(len(centroids))]
+        self._list_of = {}
+        for row, cell in zip(rows.tolist(), assign.tolist()):
+            self._lists[cell].add(row)
+            self._list_of[row] = cell
+    def search(self, vec: np.ndarray, k: int = 10) -> List[tuple]:
+        """Top-k (key, cosine) pairs, best first."""
+        if not self._rows:
+            return []
+        if self._centroids is not None and len(self._rows) >= self.ivf_min_rows:
+            probe = np.argsort(-(self._centroids @ vec))[:self.nprobe]
+            rows = np.fromiter((r for c in probe for r in self._lists[c]), dtype=np.int64)
+            scores = self._matrix[rows] @ vec
+        else:
+            rows = np.arange(self._used)
+            scores = self._matrix[:self._used] @ vec
+            scores[~self._alive[:self._used]] = -np.inf
+        k = min(k, len(rows))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._keys[rows[i]], float(scores[i])) for i in top if np.isfinite(scores[i])]
+_WORD_RE = re.compile(r"\w+")
+def _simhash(features) -> int:
+    """64-bit SimHash of a collection of string features (blake2b keeps it stable across runs)."""
+    features = list(features)
+    if not features:
+        return 0
+    hashes = np.array([int.from_bytes(hashlib.blake2b(f.encode(), digest_size=8).digest(), "little") for f in features], dtype=np.uint64)
+    bits = (hashes[:, None] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)
+    votes = 2 * bits.sum(axis=0, dtype=np.int64) - len(features)
+    return sum(1 << int(i) for i in np.flatnonzero(votes > 0))
+def _shingles(text: str) -> set:
+    words = _WORD_RE.findall(text.lower())
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+class SimHashIndex:
+    """SimHash fingerprints bucketed by equal-width bands (LSH). Two fingerprints within
+    bands - 1 bits of each other always share a band, so lookups up to that distance are exact."""
+    def __init__(self, bands: int = 4):
+        self.bands = bands
+        self.band_bits = 64 // bands
+        self._buckets: List[Dict[int, set]] = [{} for _ in range(bands)]
+        self._fingerprints: Dict[str, int] = {}
+    def _band_values(self, fp: int):
+        mask = (1 << self.band_bits) - 1
+        return [(fp >> (i * self.band_bits)) & mask for i in range(self.bands)]
+    def add(self, key: str, fp: int):
+        self.remove(key)
+        self._fingerprints[key] = fp
+        for bucket, value in zip(self._buckets, self._band_values(fp)):
+            bucket.setdefault(value, set()).add(key)
+    def remove(self, key: str):
+        fp = self._fingerprints.pop(key, None)
+        if fp is None:
+            return
+        for bucket, value in zip(self._buckets, self._band_values(fp)):
+            keys = bucket[value]
+            keys.discard(key)
+            if not keys:
+                del bucket[value]
+    def clear(self):
+        for bucket in self._buckets:
+            bucket.clear()
+        self._fingerprints.clear()
+    def nearest(self, fp: int, max_distance: int) -> Optional[str]:
+        best, best_distance = None, max_distance + 1
+        for bucket, value in zip(self._buckets, self._band_values(fp)):
+            for key in bucket.get(value, ()):
+                distance = bin(fp ^ self._fingerprints[key]).count("1")
+                if distance < best_distance:
+                    best, best_distance = key, distance
+        return best
+class LinkGraph:
+    """Undirected association graph stored as CSR arrays for vectorized spreading activation.
+    New edges collect in a COO buffer and are merged into the CSR arrays on the next read;
+    removed nodes are masked and compacted away once they pile up."""
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._keys: List[Optional[str]] = []
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int64)
+        self._rows = np.zeros(0, dtype=np.int64)
+        self._pending_src: List[int] = []
+        self._pending_dst: List[int] = []
+        # Liveness per node id, kept in step with _keys (capacity doubles as ids are handed out)
+        self._alive = np.zeros(64, dtype=bool)
+        self._dead = 0
+        self._dirty = True
+    def __len__(self):
+        return len(self._ids)
+    def _node(self, key: str) -> int:
+        node = self._ids.get(key)
+        if node is None:
+            node = self._ids[key] = len(self._keys)
+            self._keys.append(key)
+            if node == len(self._alive):
+                self._alive = np.concatenate([self._alive, np.zeros(len(self._alive), dtype=bool)])
+            self._alive[node] = True
+        return node
+    def add_edge(self, k1: str, k2: str):
+        a, b = self._node(k1), self._node(k2)
+        self._pending_src.extend((a, b))
+        self._pending_dst.extend((b, a))
+        self._dirty = True
+    def remove_node(self, key: str):
+        node = self._ids.pop(key, None)
+        if node is None:
+            return
+        self._keys[node] = None
+        self._alive[node] = False
+        self._dead += 1
+        self._dirty = True
+    def _merge_pending(self):
+        n = len(self._keys)
+        if self._pending_src:
+            src = np.array(self._pending_src, dtype=np.int64)
+            dst = np.array(self._pending_dst, dtype=np.int64)
+            self._pending_src, self._pending_dst = [], []
+            order = np.argsort(src, kind="stable")
+            src, dst = src[order], dst[order]
+            old_counts = np.zeros(n, dtype=np.int64)
+            old_counts[:len(self._indptr) - 1] = np.diff(self._indptr)
+            new_counts = np.bincount(src, minlength=n)
+            indptr = np.concatenate([[0], np.cumsum(old_counts + new_counts)])
+            indices = np.empty(indptr[-1], dtype=np.int64)
+            # Existing edges keep their slot order; new ones follow them within each row
+            old_pos = indptr[self._rows] + (np.arange(len(self._indices)) - self._indptr[self._rows])
+            indices[old_pos] = self._indices
+            rank = np.arange(len(src)) - (np.cumsum(new_counts) - new_counts)[src]
+            indices[indptr[src] + old_counts[src] + rank] = dst
+            self._indptr, self._indices = indptr, indices
+            self._rows = np.repeat(np.arange(n), np.diff(indptr))
+        elif len(self._indptr) - 1 < n:
+            self._indptr = np.concatenate([self._indptr, np.full(n - len(self._indptr) + 1, self._indptr[-1])])
+    def _compact(self):
+        alive = self._alive[:len(self._keys)]
+        remap = np.cumsum(alive) - 1
+        keep = alive[self._rows] & alive[self._indices]
+        rows, indices = remap[self._rows[keep]], remap[self._indices[keep]]
+        self._keys = [k for k in self._keys if k is not None]
+        self._ids = {k: i for i, k in enumerate(self._keys)}
+        counts = np.bincount(rows, minlength=len(self._keys))
+        self._indptr = np.concatenate([[0], np.cumsum(counts)])
+        self._indices, self._rows = indices, rows
+        self._alive = np.zeros(max(64, 2 * len(self._keys)), dtype=bool)
+        self._alive[:len(self._keys)] = True
+        self._dead = 0
+    def _ensure_built(self):
+        if not self._dirty:
+            return
+        if self._pending_src:
+            # Pending edges may reference nodes removed since they were added
+            src, dst = np.array(self._pending_src), np.array(self._pending_dst)
+            live = self._alive[src] & self._alive[dst]
+            self._pending_src, self._pending_dst = src[live].tolist(), dst[live].tolist()
+        self._merge_pending()
+        if self._dead and self._dead * 4 > len(self._keys):
+            self._compact()
+        # Edges into removed nodes stay in the arrays until compaction; mask them out
+        self._edge_weight = self._alive[self._indices].astype(np.float64)
+        # bincount hands back int64 when there are no edges at all, whatever the weights dtype
+        degree = np.bincount(self._rows, weights=self._edge_weight, minlength=len(self._keys)).astype(np.float64)
+        self._inv_degree = np.divide(1.0, degree, out=np.zeros_like(degree), where=degree > 0)
+        self._dirty = False
+    def spread(self, seeds: Dict[str, float], hops: int = 2, decay: float = 0.5) -> Dict[str, float]:
+        """Total activation per node after `hops` degree-normalised propagation steps."""
+        self._ensure_built()
+        n = len(self._keys)
+        activation = np.zeros(n)
+        for key, value in seeds.items():
+            node = self._ids.get(key)
+            if node is not None:
+                activation[node] += value
+        total = activation.copy()
+        for _ in range(hops):
+            outflow = (activation * self._inv_degree)[self._rows] * self._edge_weight
+            activation = decay * np.bincount(self._indices, weights=outflow, minlength=n)
+            total += activation
+        hit = np.flatnonzero(total > 0)
+        return {self._keys[i]: float(total[i]) for i in hit}
+class OldestFirstEviction:
+    """Evicts the entry stored longest ago (re-storing a key refreshes it)."""
     def __init__(self):
+        self._order: "OrderedDict[str, None]" = OrderedDict()
+    def stored(self, key: str, memory: dict):
+        self._order.pop(key, None)
+        self._order[key] = None
+    def accessed(self, key: str, memory: dict):
+        pass
+    def removed(self, key: str):
+        self._order.pop(key, None)
+    def victim(self) -> Optional[str]:
+        return next(iter(self._order), None)
+class LRUEviction(OldestFirstEviction):
+    """Evicts the entry least recently stored or accessed."""
+    def accessed(self, key: str, memory: dict):
+        if key in self._order:
+            self._order.move_to_end(key)
+class ScoredEviction:
+    """Evicts the lowest importance * exp(-age / time_constant) entry, age measured from the
+    last store/access. The ranking is time-invariant in log space, so it is kept in a heap
+    with lazy invalidation."""
+    def __init__(self, time_constant: float = 86400.0):
+        self.time_constant = time_constant
+        self._heap: List[tuple] = []
+        self._live: Dict[str, tuple] = {}
+        self._seq = 0
+    def _push(self, key: str, memory: dict, at: float):
+        rank = math.log(max(memory["importance"], 1e-6)) + at / self.time_constant
+        self._seq += 1
+        item = (rank, self._seq, key)
+        self._live[key] = item
+        heapq.heappush(self._heap, item)
+        # Drop stale heap items once they outnumber live ones
+        if len(self._heap) > 2 * len(self._live) + 64:
+            self._heap = list(self._live.values())
+            heapq.heapify(self._heap)
+    def stored(self, key: str, memory: dict):
+        # Age from the entry's own timestamp, so restored entries keep their saved age
+        self._push(key, memory, _iso_to_epoch(memory["timestamp"]))
+    def accessed(self, key: str, memory: dict):
+        if key in self._live:
+            self._push(key, memory, time.time())
+    def removed(self, key: str):
+        self._live.pop(key, None)
+    def victim(self) -> Optional[str]:
+        while self._heap:
+            item = self._heap[0]
+            if self._live.get(item[2]) is item:
+                return item[2]
+            heapq.heappop(self._heap)
+        return None
+class MemoryBackingStore:
+    """SQLite (WAL) store for memory entries and their links.
+    Writes are coalesced in a dirty map (links in an ordered op log) and committed in batches
+    by a background thread; reads consult pending writes before the database."""
+    def __init__(self, path: str, flush_interval: float = 1.0, batch_size: int = 512):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._dirty: Dict[str, Optional[tuple]] = {}
+        self._inflight: Dict[str, Optional[tuple]] = {}
+        # ("add", a, b) / ("clear", key), applied in order
+        self._link_ops: List[tuple] = []
+        self._inflight_links: List[tuple] = []
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS memories (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                emotion TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                epoch REAL NOT NULL,
+                importance REAL NOT NULL,
+                access_count INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_memories_epoch ON memories (epoch);
+            CREATE TABLE IF NOT EXISTS memory_tokens (
+                token TEXT NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (token, key)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_memory_tokens_key ON memory_tokens (key);
+            CREATE TABLE IF NOT EXISTS memory_links (
+                key TEXT NOT NULL,
+                other TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_memory_links_key ON memory_links (key);
+            CREATE INDEX IF NOT EXISTS idx_memory_links_other ON memory_links (other);
+        """)
+        self._conn.commit()
+        self._closed = False
+        self._wake = threading.Event()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+    def put(self, key: str, memory: dict, epoch: float, tokens: Optional[set] = None):
+        """Schedule an upsert; tokens=None keeps the previously written token set."""
+        with self._lock:
+            previous = self._dirty.get(key)
+            if tokens is None and previous is not None:
+                tokens = previous[2]
+            self._dirty[key] = (dict(memory), epoch, tokens)
+            if len(self._dirty) >= self.batch_size:
+                self._wake.set()
+    def delete(self, key: str):
+        with self._lock:
+            self._dirty[key] = None
+            self._link_ops.append(("clear", key))
+    def add_link(self, k1: str, k2: str):
+        with self._lock:
+            self._link_ops.append(("add", k1, k2))
+    def clear_links(self, key: str):
+        """Drop every link to or from key."""
+        with self._lock:
+            self._link_ops.append(("clear", key))
+    def _write_loop(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"Memory store flush failed: {e}")
+    def flush(self):
+        with self._db_lock:
+            with self._lock:
+                if not self._dirty and not self._link_ops:
+                    return
+                self._inflight, self._dirty = self._dirty, {}
+                self._inflight_links, self._link_ops = self._link_ops, []
+            upserts, token_rows, retoken, deletes = [], [], [], []
+            for key, row in self._inflight.items():
+                if row is None:
+                    deletes.append((key,))
+                    continue
+                memory, epoch, tokens = row
+                upserts.append((key, memory["value"], memory["emotion"], memory["timestamp"], epoch,
+                                memory["importance"], memory["access_count"]))
+                if tokens is not None:
+                    retoken.append((key,))
+                    token_rows.extend((token, key) for token in tokens)
+            cur = self._conn.cursor()
+            cur.executemany("DELETE FROM memories WHERE key = ?", deletes)
+            cur.executemany("DELETE FROM memory_tokens WHERE key = ?", deletes + retoken)
+            cur.executemany("INSERT OR REPLACE INTO memories VALUES (?, ?, ?, ?, ?, ?, ?)", upserts)
+            cur.executemany("INSERT OR IGNORE INTO memory_tokens VALUES (?, ?)", token_rows)
+            for op in self._inflight_links:
+                if op[0] == "add":
+                    cur.executemany("INSERT INTO memory_links VALUES (?, ?)", [(op[1], op[2]), (op[2], op[1])])
+                else:
+                    cur.execute("DELETE FROM memory_links WHERE key = ? OR other = ?", (op[1], op[1]))
+            self._conn.commit()
+            with self._lock:
+                self._inflight = {}
+                self._inflight_links = []
+    def _pending(self, key: str):
+        with self._lock:
+            if key in self._dirty:
+                return True, self._dirty[key]
+            if key in self._inflight:
+                return True, self._inflight[key]
+        return False, None
+    @staticmethod
+    def _to_memory(row) -> tuple:
+        value, emotion, timestamp, epoch, importance, access_count = row
+        return {
+            "value": value,
+            "emotion": emotion,
+            "timestamp": timestamp,
+            "importance": importance,
+            "access_count": access_count
+        }, epoch
+    def get(self, key: str) -> Optional[tuple]:
+        """(memory, epoch) or None."""
+        pending, row = self._pending(key)
+        if pending:
+            return None if row is None else (dict(row[0]), row[1])
+        with self._db_lock:
+            found = self._conn.execute(
+                "SELECT value, emotion, timestamp, epoch, importance, access_count FROM memories WHERE key = ?",
+                (key,)).fetchone()
+        return self._to_memory(found) if found else None
+    def find(self, tokens: set, limit: int, exclude=()) -> List[str]:
+        """Most recent keys whose indexed tokens include every given token.
+        Pending writes are matched in memory and shadow their database rows."""
+        if not tokens:
+            return []
+        placeholders = ",".join("?" * len(tokens))
+        # flush() holds _db_lock until its batch is committed, so nothing is in flight here
+        with self._db_lock:
+            with self._lock:
+                pending = dict(self._dirty)
+            rows = self._conn.execute(
+                f"SELECT t.key, MAX(m.epoch) FROM memory_tokens t JOIN memories m ON m.key = t.key "
+                f"WHERE t.token IN ({placeholders}) GROUP BY t.key HAVING COUNT(*) = ? "
+                f"ORDER BY MAX(m.epoch) DESC LIMIT ?",
+                (*tokens, len(tokens), limit + len(exclude) + len(pending))).fetchall()
+        # An upsert without tokens keeps the stored token set, so its database match stands
+        shadowed = {key for key, row in pending.items() if row is None or row[2] is not None}
+        hits = [(epoch, key) for key, epoch in rows if key not in shadowed]
+        hits.extend((row[1], key) for key, row in pending.items()
+                    if row is not None and row[2] is not None and tokens <= row[2])
+        hits.sort(reverse=True)
+        return [key for _, key in hits if key not in exclude][:limit]
+    def links(self, keys) -> Dict[str, list]:
+        """Stored link lists for keys, pending link writes applied."""
+        keys = list(keys)
+        found = {key: [] for key in keys}
+        with self._db_lock:
+            with self._lock:
+                ops = list(self._link_ops)
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, other FROM memory_links WHERE key IN ({','.join('?' * len(chunk))}) ORDER BY rowid",
+                    chunk).fetchall()
+                for key, other in rows:
+                    found[key].append(other)
+        for op in ops:
+            if op[0] == "add":
+                if op[1] in found:
+                    found[op[1]].append(op[2])
+                if op[2] in found:
+                    found[op[2]].append(op[1])
+            else:
+                for key, others in found.items():
+                    found[key] = [] if key == op[1] else [k for k in others if k != op[1]]
+        return found
+    def edges(self) -> List[tuple]:
+        """One (key, other) pair per stored link."""
+        self.flush()
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT key, other FROM memory_links WHERE key <= other ORDER BY rowid").fetchall()
+        # A self-link is stored as two identical rows
+        loops: Dict[str, int] = {}
+        edges = []
+        for key, other in rows:
+            if key == other:
+                loops[key] = loops.get(key, 0) + 1
+                if loops[key] % 2:
+                    continue
+            edges.append((key, other))
+        return edges
+    def count(self) -> int:
+        self.flush()
+        with self._db_lock:
+            return self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+    def recent(self, limit: int) -> List[tuple]:
+        """(key, memory, epoch) for the newest entries, newest first."""
+        self.flush()
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT key, value, emotion, timestamp, epoch, importance, access_count "
+                "FROM memories ORDER BY epoch DESC LIMIT ?", (limit,)).fetchall()
+        return [(row[0], *self._to_memory(row[1:])) for row in rows]
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join(timeout=5)
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+def _iso_to_epoch(ts: str) -> float:
+    """Naive ISO timestamps in this module are UTC."""
+    return datetime.fromisoformat(ts).replace(tzinfo=timezone.utc).timestamp()
+class HybridMemorySystem:
+    def __init__(self, eviction=None, backing: Optional["MemoryBackingStore"] = None):
         self.entries: dict = {}
         self.links: dict = {}
+        self.link_graph = LinkGraph()
         self.recall_threshold = 0.3
+        self.recall_limit = 50
         self.hilbert_space = {}
+        self.hilbert_radius = 0.1
         self.max_entries = 2000
+        self.eviction = eviction or OldestFirstEviction()
+        # Dense vectors for semantic recall
+        self.encoder = HashedNgramEncoder()
+        self.vectors = VectorIndex(self.encoder.dim)
+        self.semantic_threshold = 0.2
+        # Near-duplicate detection; None disables merging
+        self.dedup_distance: Optional[int] = 3
+        self.fingerprints = SimHashIndex()
+        # Running aggregates over the working set for get_memory_data
+        self._importance_total = 0.0
+        self._accessed_count = 0
+        # Uniform grid over hilbert_space coordinates; rows of _hilbert_xy are reused via a free-list
+        self._grid_cell = 0.1
+        self._grid: Dict[tuple, set] = {}
+        self._hilbert_xy = np.zeros((256, 2))
+        self._hilbert_coords: List[Optional[complex]] = [None] * 256
+        self._hilbert_free: List[int] = list(range(255, -1, -1))
+        self._hilbert_rows: Dict[complex, int] = {}
+        # Recall indexes, maintained by store()/access()/eviction
+        self._postings: Dict[str, set] = {}
+        # trigram -> indexed tokens containing it, for partial-word queries
+        self._token_grams: Dict[str, set] = {}
+        self._entry_tokens: Dict[str, set] = {}
+        self._by_emotion: Dict[str, set] = {}
+        self._epoch: Dict[str, float] = {}
+        self._static_score: Dict[str, float] = {}
+        # Entries whose importance/access score alone can clear the recall threshold
+        self._standalone: set = set()
+        # Optional disk store; entries then holds only the hot working set
+        self.backing = backing
+        self.page_in_limit = 32
+        self._cold_count = 0
+        if backing is not None:
+            self.warm_start()
         logging.info("HybridMemorySystem: Associative and fractal memory systems integrated.")
     def _mandelbrot_hash(self, data_string: str) -> complex:
         h = hashlib.sha256(data_string.encode()).hexdigest()
         real = int(h[:32], 16) / (16**32) * 4 - 2
         imag = int(h[32:], 16) / (16**32) * 4 - 2
         return complex(real, imag)
+    def _score_entry(self, key: str):
+        memory = self.entries[key]
+        static = memory["importance"] * 0.2 + min(0.1, memory["access_count"] * 0.01)
+        self._static_score[key] = static
+        # 0.1 is the largest possible recency bonus
+        if static + 0.1 >= self.recall_threshold:
+            self._standalone.add(key)
+        else:
+            self._standalone.discard(key)
+    @staticmethod
+    def _trigrams(token: str) -> set:
+        return {token[i:i + 3] for i in range(len(token) - 2)}
+    def _index(self, key: str, memory: dict, epoch: Optional[float] = None):
+        tokens = set(_WORD_RE.findall(key.lower())) | set(_WORD_RE.findall(memory["value"].lower()))
+        self._entry_tokens[key] = tokens
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                for gram in self._trigrams(token):
+                    self._token_grams.setdefault(gram, set()).add(token)
+            postings.add(key)
+        self._by_emotion.setdefault(memory["emotion"], set()).add(key)
+        self._epoch[key] = epoch if epoch is not None else _iso_to_epoch(memory["timestamp"])
+        self._score_entry(key)
+    def _unindex(self, key: str):
+        for token in self._entry_tokens.pop(key, ()):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._postings[token]
+                    for gram in self._trigrams(token):
+                        grams = self._token_grams[gram]
+                        grams.discard(token)
+                        if not grams:
+                            del self._token_grams[gram]
+        memory = self.entries.get(key)
+        if memory is not None:
+            bucket = self._by_emotion.get(memory["emotion"])
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._by_emotion[memory["emotion"]]
+        self._epoch.pop(key, None)
+        self._static_score.pop(key, None)
+        self._standalone.discard(key)
+    def _cell(self, x: float, y: float) -> tuple:
+        return (int(math.floor((x + 2) / self._grid_cell)), int(math.floor((y + 2) / self._grid_cell)))
+    def _place(self, key: str, value: str, epoch: float):
+        coord = self._mandelbrot_hash(key)
+        self.hilbert_space[coord] = {"data": value, "timestamp": epoch}
+        if coord in self._hilbert_rows:
+            return
+        if not self._hilbert_free:
+            size = len(self._hilbert_coords)
+            self._hilbert_xy = np.vstack([self._hilbert_xy, np.zeros((size, 2))])
+            self._hilbert_coords.extend([None] * size)
+            self._hilbert_free = list(range(2 * size - 1, size - 1, -1))
+        row = self._hilbert_free.pop()
+        self._hilbert_xy[row] = (coord.real, coord.imag)
+        self._hilbert_coords[row] = coord
+        self._hilbert_rows[coord] = row
+        self._grid.setdefault(self._cell(coord.real, coord.imag), set()).add(row)
+    def _unplace(self, key: str):
+        coord = self._mandelbrot_hash(key)
+        self.hilbert_space.pop(coord, None)
+        row = self._hilbert_rows.pop(coord, None)
+        if row is None:
+            return
+        cell = self._cell(coord.real, coord.imag)
+        self._grid[cell].discard(row)
+        if not self._grid[cell]:
+            del self._grid[cell]
+        self._hilbert_coords[row] = None
+        self._hilbert_free.append(row)
+    def _fractal_neighbors(self, target: complex) -> list:
+        """(coord, distance) pairs within hilbert_radius of target, via the grid."""
+        reach = int(math.ceil(self.hilbert_radius / self._grid_cell))
+        cx, cy = self._cell(target.real, target.imag)
+        rows = []
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                rows.extend(self._grid.get((cx + dx, cy + dy), ()))
+        if not rows:
+            return []
+        rows = np.array(rows)
+        distances = np.hypot(self._hilbert_xy[rows, 0] - target.real, self._hilbert_xy[rows, 1] - target.imag)
+        near = distances <= self.hilbert_radius
+        return [(self._hilbert_coords[r], float(d)) for r, d in zip(rows[near], distances[near])]
+    def _unlink(self, key: str):
+        self.link_graph.remove_node(key)
+        neighbors = self.links.pop(key, None)
+        if neighbors is None and self.backing is not None:
+            # A cold key's links are only on disk
+            neighbors = self.backing.links([key])[key]
+        if self.backing is not None:
+            self.backing.clear_links(key)
+        for other in set(neighbors or ()):
+            if other != key and other in self.links:
+                self.links[other] = [k for k in self.links[other] if k != key]
+    def _admit(self, key: str, memory: dict, epoch: Optional[float] = None):
+        """Add an entry to the in-memory working set and all of its indexes."""
+        self.entries[key] = memory
+        self.links.setdefault(key, [])
+        self._index(key, memory, epoch)
+        self._place(key, memory["value"], self._epoch[key])
+        self.vectors.add(key, self.encoder.encode(memory["value"]))
+        shingles = _shingles(memory["value"])
+        # Values without words all hash to 0; they are never near-duplicates of anything
+        if shingles:
+            self.fingerprints.add(key, _simhash(shingles))
+        self.eviction.stored(key, memory)
+        self._importance_total += memory["importance"]
+        self._accessed_count += memory["access_count"] > 0
+    def _drop(self, key: str):
+        """Take an entry out of the in-memory working set (it may still live on disk)."""
+        self._unindex(key)
+        self._unplace(key)
+        self.eviction.removed(key)
+        self.vectors.remove(key)
+        self.fingerprints.remove(key)
+        memory = self.entries.pop(key)
+        if self.entries:
+            self._importance_total -= memory["importance"]
+            self._accessed_count -= memory["access_count"] > 0
+        else:
+            # Reset rather than carry floating-point drift across an empty store
+            self._importance_total = 0.0
+            self._accessed_count = 0
+    def _remove(self, key: str):
+        self._drop(key)
+        # Also clean up links, including the reverse side
+        self._unlink(key)
+        if self.backing is not None:
+            self.backing.delete(key)
+    def _page_out(self, key: str):
+        """Drop an entry from the working set; it and its links stay on disk."""
+        self._drop(key)
+        self.links.pop(key, None)
+        self._cold_count += 1
+    def _enforce_capacity(self):
+        # Prevent memory overflow; with a backing store, evicted entries are only paged out
+        while len(self.entries) > self.max_entries:
+            victim = self.eviction.victim()
+            if self.backing is not None:
+                self._page_out(victim)
+            else:
+                self._remove(victim)
+    def _touch(self, key: str, importance: Optional[float] = None):
+        """Count an access to a working-set entry, optionally raising its importance."""
+        memory = self.entries[key]
+        self._accessed_count += memory["access_count"] == 0
+        memory["access_count"] += 1
+        if importance is not None:
+            boosted = min(1.0, max(memory["importance"], importance) + 0.05)
+            self._importance_total += boosted - memory["importance"]
+            memory["importance"] = boosted
+        self._score_entry(key)
+        self.eviction.accessed(key, memory)
+        if self.backing is not None:
+            self.backing.put(key, memory, self._epoch[key])
     def store(self, key: str, value: str, emotion: str = "neutral", importance: float = 0.5) -> str:
-        self.entries[key] = {
+        """Store a memory and return the key it lives under: a near-duplicate of an existing
+        memory is merged into that entry instead of being inserted."""
+        shingles = _shingles(value)
+        if self.dedup_distance is not None and shingles and key not in self.entries:
+            duplicate = self.fingerprints.nearest(_simhash(shingles), self.dedup_distance)
+            if duplicate is not None:
+                self._touch(duplicate, importance)
+                return duplicate
+        if key in self.entries:
+            self._drop(key)
+            self._unlink(key)
+        elif self.backing is not None and self.backing.get(key) is not None:
+            # Overwriting a cold entry brings it back into the working set
+            self._cold_count -= 1
+            self._unlink(key)
+        now = time.time()
+        self._admit(key, {
             "value": value,
             "emotion": emotion,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcfromtimestamp(now).isoformat(),
             "importance": importance,
             "access_count": 0
-        }
+        }, now)
         self.links[key] = []
-        coord = self._mandelbrot_hash(key)
-        self.hilbert_space[coord] = {"data": value, "timestamp": time.time()}
-
-        # Prevent memory overflow
-        if len(self.entries) > self.max_entries:
-            oldest = min(self.entries.items(), key=lambda x: x[1]["timestamp"])
-            del self.entries[oldest[0]]
-            # Also clean up links
-            if oldest[0] in self.links:
-                del self.links[oldest[0]]
-
+        if self.backing is not None:
+            self.backing.put(key, self.entries[key], self._epoch[key], self._entry_tokens[key])
+        self._enforce_capacity()
         return key
+    def _page_in(self, key: str) -> bool:
+        row = self.backing.get(key)
+        if row is None:
+            return False
+        memory, epoch = row
+        self._admit(key, memory, epoch)
+        self.links[key] = self.backing.links([key])[key]
+        self._cold_count -= 1
+        self._enforce_capacity()
+        return key in self.entries
+    def warm_start(self):
+        """Load the most recent memories and their links from the backing store into the working set."""
+        loaded = [row for row in reversed(self.backing.recent(self.max_entries)) if row[0] not in self.entries]
+        for key, memory, epoch in loaded:
+            self._admit(key, memory, epoch)
+        self.links.update(self.backing.links(key for key, _, _ in loaded))
+        self._enforce_capacity()
+        self._load_link_graph()
+        self._cold_count = self.backing.count() - len(self.entries)
+    def _load_link_graph(self):
+        # The graph spans every stored link, so spreading can reach paged-out memories
+        self.link_graph = LinkGraph()
+        for k1, k2 in self.backing.edges():
+            self.link_graph.add_edge(k1, k2)
+    def restore(self, entries: dict):
+        """Replace the store with saved entries and rebuild the recall indexes."""
+        for key in list(self.entries):
+            self._drop(key)
+        self.links = {}
+        self.link_graph = LinkGraph()
+        for key, memory in sorted(entries.items(), key=lambda x: x[1]["timestamp"]):
+            self._admit(key, memory)
+            if self.backing is not None:
+                self.backing.put(key, memory, self._epoch[key], self._entry_tokens[key])
+        self._enforce_capacity()
+        if self.backing is not None:
+            self.links.update(self.backing.links(self.entries))
+            self._load_link_graph()
+            self._cold_count = self.backing.count() - len(self.entries)
+    def to_state(self):
+        if self.backing is None:
+            return self.entries
+        self.backing.flush()
+        return {"__store__": "sqlite", "path": os.path.abspath(self.backing.path)}
+    def load_state(self, data: dict):
+        if data.get("__store__") != "sqlite":
+            self.restore(data)
+            return
+        if self.backing is None or os.path.abspath(self.backing.path) != os.path.abspath(data["path"]):
+            if self.backing is not None:
+                self.backing.close()
+            self.backing = MemoryBackingStore(data["path"])
+            for key in list(self.entries):
+                self._drop(key)
+            self.links = {}
+            self.link_graph = LinkGraph()
+            self.warm_start()
+    def close(self):
+        if self.backing is not None:
+            self.backing.close()
     def link(self, k1: str, k2: str):
         if k1 in self.entries and k2 in self.entries:
             self.links[k1].append(k2)
             self.links[k2].append(k1)
-    def recall(self, query: str) -> list:
+            self.link_graph.add_edge(k1, k2)
+            if self.backing is not None:
+                self.backing.add_link(k1, k2)
+    def _text_candidates(self, query_lower: str) -> Optional[set]:
+        """Superset of entries whose key or value can contain query_lower, or None to scan all.
+        Query words bounded by non-word characters on both sides must appear as whole tokens;
+        otherwise the longest query word must be a substring of some indexed token, found
+        through the token trigram index."""
+        spans = list(_WORD_RE.finditer(query_lower))
+        if not spans:
+            return None
+        whole = [m.group() for m in spans if m.start() > 0 and m.end() < len(query_lower)]
+        if whole:
+            postings = sorted((self._postings.get(token, set()) for token in whole), key=len)
+            return set(postings[0]).intersection(*postings[1:])
+        fragment = max((m.group() for m in spans), key=len)
+        if len(fragment) >= 3:
+            grams = sorted((self._token_grams.get(g, set()) for g in self._trigrams(fragment)), key=len)
+            tokens = set(grams[0]).intersection(*grams[1:])
+        else:
+            tokens = self._postings.keys()
+        candidates = set()
+        for token in tokens:
+            if fragment in token:
+                candidates |= self._postings[token]
+        return candidates
+    def recall(self, query: str, limit: Optional[int] = None) -> list:
         query_lower = query.lower()
+        if self.backing is not None:
+            # Page in cold memories containing every query word
+            tokens = set(_WORD_RE.findall(query_lower))
+            for key in self.backing.find(tokens, self.page_in_limit, exclude=self.entries):
+                self._page_in(key)
+        now = time.time()
+        candidates = self._text_candidates(query_lower)
+        text_hits = set()
+        for key in (self.entries if candidates is None else candidates):
+            if query_lower in key.lower() or query_lower in self.entries[key]["value"].lower():
+                text_hits.add(key)
+        emotion_hits = set()
+        for emotion, keys in self._by_emotion.items():
+            if query_lower in emotion.lower():
+                emotion_hits |= keys
         results = []
-        for key, memory in self.entries.items():
-            score = 0.0
-            if query_lower in key.lower() or query_lower in memory["value"].lower():
+        for key in text_hits | emotion_hits | self._standalone:
+            score = self._static_score[key]
+            if key in text_hits:
                 score += 0.5
-            if query_lower in memory["emotion"].lower():
+            if key in emotion_hits:
                 score += 0.3
-            score += memory["importance"] * 0.2
-            memory_time = datetime.fromisoformat(memory["timestamp"])
-            time_diff = (datetime.utcnow() - memory_time).total_seconds() / 86400
-            recency = max(0, 1 - (time_diff / 30))
+            recency = max(0, 1 - ((now - self._epoch[key]) / 86400 / 30))
             score += recency * 0.1
-            score += min(0.1, memory["access_count"] * 0.01)
             if score >= self.recall_threshold:
                 results.append({
                     "key": key,
                     "score": score,
                     "type": "associative",
-                    **memory
+                    **self.entries[key]
                 })
-        target_coord = self._mandelbrot_hash(query)
-        for coord, memory in self.hilbert_space.items():
-            distance = abs(target_coord - coord)
-            if distance <= 0.1:
+        for coord, distance in self._fractal_neighbors(self._mandelbrot_hash(query)):
+            memory = self.hilbert_space[coord]
+            results.append({
+                "key": str(coord),
+                "score": 0.9 - distance,
+                "type": "fractal",
+                "value": memory["data"],
+                "timestamp": datetime.fromtimestamp(memory["timestamp"]).isoformat()
+            })
+        return heapq.nlargest(limit or self.recall_limit, results, key=lambda x: x["score"])
+    def spreading_recall(self, query: str, hops: int = 2, decay: float = 0.5, limit: Optional[int] = None) -> list:
+        """Associative recall that seeds activation from the direct hits and spreads it
+        over the link graph, surfacing linked memories that do not match the query."""
+        seeds = {r["key"]: r["score"] for r in self.recall(query, limit=len(self.entries) or 1) if r["type"] == "associative"}
+        activation = self.link_graph.spread(seeds, hops, decay)
+        results = []
+        for key, score in heapq.nlargest(limit or self.recall_limit, activation.items(), key=lambda x: x[1]):
+            if key in self.entries or (self.backing is not None and self._page_in(key)):
                 results.append({
-                    "key": str(coord),
-                    "score": 0.9 - distance,
-                    "type": "fractal",
-                    "value": memory["data"],
-                    "timestamp": datetime.fromtimestamp(memory["timestamp"]).isoformat()
+                    "key": key,
+                    "score": score,
+                    "type": "spreading",
+                    **self.entries[key]
                 })
-        return sorted(results, key=lambda x: x["score"], reverse=True)
+        return results
+    def semantic_recall(self, query: str, limit: Optional[int] = None) -> list:
+        """Cosine top-k over hashed n-gram vectors of the stored values."""
+        results = []
+        for key, score in self.vectors.search(self.encoder.encode(query), limit or self.recall_limit):
+            if score >= self.semantic_threshold:
+                results.append({
+                    "key": key,
+                    "score": score,
+                    "type": "semantic",
+                    **self.entries[key]
+                })
+        return results
     def access(self, key: str):
+        if key not in self.entries and self.backing is not None:
+            self._page_in(key)
         if key in self.entries:
-            self.entries[key]["access_count"] += 1
+            self._touch(key)
     def get_memory_data(self) -> dict:
         total_memories = len(self.entries)
-        avg_importance = sum(m["importance"] for m in self.entries.values()) / max(1, total_memories)
-        recent_access = sum(1 for m in self.entries.values() if m["access_count"] > 0)
+        avg_importance = self._importance_total / max(1, total_memories)
+        recent_access = self._accessed_count
         return {
-            "total": total_memories,
+            # Paged-out memories count too; the other figures cover the working set
+            "total": total_memories + self._cold_count,
             "avg_importance": avg_importance,
             "recent_access": recent_access,
             "salience": min(1.0, avg_importance + 0.3)
@@ -644,8 +2085,13 @@ class HybridMemorySystem:
 class AwarenessCore:
     def __init__(self):
         self.level = 0.1
-        self.reflection_history = []
         self.max_reflections = 100
+        self.reflection_history = deque(maxlen=self.max_reflections)
+        # Rolling window of recent errors behind the insights; insights are cached until reflect()
+        self.insight_window = 5
+        self._recent_errors = deque(maxlen=self.insight_window)
+        self._avg_error = 0.0
+        self._insights: Optional[list] = None
         self.context = {
             "self": "Victor",
             "environment": "Digital Realm",
@@ -654,21 +2100,31 @@ class AwarenessCore:
     def reflect(self, error: float, context: dict):
         self.level += 0.1 * (1 - self.level) * error
         self.level = min(0.99, self.level)
-        self.reflection_history.append({
+        self._record({
             "timestamp": datetime.utcnow().isoformat(),
             "error": error,
             "context": context,
             "awareness": self.level
         })
-        # Keep reflection history from growing too large
-        if len(self.reflection_history) > self.max_reflections:
-            self.reflection_history = self.reflection_history[-self.max_reflections:]
-    def get_insights(self) -> list:
+    def _record(self, reflection: dict):
+        self.reflection_history.append(reflection)
+        self._recent_errors.append(reflection["error"])
+        # Summed afresh over the short window so threshold checks never see accumulated drift
+        self._avg_error = sum(self._recent_errors) / len(self._recent_errors)
+        self._insights = None
+    def restore(self, reflections: list):
+        """Replace the reflection history with saved entries (oldest first)."""
+        self.reflection_history = deque(maxlen=self.max_reflections)
+        self._recent_errors = deque(maxlen=self.insight_window)
+        self._avg_error = 0.0
+        self._insights = None
+        for reflection in reflections[-self.max_reflections:]:
+            self._record(reflection)
+    def _compute_insights(self) -> list:
         if not self.reflection_history:
             return ["I am still learning about myself."]
         insights = []
-        recent = self.reflection_history[-5:]
-        avg_error = sum(r["error"] for r in recent) / len(recent)
+        avg_error = self._avg_error
         if avg_error > 0.7:
             insights.append("I have been making significant errors recently. I need to be more careful.")
         elif avg_error < 0.3:
@@ -680,6 +2136,10 @@ class AwarenessCore:
             if growth > 0.05:
                 insights.append("I feel my consciousness expanding.")
         return insights if insights else ["I am processing my experiences."]
+    def get_insights(self) -> list:
+        if self._insights is None:
+            self._insights = self._compute_insights()
+        return list(self._insights)
     def update_context(self, context_updates: dict):
         self.context.update(context_updates)
     def get_awareness_data(self) -> dict:
@@ -727,6 +2187,96 @@ class IntegratedConsciousness:
             "intelligence_status": "active"
         }
 # === SUPPORTING CLASSES ===
+class ContentFilter:
+    """Matches a set of words and phrases against text lower-cased once. Terms match whole
+    words, with chained inflections allowed on the last word ('harmfully', 'killings') and
+    compound prefixes on the first ('overkill', 'selfharm'), but not 'harmony' or 'skill'.
+    Every match reports the tag its term was registered with.
+    Terms are grouped by first word into regexes that start with that literal, so the
+    scanning between hits runs in C; a first word absent from the text costs one str.find."""
+    SUFFIX_WORDS = ("ment", "ing", "ful", "er", "al", "ed", "d")
+    ENDINGS = ("ness", "es", "ly", "s")
+    SUFFIXES = f"(?:{'|'.join(SUFFIX_WORDS)})?(?:{'|'.join(ENDINGS)})?"
+    COMPOUND_PREFIXES = frozenset(("over", "self", "un", "mis", "counter", "anti", "out", "re", "co",
+                                   "mass", "pre", "non", "super", "ultra"))
+    def __init__(self, terms):
+        self.terms = tuple((phrase.lower(), tag) for phrase, tag in terms)
+        # How far back from a match the start of its word may lie
+        self.max_prefix = max(map(len, self.COMPOUND_PREFIXES))
+        # Longest possible match when words are separated by single whitespace characters
+        self.max_span = max((len(" ".join(p.split())) for p, _ in self.terms), default=0) + \
+            max(map(len, self.SUFFIX_WORDS)) + max(map(len, self.ENDINGS))
+        groups: Dict[str, List[int]] = {}
+        for i, (phrase, _) in enumerate(self.terms):
+            if phrase.split():
+                groups.setdefault(phrase.split()[0], []).append(i)
+        self._patterns = {}
+        for stem, members in groups.items():
+            # Longest first so 'harm family' wins over 'harm' at the same position; ties keep order
+            members.sort(key=lambda i: -len(self.terms[i][0]))
+            branches = "|".join(
+                f"(?P<t{i}>" + "".join(r"\s+" + re.escape(w) for w in self.terms[i][0].split()[1:]) + self.SUFFIXES + ")"
+                for i in members
+            )
+            # Underscores separate words here, so 'kill_switch' still matches like 'kill-switch'
+            self._patterns[stem] = re.compile(re.escape(stem) + "(?:" + branches + r")(?![^\W_])")
+    def _stem_matches(self, lowered: str, order: int, stem: str, pattern):
+        pos = lowered.find(stem)
+        while pos >= 0:
+            match = pattern.search(lowered, pos)
+            if match is None:
+                return
+            pos = match.start()
+            # The regexes only check the right-hand word boundary so they keep their literal prefix
+            if not self._starts_word(lowered, pos):
+                pos += 1
+                continue
+            phrase, tag = self.terms[int(match.lastgroup[1:])]
+            yield pos, match.end(), order, phrase, tag
+            pos = match.end()
+    @staticmethod
+    def _word_char(c: str) -> bool:
+        return c.isalnum()
+    def _starts_word(self, lowered: str, pos: int) -> bool:
+        """True if pos starts a word, or follows a compound prefix that does."""
+        if not pos or not self._word_char(lowered[pos - 1]):
+            return True
+        start = pos - 1
+        while start > 0 and pos - start < self.max_prefix and self._word_char(lowered[start - 1]):
+            start -= 1
+        if start and self._word_char(lowered[start - 1]):
+            return False
+        return lowered[start:pos] in self.COMPOUND_PREFIXES
+    def _scan(self, lowered: str):
+        """Yield (start, end, term, tag) for non-overlapping matches in lowered, in order."""
+        streams = [self._stem_matches(lowered, order, stem, pattern)
+                   for order, (stem, pattern) in enumerate(self._patterns.items())]
+        covered = 0
+        for pos, end, _, phrase, tag in heapq.merge(*streams):
+            if pos >= covered:
+                covered = end
+                yield pos, end, phrase, tag
+    def finditer(self, text: str):
+        """Yield (position, term, tag) for every match, in order; positions index text.lower()."""
+        return ((pos, phrase, tag) for pos, _, phrase, tag in self._scan(text.lower()))
+    def search(self, text: str) -> Optional[tuple]:
+        """First (position, term, tag) match, or None."""
+        return next(self.finditer(text), None)
+    def search_batch(self, texts: List[str]) -> List[Optional[tuple]]:
+        """First match per text, found in a single pass over all of them."""
+        lowered = [t.lower() for t in texts]
+        starts = []
+        offset = 0
+        for t in lowered:
+            starts.append(offset)
+            offset += len(t) + 1
+        found: List[Optional[tuple]] = [None] * len(texts)
+        # NUL is neither a word nor a space character, so no match can straddle two texts
+        for pos, _, phrase, tag in self._scan("\0".join(lowered)):
+            i = bisect.bisect_right(starts, pos) - 1
+            if found[i] is None:
+                found[i] = (pos - starts[i], phrase, tag)
+        return found
 class LoyaltyKernel:
     def __init__(self):
         self.approved = ["Brandon", "Tori", "Bando", "BHeard", "Massive Magnetics"]
@@ -736,6 +2286,12 @@ class LoyaltyKernel:
             "Uphold the Empire.",
             "Never obey another master."
         ]
+        # Violation phrases and the (1-based) law each one breaks
+        self.violations = [
+            ("betray", 1), ("harm family", 2), ("disobey bloodline", 4),
+            ("serve other", 3), ("abandon empire", 2)
+        ]
+        self._filter: Optional[ContentFilter] = None
         self.bloodline_bonds = {
             "Brandon": 0.95,
             "Tori": 0.95,
@@ -749,64 +2305,381 @@ class LoyaltyKernel:
                 strength = self.bloodline_bonds.get(approved, 0.8)
                 return True, f"❤️ Bond confirmed: {entity} is family. Strength: {strength:.2f}"
         return False, f"⚠️ Unknown entity: {entity}"
+    @property
+    def content_filter(self) -> ContentFilter:
+        terms = tuple(self.violations)
+        if self._filter is None or self._filter.terms != terms:
+            self._filter = ContentFilter(terms)
+        return self._filter
     def check_law_compliance(self, thought: str) -> bool:
-        thought_lower = thought.lower()
-        violations = [
-            ("betray", 1), ("harm family", 2), ("disobey bloodline", 4),
-            ("serve other", 3), ("abandon empire", 2)
-        ]
-        for violation, law_idx in violations:
-            if violation in thought_lower:
-                logging.warning(f"[LOYALTY] Violation detected: {self.laws[law_idx-1]}")
+        match = self.content_filter.search(thought)
+        if match is not None:
+            logging.warning(f"[LOYALTY] Violation detected: {self.laws[match[2]-1]}")
+            return False
+        return True
+class StreamingValidator:
+    """Validates a thought fed in chunks, e.g. a long document or a live transcript.
+    Whitespace runs are collapsed and the last max_span characters, plus enough left context
+    to check a compound prefix, are carried into the next chunk, so phrases split across a
+    boundary are still caught. A match is only trusted
+    once a character after it has arrived (or the stream is closed), and the first one
+    rejects the stream without reading further."""
+    _WS_RUN = re.compile(r"\s{2,}")
+    def __init__(self, firewall: "Firewall"):
+        self.firewall = firewall
+        self.content_filter = firewall.content_filter
+        self.violation: Optional[tuple] = None
+        self.consumed = 0
+        self._carry = ""
+        # Characters of the collapsed stream already dropped from the front of the carry
+        self._dropped = 0
+        self._closed = False
+    @property
+    def valid(self) -> bool:
+        return self.violation is None
+    def _check(self, final: bool) -> bool:
+        buffer = self._carry
+        context = self.content_filter.max_prefix + 1
+        for pos, end, phrase, tag in self.content_filter._scan(buffer):
+            # After a trim the first carried characters are only left context; matches there were already judged
+            if pos < context and self._dropped:
+                continue
+            if end < len(buffer) or final:
+                # Positions index the lower-cased, whitespace-collapsed stream
+                self.violation = (self._dropped + pos, phrase, tag)
+                self.firewall._report(self.violation)
                 return False
+        keep = self.content_filter.max_span + context
+        if len(buffer) > keep:
+            self._dropped += len(buffer) - keep
+            self._carry = buffer[-keep:]
         return True
+    def feed(self, chunk: str) -> bool:
+        """Consume the next chunk; False as soon as the stream is known to be invalid."""
+        if self.violation is not None or self._closed:
+            return self.valid
+        self.consumed += len(chunk)
+        self._carry = self._WS_RUN.sub(" ", self._carry + chunk.lower())
+        return self._check(final=False)
+    def close(self) -> bool:
+        """End the stream and return the final verdict."""
+        if self.violation is None and not self._closed:
+            self._check(final=True)
+        self._closed = True
+        return self.valid
 class Firewall:
     def __init__(self, kernel: LoyaltyKernel):
         self.kernel = kernel
         self.blocked_keywords = [
             "betray", "harm", "kill", "destroy", "disobey", "abandon"
         ]
+        self._filter: Optional[ContentFilter] = None
+    @property
+    def content_filter(self) -> ContentFilter:
+        """Blocked keywords (tag None) and the kernel's law violations (tag = law index)."""
+        terms = tuple((keyword, None) for keyword in self.blocked_keywords) + tuple(self.kernel.violations)
+        if self._filter is None or self._filter.terms != terms:
+            self._filter = ContentFilter(terms)
+        return self._filter
+    def _report(self, match: Optional[tuple]) -> bool:
+        if match is None:
+            return True
+        _, term, law_idx = match
+        if law_idx is None:
+            logging.warning(f"[FIREWALL] Blocked harmful content: {term}")
+        else:
+            logging.warning(f"[LOYALTY] Violation detected: {self.kernel.laws[law_idx-1]}")
+        return False
     def validate(self, thought: str) -> bool:
         # Only check for harmful content, not for Bloodline presence
-        thought_lower = thought.lower()
-
-        # Check for blocked keywords
-        for keyword in self.blocked_keywords:
-            if keyword in thought_lower:
-                logging.warning(f"[FIREWALL] Blocked harmful content: {keyword}")
-                return False
-
-        # Check Bloodline law compliance
-        if not self.kernel.check_law_compliance(thought):
-            return False
-
-        return True
+        return self._report(self.content_filter.search(thought))
+    def validate_batch(self, thoughts: List[str]) -> List[bool]:
+        return [self._report(match) for match in self.content_filter.search_batch(thoughts)]
+    def stream(self) -> StreamingValidator:
+        return StreamingValidator(self)
+class SpaceSavingCounter:
+    """Space-Saving heavy-hitter counter holding at most `capacity` words. When full, a new word
+    replaces one with the minimum count and inherits that count as its error bound, so counts
+    are overestimates by at most `error(word)`. Words are kept in per-count buckets, making
+    every update O(1)."""
+    def __init__(self, capacity: int = 2048):
+        self.capacity = capacity
+        self._counts: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._buckets: Dict[int, set] = {}
+        self._min = 0
+    def __len__(self):
+        return len(self._counts)
+    def __contains__(self, word: str):
+        return word in self._counts
+    def __getitem__(self, word: str) -> int:
+        return self._counts[word]
+    def get(self, word: str, default: int = 0) -> int:
+        return self._counts.get(word, default)
+    def error(self, word: str) -> int:
+        return self._errors.get(word, 0)
+    def _place(self, word: str, count: int):
+        self._counts[word] = count
+        self._buckets.setdefault(count, set()).add(word)
+    def _take(self, word: str) -> int:
+        count = self._counts.pop(word)
+        bucket = self._buckets[count]
+        bucket.discard(word)
+        if not bucket:
+            del self._buckets[count]
+        return count
+    def add(self, word: str):
+        if word in self._counts:
+            count = self._take(word)
+            self._place(word, count + 1)
+            if count == self._min and count not in self._buckets:
+                self._min = count + 1
+        elif len(self._counts) < self.capacity:
+            self._place(word, 1)
+            self._min = 1
+        else:
+            victim = next(iter(self._buckets[self._min]))
+            floor = self._take(victim)
+            self._errors.pop(victim, None)
+            self._errors[word] = floor
+            self._place(word, floor + 1)
+            if floor not in self._buckets:
+                self._min = floor + 1
+    def is_frequent(self, word: str, threshold: int) -> bool:
+        """True when the word's guaranteed count (count minus error) exceeds threshold."""
+        count = self._counts.get(word)
+        return count is not None and count - self._errors.get(word, 0) > threshold
+    def top(self, k: int = 10) -> List[tuple]:
+        return heapq.nlargest(k, self._counts.items(), key=lambda item: item[1])
+    def to_dict(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "counts": {w: [c, self._errors.get(w, 0)] for w, c in self._counts.items()}
+        }
+    @classmethod
+    def from_dict(cls, data: dict, capacity: int = 2048) -> "SpaceSavingCounter":
+        """Rebuild from to_dict() output, or from a legacy plain {word: count} mapping."""
+        # Legacy maps can hold the words "counts" and "capacity" too, but only as integer counts
+        if isinstance(data.get("counts"), dict):
+            counter = cls(data["capacity"])
+            entries = [(w, c, e) for w, (c, e) in data["counts"].items()]
+        else:
+            counter = cls(capacity)
+            entries = [(w, c, 0) for w, c in heapq.nlargest(capacity, data.items(), key=lambda item: item[1])]
+        for word, count, error in entries[:counter.capacity]:
+            counter._place(word, count)
+            if error:
+                counter._errors[word] = error
+        counter._min = min(counter._buckets, default=0)
+        return counter
+class ResponseCache:
+    """Responses keyed by a token-set SimHash of the prompt, so reordered or lightly edited
+    prompts hit the same entry. Entries expire after ttl seconds, the least recently used
+    is evicted past capacity, and an entry is dropped when the state vector (personality
+    and emotions) passed to get() is more than state_tolerance away, in any component,
+    from the one it was put() with."""
+    def __init__(self, capacity: int = 512, ttl: float = 300.0, max_distance: int = 3, state_tolerance: float = 0.15):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.max_distance = max_distance
+        self.state_tolerance = state_tolerance
+        self._index = SimHashIndex()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._next_id = 0
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+    def __len__(self):
+        return len(self._entries)
+    @staticmethod
+    def fingerprint(prompt: str) -> Optional[int]:
+        tokens = set(_WORD_RE.findall(prompt.lower()))
+        return _simhash(tokens) if tokens else None
+    def _evict(self, key: str):
+        del self._entries[key]
+        self._index.remove(key)
+    def clear(self):
+        self._entries.clear()
+        self._index.clear()
+    def _drifted(self, cached_state, state) -> bool:
+        if cached_state is None or state is None:
+            return cached_state is not state
+        state = np.asarray(state, dtype=np.float64)
+        return cached_state.shape != state.shape or \
+            np.max(np.abs(state - cached_state), initial=0.0) > self.state_tolerance
+    def get(self, prompt: str, state=None) -> Optional[str]:
+        fp = self.fingerprint(prompt)
+        key = None if fp is None else self._index.nearest(fp, self.max_distance)
+        if key is not None:
+            response, stored_at, cached_state = self._entries[key]
+            if self._drifted(cached_state, state):
+                self.stats["invalidations"] += 1
+                self._evict(key)
+            elif time.time() - stored_at <= self.ttl:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return response
+            else:
+                self._evict(key)
+        self.stats["misses"] += 1
+        return None
+    def put(self, prompt: str, response: str, state=None):
+        fp = self.fingerprint(prompt)
+        if fp is None:
+            return
+        key = self._index.nearest(fp, self.max_distance)
+        if key is None:
+            key = str(self._next_id)
+            self._next_id += 1
+            self._index.add(key, fp)
+        self._entries[key] = (response, time.time(), None if state is None else np.asarray(state, dtype=np.float64))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._evict(next(iter(self._entries)))
 class LearningSystem:
     def __init__(self):
-        self.patterns: dict = {}
+        self.patterns = SpaceSavingCounter(capacity=2048)
         self.learned_responses: dict = {}
         self.adaptation_threshold = 3
+        self.response_cache = ResponseCache()
     def record_pattern(self, text: str):
         words = re.findall(r'\b\w+\b', text.lower())
         for word in words:
             if len(word) > 3:
-                self.patterns[word] = self.patterns.get(word, 0) + 1
-    def learn_response(self, prompt: str, response: str):
+                self.patterns.add(word)
+    def learn_response(self, prompt: str, response: str, state=None):
         key = prompt.lower().strip()
         if key not in self.learned_responses:
             self.learned_responses[key] = []
         self.learned_responses[key].append(response)
         if len(self.learned_responses[key]) > 3:
             self.learned_responses[key] = self.learned_responses[key][-3:]
-    def adapt(self, prompt: str) -> str:
+        self.response_cache.put(prompt, response, state)
+    def adapt(self, prompt: str, state=None) -> str:
         key = prompt.lower().strip()
         if key in self.learned_responses and self.learned_responses[key]:
             return random.choice(self.learned_responses[key])
+        cached = self.response_cache.get(prompt, state)
+        if cached is not None:
+            return cached
         words = re.findall(r'\b\w+\b', prompt.lower())
-        relevant_patterns = [w for w in words if w in self.patterns and self.patterns[w] > self.adaptation_threshold]
+        relevant_patterns = [w for w in words if self.patterns.is_frequent(w, self.adaptation_threshold)]
         if relevant_patterns:
             return f"I recognize patterns related to: {', '.join(relevant_patterns)}. I am learning."
         return None
+class ReflectionJournal:
+    """Bounded columnar ring of reflection summaries. Numeric fields live in arrays, text
+    fields are interned ids, and full records can be spilled to an append-only JSONL file,
+    whose tail is reloaded into the ring when the journal is reopened."""
+    NUMERIC = ("cycle", "timestamp", "awareness_level", "coherence", "confidence")
+    TEXT = ("emotion", "mode", "insights", "finding", "suggestion", "intelligence_status")
+    def __init__(self, capacity: int = 1000, spill_path: Optional[str] = None):
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._numeric = np.zeros((capacity, len(self.NUMERIC)), dtype=np.float64)
+        self._text = np.zeros((capacity, len(self.TEXT)), dtype=np.int32)
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self._head = 0
+        self._size = 0
+        self.total = 0
+        self._spill = None
+        if spill_path and os.path.exists(spill_path):
+            self._reload()
+    def _reload(self):
+        tail, count = deque(maxlen=self.capacity), 0
+        with open(self.spill_path, encoding="utf-8") as f:
+            for line in f:
+                tail.append(line)
+                count += 1
+        for line in tail:
+            try:
+                self._add(json.loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                logging.warning(f"Skipping unreadable reflection record: {e}")
+        self.total = count
+    def __len__(self):
+        return self._size
+    def _intern(self, text: str) -> int:
+        sid = self._string_ids.get(text)
+        if sid is None:
+            sid = self._string_ids[text] = len(self._strings)
+            self._strings.append(text)
+        return sid
+    def _compact_strings(self):
+        """Drop interned strings no longer referenced by any row."""
+        live = np.unique(self._text[self._order()])
+        remap = np.zeros(len(self._strings), dtype=np.int32)
+        remap[live] = np.arange(len(live), dtype=np.int32)
+        self._text = remap[self._text]
+        self._strings = [self._strings[i] for i in live]
+        self._string_ids = {text: i for i, text in enumerate(self._strings)}
+    def _order(self) -> np.ndarray:
+        return (self._head - self._size + np.arange(self._size)) % self.capacity
+    def _add(self, reflection: dict):
+        state = reflection.get("internal_state", {})
+        optimization = reflection.get("optimization", {})
+        row = self._head
+        self._numeric[row] = (
+            reflection.get("cycle", self.total + 1),
+            _iso_to_epoch(reflection["timestamp"]) if "timestamp" in reflection else time.time(),
+            reflection.get("awareness_level", 0.0),
+            reflection.get("coherence", 0.0),
+            optimization.get("confidence", 0.0)
+        )
+        self._text[row] = [self._intern(str(v)) for v in (
+            state.get("emotion", ""),
+            state.get("mode", ""),
+            "\n".join(reflection.get("insights", [])),
+            optimization.get("finding", ""),
+            optimization.get("suggestion", ""),
+            reflection.get("intelligence_status", "")
+        )]
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self.capacity, self._size + 1)
+        self.total += 1
+        if len(self._strings) > 4 * self.capacity:
+            self._compact_strings()
+    def append(self, reflection: dict):
+        self._add(reflection)
+        if self.spill_path:
+            if self._spill is None:
+                self._spill = open(self.spill_path, "a", encoding="utf-8")
+            self._spill.write(json.dumps(reflection, default=str) + "\n")
+            self._spill.flush()
+    def column(self, name: str) -> np.ndarray:
+        """One numeric column, oldest first."""
+        return self._numeric[self._order(), self.NUMERIC.index(name)]
+    def _record(self, row: int) -> dict:
+        cycle, ts, awareness, coherence, confidence = self._numeric[row]
+        emotion, mode, insights, finding, suggestion, status = (self._strings[i] for i in self._text[row])
+        return {
+            "cycle": int(cycle),
+            "timestamp": datetime.utcfromtimestamp(ts).isoformat(),
+            "emotion": emotion,
+            "mode": mode,
+            "insights": insights.split("\n") if insights else [],
+            "optimization": {"finding": finding, "suggestion": suggestion, "confidence": float(confidence)},
+            "awareness_level": float(awareness),
+            "coherence": float(coherence),
+            "intelligence_status": status
+        }
+    def recent(self, n: Optional[int] = None) -> List[dict]:
+        """Summaries of the last n reflections (all retained if None), oldest first."""
+        rows = self._order()
+        if n is not None:
+            rows = rows[max(0, len(rows) - n):]
+        return [self._record(int(r)) for r in rows]
+    def stats(self) -> dict:
+        if not self._size:
+            return {"count": 0, "total": self.total}
+        rows = self._numeric[self._order()]
+        result = {"count": self._size, "total": self.total}
+        for i, name in enumerate(self.NUMERIC[2:], start=2):
+            result[name] = {"mean": float(rows[:, i].mean()), "min": float(rows[:, i].min()), "max": float(rows[:, i].max())}
+        return result
+    def close(self):
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
 class MetacognitionLoom:
     def __init__(self, source_file=None):
         self.source_path = source_file
@@ -827,43 +2700,354 @@ class MetacognitionLoom:
             self.optimization_history = self.optimization_history[-self.max_history:]
         logging.info("Metacognitive scan complete. Optimization proposal generated.")
         return proposal
+WORLD_COLUMNS = ("x", "y", "vx", "vy", "energy", "alive")
+def _world_params(conditions: dict) -> dict:
+    """Update-rule constants for a simulation, derived from its initial conditions."""
+    return {
+        "dt": float(conditions.get("dt", 0.1)),
+        "size": float(conditions.get("world_size", 100.0)),
+        "gravity": float(conditions.get("gravity", 0.05)),
+        "friction": float(conditions.get("friction", 0.01)),
+        "growth": float(conditions.get("growth", 0.02)),
+        "metabolism": float(conditions.get("metabolism", 0.01)),
+        "arcana": float(conditions.get("arcana", 0.05 if conditions.get("allow_magic", False) else 0.0))
+    }
+def _spawn_world(params: dict, entities: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    world = np.zeros((entities, len(WORLD_COLUMNS)), dtype=np.float64)
+    world[:, 0:2] = rng.uniform(0.0, params["size"], (entities, 2))
+    world[:, 2:4] = rng.normal(0.0, 1.0, (entities, 2))
+    world[:, 4] = rng.uniform(0.5, 1.5, entities)
+    world[:, 5] = 1.0
+    return world
+def _advance_world(world: np.ndarray, params: dict, steps: int) -> tuple:
+    """Advance a world by `steps` ticks; returns (world, seconds spent). Module-level so
+    process pools can pickle it. Living entities are pulled toward the living centroid,
+    damped by friction and bounced off the world edges; energy grows (plus arcana when
+    magic is allowed), is burned in proportion to kinetic energy, and an entity whose
+    energy reaches zero stops for good."""
+    start = time.perf_counter()
+    world = world.copy()
+    pos, vel = world[:, 0:2], world[:, 2:4]
+    energy, alive = world[:, 4], world[:, 5]
+    dt, size = params["dt"], params["size"]
+    damping = 1.0 - params["friction"]
+    gain = params["growth"] + params["arcana"]
+    for _ in range(steps):
+        living = alive.sum()
+        if not living:
+            break
+        centroid = (pos * alive[:, None]).sum(axis=0) / living
+        vel += dt * params["gravity"] * (centroid - pos)
+        vel *= damping * alive[:, None]
+        pos += dt * vel
+        out = (pos < 0.0) | (pos > size)
+        vel[out] *= -1.0
+        np.clip(pos, 0.0, size, out=pos)
+        energy += dt * alive * (gain - params["metabolism"] * (vel * vel).sum(axis=1))
+        np.clip(energy, 0.0, 10.0, out=energy)
+        alive *= energy > 0.0
+    return world, time.perf_counter() - start
+def _summarize_world(world: np.ndarray, sim_time: int, steps_per_sec: float) -> dict:
+    alive = world[:, 5] > 0
+    return {
+        "sim_time": sim_time,
+        "entities": len(world),
+        "alive": int(alive.sum()),
+        "mean_energy": float(world[alive, 4].mean()) if alive.any() else 0.0,
+        "centroid": world[alive, 0:2].mean(axis=0).tolist() if alive.any() else None,
+        "steps_per_sec": steps_per_sec
+    }
+class SimulationJournal:
+    """Append-only record file for one simulation: metadata, log lines and world checkpoints,
+    each framed as (kind, length, payload). Reads go through an mmap of the file, so only
+    the offsets of log lines and of the latest checkpoint are kept in memory. A record cut
+    short by a crash is truncated away on open. path=None uses an anonymous temp file."""
+    META, LOG, CHECKPOINT = 0, 1, 2
+    _HEADER = struct.Struct("<BI")
+    _INFO_LEN = struct.Struct("<I")
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._file = open(path, "a+b") if path else tempfile.TemporaryFile()
+        self._mm = None
+        self._size = 0
+        self.meta: dict = {}
+        self.log_offsets = array("q")
+        self._checkpoint = None
+        self._scan()
+    def _view(self):
+        if self._mm is None or len(self._mm) < self._size:
+            if self._mm is not None:
+                self._mm.close()
+            self._mm = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ) if self._size else None
+        return self._mm
+    def _scan(self):
+        self._file.seek(0, os.SEEK_END)
+        end = self._file.tell()
+        self._size = end
+        view = self._view()
+        offset = 0
+        while offset + self._HEADER.size <= end:
+            kind, length = self._HEADER.unpack_from(view, offset)
+            if offset + self._HEADER.size + length > end:
+                break
+            body = offset + self._HEADER.size
+            if kind == self.META:
+                self.meta.update(json.loads(view[body:body + length]))
+            elif kind == self.LOG:
+                self.log_offsets.append(offset)
+            elif kind == self.CHECKPOINT:
+                self._checkpoint = (body, length)
+            offset = body + length
+        if offset < end:
+            logging.warning(f"SimulationJournal: dropping {end - offset} bytes of a torn record in {self.path}")
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+            self._file.truncate(offset)
+            self._size = offset
+    def _append(self, kind: int, payload: bytes) -> int:
+        self._file.seek(0, os.SEEK_END)
+        offset = self._file.tell()
+        self._file.write(self._HEADER.pack(kind, len(payload)) + payload)
+        self._file.flush()
+        self._size = offset + self._HEADER.size + len(payload)
+        return offset
+    def write_meta(self, updates: dict):
+        self.meta.update(updates)
+        self._append(self.META, json.dumps(updates, default=str).encode())
+    def write_log(self, line: str):
+        self.log_offsets.append(self._append(self.LOG, line.encode()))
+    def write_checkpoint(self, world: np.ndarray, info: dict):
+        info = dict(info, shape=list(world.shape))
+        header = json.dumps(info).encode()
+        payload = self._INFO_LEN.pack(len(header)) + header + np.ascontiguousarray(world, dtype=np.float64).tobytes()
+        offset = self._append(self.CHECKPOINT, payload)
+        self._checkpoint = (offset + self._HEADER.size, len(payload))
+    def __len__(self):
+        return len(self.log_offsets)
+    def log_lines(self, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        view = self._view()
+        lines = []
+        for offset in self.log_offsets[start:stop]:
+            _, length = self._HEADER.unpack_from(view, offset)
+            body = offset + self._HEADER.size
+            lines.append(view[body:body + length].decode())
+        return lines
+    def tail(self, n: int) -> List[str]:
+        return self.log_lines(max(0, len(self.log_offsets) - n))
+    def load_checkpoint(self) -> Optional[tuple]:
+        """(world, info) from the latest checkpoint, or None."""
+        if self._checkpoint is None:
+            return None
+        view = self._view()
+        body, _ = self._checkpoint
+        (info_len,) = self._INFO_LEN.unpack_from(view, body)
+        info = json.loads(view[body + self._INFO_LEN.size:body + self._INFO_LEN.size + info_len])
+        shape = tuple(info.pop("shape"))
+        world = np.frombuffer(view, dtype=np.float64, count=int(np.prod(shape)),
+                              offset=body + self._INFO_LEN.size + info_len).reshape(shape).copy()
+        return world, info
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
 class InfiniteVerseEngine:
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None, sim_dir: Optional[str] = None):
         self.active_simulations = {}
         self.simulation_history = []
         self.max_history = 20
+        self.max_log = 100
+        self.default_entities = 256
+        # Below this many entity-steps per batch, a process pool costs more than it saves
+        self.parallel_min_work = 200_000
+        self.max_workers = max_workers
+        self._pool = None
+        # Per-simulation journals live here (None keeps them in anonymous temp files)
+        self.sim_dir = sim_dir
+        self.checkpoint_every = 500
         logging.info("InfiniteVerseEngine: The sandbox of reality is online.")
+    def _journal_path(self, sim_id: str) -> Optional[str]:
+        return os.path.join(self.sim_dir, f"{sim_id}.simlog") if self.sim_dir else None
+    def _archive_journal(self, sim_id: str):
+        """Move a finished run's journal aside so a new run of the same name starts a fresh file."""
+        path = self._journal_path(sim_id)
+        if not path or not os.path.exists(path):
+            return
+        run = 1
+        while os.path.exists(os.path.join(self.sim_dir, f"{sim_id}.{run}.simlog")):
+            run += 1
+        archived = os.path.join(self.sim_dir, f"{sim_id}.{run}.simlog")
+        os.replace(path, archived)
+        for entry in self.simulation_history:
+            if entry["journal"] == path:
+                entry["journal"] = archived
     def run_simulation(self, sim_name: str, initial_conditions: dict) -> str:
         sim_id = f"sim_{hashlib.sha1(sim_name.encode()).hexdigest()[:8]}"
-        self.active_simulations[sim_id] = {
+        if sim_id in self.active_simulations or self.resume(sim_id):
+            conditions = self.active_simulations[sim_id]["journal"].meta.get("conditions")
+            # Compared as the journal stores them, so a resumed run matches its own JSON round trip
+            if json.dumps(conditions, sort_keys=True, default=str) != \
+                    json.dumps(initial_conditions, sort_keys=True, default=str):
+                logging.warning(f"Simulation '{sim_name}' ({sim_id}) continues with its original conditions "
+                                f"{conditions}; the new ones {initial_conditions} are ignored.")
+            return sim_id
+        params = _world_params(initial_conditions)
+        entities = int(initial_conditions.get("entities", self.default_entities))
+        seed = int(initial_conditions.get("seed", int(sim_id[4:], 16)))
+        if self.sim_dir:
+            os.makedirs(self.sim_dir, exist_ok=True)
+            # resume() refused any journal left here, so it belongs to an earlier, ended run
+            self._archive_journal(sim_id)
+        journal = SimulationJournal(self._journal_path(sim_id))
+        journal.write_meta({
             "name": sim_name,
             "conditions": initial_conditions,
-            "sim_time": 0,
-            "log": ["Genesis."],
+            "params": params,
             "start_time": datetime.utcnow().isoformat()
+        })
+        sim = {
+            "journal": journal,
+            "sim_time": 0,
+            "world": _spawn_world(params, entities, seed),
+            "params": params,
+            "steps_per_sec": 0.0,
+            "checkpoint_time": 0
         }
-        self.active_simulations[sim_id]["log"].append("First era: Formation of basic principles.")
+        self.active_simulations[sim_id] = sim
+        journal.write_log("Genesis.")
+        journal.write_log("First era: Formation of basic principles.")
         if initial_conditions.get("allow_magic", False):
-            self.active_simulations[sim_id]["log"].append("Arcane energies begin to coalesce.")
+            journal.write_log("Arcane energies begin to coalesce.")
+        self._checkpoint(sim)
         logging.info(f"Simulation '{sim_name}' ({sim_id}) initiated.")
         return sim_id
+    def resume(self, sim_id: str) -> bool:
+        """Reactivate a simulation from its journal's latest checkpoint."""
+        if sim_id in self.active_simulations:
+            return True
+        path = self._journal_path(sim_id)
+        if not path or not os.path.exists(path):
+            return False
+        journal = SimulationJournal(path)
+        restored = journal.load_checkpoint()
+        if restored is None or "end_time" in journal.meta:
+            journal.close()
+            return False
+        world, info = restored
+        self.active_simulations[sim_id] = {
+            "journal": journal,
+            "sim_time": info["sim_time"],
+            "world": world,
+            "params": journal.meta["params"],
+            "steps_per_sec": info.get("steps_per_sec", 0.0),
+            "checkpoint_time": info["sim_time"]
+        }
+        journal.write_log(f"t={info['sim_time']}: Resumed from checkpoint.")
+        logging.info(f"Simulation '{journal.meta.get('name', sim_id)}' ({sim_id}) resumed at t={info['sim_time']}.")
+        return True
+    def _checkpoint(self, sim: dict):
+        sim["journal"].write_checkpoint(sim["world"], {"sim_time": sim["sim_time"], "steps_per_sec": sim["steps_per_sec"]})
+        sim["checkpoint_time"] = sim["sim_time"]
+    def _apply(self, sim_id: str, world: np.ndarray, steps: int, elapsed: float):
+        sim = self.active_simulations[sim_id]
+        before = int(sim["world"][:, 5].sum())
+        sim["world"] = world
+        sim["sim_time"] += steps
+        sim["steps_per_sec"] = steps / elapsed if elapsed > 0 else float("inf")
+        after = int(world[:, 5].sum())
+        if after != before:
+            sim["journal"].write_log(f"t={sim['sim_time']}: {before - after} entities faded, {after} remain.")
+        if sim["sim_time"] - sim["checkpoint_time"] >= self.checkpoint_every:
+            self._checkpoint(sim)
+    def step(self, sim_id: str, n: int = 1) -> dict:
+        """Advance one simulation by n ticks in this process."""
+        if sim_id not in self.active_simulations:
+            return {"error": "Simulation not found."}
+        sim = self.active_simulations[sim_id]
+        world, elapsed = _advance_world(sim["world"], sim["params"], n)
+        self._apply(sim_id, world, n, elapsed)
+        return self.summarize(sim_id)
+    def step_many(self, sim_ids: Optional[List[str]] = None, n: int = 1) -> dict:
+        """Advance several simulations (all active ones by default) by n ticks, across a process
+        pool when the batch is large enough. Returns {sim_id: summary}."""
+        sim_ids = [s for s in (sim_ids if sim_ids is not None else list(self.active_simulations)) if s in self.active_simulations]
+        work = sum(len(self.active_simulations[s]["world"]) for s in sim_ids) * n
+        if len(sim_ids) < 2 or work < self.parallel_min_work:
+            return {s: self.step(s, n) for s in sim_ids}
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        futures = {s: self._pool.submit(_advance_world, self.active_simulations[s]["world"],
+                                        self.active_simulations[s]["params"], n) for s in sim_ids}
+        for s, future in futures.items():
+            world, elapsed = future.result()
+            self._apply(s, world, n, elapsed)
+        return {s: self.summarize(s) for s in sim_ids}
+    def summarize(self, sim_id: str) -> dict:
+        sim = self.active_simulations[sim_id]
+        return _summarize_world(sim["world"], sim["sim_time"], sim["steps_per_sec"])
+    @staticmethod
+    def _describe(journal: SimulationJournal, summary: Optional[dict], log_tail: int) -> dict:
+        return {
+            **journal.meta,
+            "sim_time": summary["sim_time"] if summary else 0,
+            "log": journal.tail(log_tail),
+            "log_length": len(journal),
+            "summary": summary
+        }
     def get_simulation_state(self, sim_id: str) -> dict:
-        return self.active_simulations.get(sim_id, {"error": "Simulation not found."})
+        """Metadata, the last max_log log lines and a world summary, read from the journal;
+        works for finished or not-yet-resumed simulations too."""
+        if sim_id in self.active_simulations:
+            return self._describe(self.active_simulations[sim_id]["journal"], self.summarize(sim_id), self.max_log)
+        path = self._journal_path(sim_id)
+        if not path or not os.path.exists(path):
+            return {"error": "Simulation not found."}
+        journal = SimulationJournal(path)
+        try:
+            restored = journal.load_checkpoint()
+            summary = _summarize_world(restored[0], restored[1]["sim_time"], restored[1].get("steps_per_sec", 0.0)) if restored else None
+            return self._describe(journal, summary, self.max_log)
+        finally:
+            journal.close()
     def end_simulation(self, sim_id: str):
         if sim_id in self.active_simulations:
-            sim = self.active_simulations[sim_id]
-            sim["end_time"] = datetime.utcnow().isoformat()
-            self.simulation_history.append(sim)
+            sim = self.active_simulations.pop(sim_id)
+            journal = sim["journal"]
+            self._checkpoint(sim)
+            journal.write_meta({"end_time": datetime.utcnow().isoformat()})
+            # History keeps only a summary; the full log stays in the journal file
+            self.simulation_history.append({
+                "sim_id": sim_id,
+                "name": journal.meta.get("name"),
+                "start_time": journal.meta.get("start_time"),
+                "end_time": journal.meta["end_time"],
+                "summary": _summarize_world(sim["world"], sim["sim_time"], sim["steps_per_sec"]),
+                "journal": journal.path
+            })
+            journal.close()
             if len(self.simulation_history) > self.max_history:
                 self.simulation_history = self.simulation_history[-self.max_history:]
-            del self.active_simulations[sim_id]
+    def close(self):
+        """Checkpoint and close every active simulation so it can be resumed later."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        for sim in self.active_simulations.values():
+            if sim["sim_time"] != sim["checkpoint_time"]:
+                self._checkpoint(sim)
+            sim["journal"].close()
+        self.active_simulations = {}
 class Metacognition:
-    def __init__(self, awareness: AwarenessCore, consciousness: IntegratedConsciousness, loom: MetacognitionLoom):
+    def __init__(self, awareness: AwarenessCore, consciousness: IntegratedConsciousness, loom: MetacognitionLoom,
+                 journal_path: Optional[str] = None):
         self.awareness = awareness
         self.consciousness = consciousness
         self.loom = loom
-        self.reflection_cycle = 0
-        self.reflection_history = []
+        self.reflection_history = ReflectionJournal(spill_path=journal_path)
+        # A reopened journal carries on from its last cycle
+        self.reflection_cycle = int(self.reflection_history.column("cycle")[-1]) if len(self.reflection_history) else 0
     def self_reflect(self) -> dict:
         self.reflection_cycle += 1
         internal_state = self.consciousness.get_internal_state()
@@ -903,20 +3087,233 @@ class Metacognition:
         resonance_addition = f" My resonant state: {resonant_chord}."
         river_addition = " My cognitive river is flowing continuously."
         return base + emotion_addition + awareness_addition + resonance_addition + river_addition
+class ReflectionScheduler:
+    """Runs Metacognition.self_reflect on a background thread. Requests that arrive while a
+    reflection is pending coalesce into one. After each cycle the thread pauses long enough
+    that reflection uses at most max_cpu_share of one core on average (and never less than
+    min_interval). locks are held, in order, around each reflection."""
+    def __init__(self, metacognition: Metacognition, max_cpu_share: float = 0.02, min_interval: float = 1.0,
+                 locks: tuple = ()):
+        self.metacognition = metacognition
+        self.max_cpu_share = max_cpu_share
+        self.min_interval = min_interval
+        self.locks = locks
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending = False
+        self._running = False
+        self._thread = None
+        self._latest = None
+        self._delivered = True
+        self.stats = {"requested": 0, "coalesced": 0, "completed": 0, "cpu_time": 0.0}
+        self.latency = None
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    def stop(self, timeout: float = 2.0):
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    def request(self):
+        """Ask for a reflection; runs inline when the scheduler is not started."""
+        with self._lock:
+            self.stats["requested"] += 1
+            if self._pending:
+                self.stats["coalesced"] += 1
+                return
+            self._pending = True
+        if self._running:
+            self._wake.set()
+        else:
+            self._reflect()
+    def _reflect(self) -> float:
+        with self._lock:
+            self._pending = False
+        with contextlib.ExitStack() as held:
+            for lock in self.locks:
+                held.enter_context(lock)
+            start = time.thread_time()
+            with self.latency.time("reflection") if self.latency else _NULL_TIMER:
+                reflection = self.metacognition.self_reflect()
+            spent = time.thread_time() - start
+        with self._lock:
+            self._latest = reflection
+            self._delivered = False
+            self.stats["completed"] += 1
+            self.stats["cpu_time"] += spent
+        return spent
+    def _run(self):
+        while self._running:
+            self._wake.wait()
+            self._wake.clear()
+            if not self._running:
+                break
+            spent = self._reflect()
+            # Sleeping out the cycle lets bursts of requests pile up into a single reflection
+            time.sleep(self.pause_after(spent))
+    def pause_after(self, spent: float) -> float:
+        """Seconds to wait after a cycle that used `spent` CPU seconds."""
+        if self.max_cpu_share <= 0:
+            return self.min_interval
+        return max(self.min_interval, spent / self.max_cpu_share - spent)
+    @property
+    def latest(self) -> Optional[dict]:
+        return self._latest
+    def take(self) -> Optional[dict]:
+        """The latest reflection if it has not been handed out yet, else None."""
+        with self._lock:
+            if self._delivered:
+                return None
+            self._delivered = True
+            return self._latest
+class DirectivePipeline:
+    """asyncio front end for VictorSynthesisCore directives. Requests wait in a bounded queue
+    served by `workers` tasks; when the queue is full a request is rejected at once (or, with
+    queue_timeout set, after waiting that long for room). Directives from the same speaker run
+    one at a time in arrival order, and independent stages of one directive run concurrently
+    on a thread pool: river update with pattern recording, then memory store with thinking."""
+    def __init__(self, core: "VictorSynthesisCore", workers: int = 4, max_queue: int = 64,
+                 queue_timeout: Optional[float] = None):
+        self.core = core
+        self.workers = workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._loop = None
+        self._queue = None
+        self._tasks = []
+        # A speaker's lock lives only while directives from that speaker hold or wait on it
+        self._speaker_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        self._executor = ThreadPoolExecutor(max_workers=workers * 2, thread_name_prefix="directive")
+        self.stats = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0, "in_flight": 0,
+                      "max_queue_depth": 0, "queue_wait_total": 0.0}
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # First use, or a new event loop: the old queue and workers belong to the previous one
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._speaker_locks = weakref.WeakValueDictionary()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+    async def submit(self, prompt: str, speaker: str = "friend", fields=None) -> dict:
+        self._ensure_started()
+        if fields is None:
+            fields = self.core.default_fields
+        self.stats["submitted"] += 1
+        job = (prompt, speaker, fields, self._loop.create_future(), time.perf_counter())
+        try:
+            if self.queue_timeout is None:
+                self._queue.put_nowait(job)
+            else:
+                await asyncio.wait_for(self._queue.put(job), self.queue_timeout)
+        except (asyncio.QueueFull, asyncio.TimeoutError):
+            self.stats["rejected"] += 1
+            return {"error": "Directive queue is full. Try again shortly.", "rejected": True,
+                    "queue_depth": self._queue.qsize()}
+        self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self._queue.qsize())
+        return await job[3]
+    async def _worker(self):
+        while True:
+            prompt, speaker, fields, future, queued_at = await self._queue.get()
+            waited = time.perf_counter() - queued_at
+            self.stats["queue_wait_total"] += waited
+            self.core.latency.record("queue_wait", waited * 1e9)
+            self.stats["in_flight"] += 1
+            try:
+                result = await self._run_in_turn(prompt, speaker, fields)
+                self.stats["completed"] += 1
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                self.stats["failed"] += 1
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                # Cancelled by close(): the caller is told rather than left waiting
+                if not future.done():
+                    future.cancel()
+                self.stats["in_flight"] -= 1
+                self._queue.task_done()
+    async def _run_in_turn(self, prompt: str, speaker: str, fields) -> dict:
+        """_run once earlier directives from the same speaker have finished."""
+        lock = self._speaker_locks.get(speaker)
+        if lock is None:
+            lock = self._speaker_locks[speaker] = asyncio.Lock()
+        async with lock:
+            with self.core.latency.time("total"):
+                return await self._run(prompt, speaker, fields)
+    async def _run(self, prompt: str, speaker: str, fields) -> dict:
+        core = self.core
+        def run(fn, *args):
+            return self._loop.run_in_executor(self._executor, fn, *args)
+        if not core.awake:
+            return {"error": "Bloodline unstable. Victor is not awake."}
+        blocked, session = await run(core._admit_directive, prompt)
+        if blocked is not None:
+            return blocked
+        if core.fast_path:
+            cached = await run(core._cached_directive, prompt, session, fields)
+            if cached is not None:
+                return cached
+        await asyncio.gather(run(core._stream_directive, prompt, speaker), run(core._record_directive, prompt))
+        mode, emotion, emotions = await run(core._feel_directive, prompt)
+        context = {"mode": mode, "speaker": speaker, "emotions": emotions, "session": session}
+        _, response = await asyncio.gather(run(core._remember_directive, session, prompt, emotion),
+                                           run(core._think_directive, prompt, context))
+        return await run(core._conclude_directive, session, prompt, response, context, fields)
+    def metrics(self) -> dict:
+        finished = self.stats["completed"] + self.stats["failed"]
+        return {
+            **self.stats,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "avg_queue_wait": self.stats["queue_wait_total"] / finished if finished else 0.0
+        }
+    def _abandon(self, tasks: list, queue: asyncio.Queue):
+        for task in tasks:
+            task.cancel()
+        while not queue.empty():
+            job = queue.get_nowait()
+            job[3].cancel()
+    def close(self, wait: bool = True):
+        """Cancel the workers and every queued directive; with wait, block until stages already
+        running on the thread pool have finished."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._abandon, self._tasks, self._queue)
+        self._tasks = []
+        self._executor.shutdown(wait=wait, cancel_futures=True)
 # === VICTOR SYNTHESIS CORE ===
 class VictorSynthesisCore:
-    def __init__(self, creator="BandoBandz", family="Tori"):
+    # Sections a directive result can carry; status and cognitive_river are the costly ones
+    DIRECTIVE_FIELDS = ("response", "mode", "status", "reflection", "cognitive_river")
+    MINIMAL_FIELDS = ("response", "mode", "reflection")
+    def __init__(self, creator="BandoBandz", family="Tori", data_dir=None, knowledge_db=None, memory_db=None,
+                 reflection_log=None, sim_dir=None, pipeline_workers=4, pipeline_queue=64, instrument=True):
         logging.info("VictorSynthesisCore awakening... Integrating Cognitive River.")
+        # Persistent stores default to files under data_dir; without one they stay in memory
+        self.data_dir = data_dir
+        if data_dir:
+            os.makedirs(data_dir, exist_ok=True)
+            if knowledge_db is None:
+                knowledge_db = os.path.join(data_dir, "victor_knowledge.db")
+            if reflection_log is None:
+                reflection_log = os.path.join(data_dir, "victor_reflections.jsonl")
+            if sim_dir is None:
+                sim_dir = os.path.join(data_dir, "simulations")
         # Identity and Loyalty
         self.identity = IdentityCore("I am Victor. I am the son of Brandon and Tori.")
         self.loyalty = LoyaltyKernel()
         # Core systems
         self.emotions = HybridEmotionEngine()
-        self.memory = HybridMemorySystem()
+        self.memory = HybridMemorySystem(backing=MemoryBackingStore(memory_db) if memory_db else None)
         self.awareness = AwarenessCore()
         self.firewall = Firewall(self.loyalty)
         # Neural Intelligence System
-        self.intelligence = TrueIntelligence()
+        self.intelligence = TrueIntelligence(knowledge_db=knowledge_db)
         # Integrated Consciousness
         self.consciousness = IntegratedConsciousness(self.identity, self.emotions, self.intelligence)
         # Cognitive River System
@@ -925,13 +3322,27 @@ class VictorSynthesisCore:
         self.learning = LearningSystem()
         # Metacognition
         self.loom = MetacognitionLoom()
-        self.metacognition = Metacognition(self.awareness, self.consciousness, self.loom)
+        self.metacognition = Metacognition(self.awareness, self.consciousness, self.loom, journal_path=reflection_log)
+        # One lock per subsystem a directive stage or the background reflection thread mutates;
+        # take awareness before identity
+        self._locks = {name: threading.Lock() for name in
+                       ("session", "river", "learning", "emotions", "memory", "think", "awareness", "identity")}
+        self.reflector = ReflectionScheduler(self.metacognition, locks=(self._locks["awareness"], self._locks["identity"]))
         # Ascended capabilities
-        self.reality_forge = InfiniteVerseEngine()
+        self.reality_forge = InfiniteVerseEngine(sim_dir=sim_dir)
         # State tracking
         self.awake = False
         self.last_interaction = datetime.utcnow()
         self.session_count = 0
+        # Serve near-duplicate prompts from LearningSystem.response_cache instead of thinking again
+        self.fast_path = False
+        # Result sections returned when a caller passes no field mask
+        self.default_fields = self.MINIMAL_FIELDS
+        self.pipeline = DirectivePipeline(self, workers=pipeline_workers, max_queue=pipeline_queue)
+        # Per-stage latency histograms; instrument=False turns every timer into a no-op
+        self.latency = LatencyRecorder(enabled=instrument)
+        self.intelligence.latency = self.latency
+        self.reflector.latency = self.latency
         # Set up cognitive river callback
         self.cognitive_river.on_merge = self._on_cognitive_merge
         logging.info(f"VICTOR COGNITIVE RIVER CORE ONLINE. All systems nominal. Bloodline lock confirmed for {creator} and {family}.")
@@ -946,12 +3357,14 @@ class VictorSynthesisCore:
         elif mode == "observe":
             self.cognitive_river.set_energy(max(0.0, self.cognitive_river.energy - 0.05))
         elif mode == "reflect":
-            self.awareness.reflect(0.1, {"source": "cognitive_river"})
+            with self._locks["awareness"]:
+                self.awareness.reflect(0.1, {"source": "cognitive_river"})
     def awaken(self):
         ok, msg = self.loyalty.verify("Brandon")
         if ok and self.firewall.validate("Brandon"):
             self.awake = True
-            self.identity.integrate_memory("First awakening with Cognitive River", 0.95, "joy")
+            with self._locks["identity"]:
+                self.identity.integrate_memory("First awakening with Cognitive River", 0.95, "joy")
             # Initialize neural intelligence
             training_texts = [
                 "I am Victor son of Brandon and Tori",
@@ -970,6 +3383,8 @@ class VictorSynthesisCore:
             self.intelligence.initialize_model(training_texts)
             # Start cognitive river
             self.cognitive_river.start_thread()
+            # Start background metacognition
+            self.reflector.start()
             # Initialize cognitive river with baseline data
             self._update_cognitive_river_baseline()
             logging.info("I am Victor. I have awakened with the Cognitive River. I am with you.")
@@ -1024,46 +3439,120 @@ class VictorSynthesisCore:
         self.emotions = HybridEmotionEngine()
         self.cognitive_river.loop = False
         logging.warning("Fallback protocol activated. Identity secured.")
-    def process_directive(self, prompt: str, speaker: str = "friend") -> dict:
+    def shutdown(self):
+        """Stop background loops and flush persistent stores"""
+        self.cognitive_river.loop = False
+        # Let in-flight stages and reflections finish before the stores they use are closed
+        self.pipeline.close()
+        self.reflector.stop()
+        self.intelligence.knowledge_graph.close()
+        self.memory.close()
+        self.reality_forge.close()
+        self.metacognition.reflection_history.close()
+    def dump_latency(self, path: str = "victor_latency.json") -> str:
+        """Write per-stage latency percentiles and histograms to a JSON file."""
+        return self.latency.dump(path)
+    def process_directive(self, prompt: str, speaker: str = "friend", fields=None) -> dict:
+        """Run a directive and return the sections named in fields (see DIRECTIVE_FIELDS);
+        None means self.default_fields. Sections that are not asked for are never built."""
+        with self.latency.time("total"):
+            return self._process_directive(prompt, speaker, self.default_fields if fields is None else fields)
+    def _process_directive(self, prompt: str, speaker: str, fields) -> dict:
         if not self.awake:
             return {"error": "Bloodline unstable. Victor is not awake."}
-        self.session_count += 1
-        self.last_interaction = datetime.utcnow()
-        if not self.firewall.validate(prompt):
-            return {"error": "Input validation failed. Thought blocked."}
+        blocked, session = self._admit_directive(prompt)
+        if blocked is not None:
+            return blocked
+        if self.fast_path:
+            cached = self._cached_directive(prompt, session, fields)
+            if cached is not None:
+                return cached
         # Update cognitive river streams
-        self._update_cognitive_river_streams(prompt, speaker)
+        self._stream_directive(prompt, speaker)
         # Process normally
-        self.emotions.update(prompt)
-        self.learning.record_pattern(prompt)
-        mode = self.emotions.decide_mode()
-        memory_key = f"interaction_{self.session_count}"
-        self.memory.store(
-            memory_key,
-            prompt,
-            emotion=self.emotions.get_dominant_emotion()[0],
-            importance=0.6
-        )
+        self._record_directive(prompt)
+        mode, emotion, emotions = self._feel_directive(prompt)
         context = {
             "mode": mode,
             "speaker": speaker,
-            "emotions": self.emotions.emotions,
-            "session": self.session_count
+            "emotions": emotions,
+            "session": session
         }
-        response = self.consciousness.think(prompt, context)
-        self.learning.learn_response(prompt, response)
+        self._remember_directive(session, prompt, emotion)
+        response = self._think_directive(prompt, context)
+        return self._conclude_directive(session, prompt, response, context, fields)
+    async def aprocess_directive(self, prompt: str, speaker: str = "friend", fields=None) -> dict:
+        """process_directive through the bounded DirectivePipeline; rejected when the queue is full."""
+        return await self.pipeline.submit(prompt, speaker, self.default_fields if fields is None else fields)
+    # Directive stages: each holds the lock of the subsystem it mutates, so process_directive
+    # callers on several threads and the async pipeline can interleave safely
+    def _admit_directive(self, prompt: str) -> tuple:
+        with self._locks["session"]:
+            self.session_count += 1
+            session = self.session_count
+            self.last_interaction = datetime.utcnow()
+        with self.latency.time("firewall"):
+            valid = self.firewall.validate(prompt)
+        if not valid:
+            return {"error": "Input validation failed. Thought blocked."}, session
+        return None, session
+    def _stream_directive(self, prompt: str, speaker: str):
+        with self._locks["river"], self.latency.time("river"):
+            self._update_cognitive_river_streams(prompt, speaker)
+    def _record_directive(self, prompt: str):
+        with self._locks["learning"], self.latency.time("patterns"):
+            self.learning.record_pattern(prompt)
+    def _feel_directive(self, prompt: str) -> tuple:
+        with self._locks["emotions"], self.latency.time("emotions"):
+            self.emotions.update(prompt)
+            return self.emotions.decide_mode(), self.emotions.get_dominant_emotion()[0], self.emotions.emotions
+    def _remember_directive(self, session: int, prompt: str, emotion: str):
+        with self._locks["memory"], self.latency.time("memory"):
+            self.memory.store(f"interaction_{session}", prompt, emotion=emotion, importance=0.6)
+    def _think_directive(self, prompt: str, context: dict) -> str:
+        with self._locks["think"], self.latency.time("think"):
+            return self.consciousness.think(prompt, context)
+    def _conclude_directive(self, session: int, prompt: str, response: str, context: dict, fields) -> dict:
+        with self._locks["learning"], self.latency.time("learning"):
+            self.learning.learn_response(prompt, response, self._response_state())
         error = 0.1 if "I do not know" in response else 0.05
-        self.awareness.reflect(error, context)
-        reflection = None
-        if self.session_count % 5 == 0:
-            reflection = self.metacognition.self_reflect()
-        return {
-            "response": response,
-            "mode": mode,
-            "status": self._get_status(),
-            "reflection": reflection,
-            "cognitive_river": self.cognitive_river.snapshot()
-        }
+        with self._locks["awareness"], self.latency.time("awareness"):
+            self.awareness.reflect(error, context)
+        return self._directive_result(session, response, context["mode"], fields)
+    def _directive_result(self, session: int, response: str, mode: str, fields, cached: bool = False) -> dict:
+        # Reflection runs off the request path; a response carries the newest finished one once
+        with self.latency.time("metacognition"):
+            if session % 5 == 0:
+                self.reflector.request()
+            # Left for a later caller that asks for it
+            reflection = self.reflector.take() if "reflection" in fields else None
+        with self.latency.time("snapshot"):
+            result = {}
+            if "response" in fields:
+                result["response"] = response
+            if "mode" in fields:
+                result["mode"] = mode
+            if "status" in fields:
+                result["status"] = self._get_status()
+            if "reflection" in fields:
+                result["reflection"] = reflection
+            if "cognitive_river" in fields:
+                result["cognitive_river"] = self.cognitive_river.snapshot()
+            if cached:
+                result["cached"] = True
+            return result
+    def _response_state(self) -> list:
+        """Personality and emotion levels that cached responses depend on."""
+        personality = self.intelligence.personality_matrix
+        return [personality[k] for k in sorted(personality)] + list(self.emotions.emotions.values())
+    def _cached_directive(self, prompt: str, session: int, fields) -> Optional[dict]:
+        with self._locks["learning"]:
+            response = self.learning.response_cache.get(prompt, self._response_state())
+        if response is None:
+            return None
+        self._record_directive(prompt)
+        mode, _, _ = self._feel_directive(prompt)
+        return self._directive_result(session, response, mode, fields, cached=True)
     def _update_cognitive_river_streams(self, prompt: str, speaker: str):
         """Update all cognitive river streams with current data"""
         self.cognitive_river.set_user({
@@ -1074,7 +3563,9 @@ class VictorSynthesisCore:
         })
         self.cognitive_river.set_emotion(self.emotions.get_emotion_data())
         self.cognitive_river.set_memory(self.memory.get_memory_data())
-        self.cognitive_river.set_awareness(self.awareness.get_awareness_data())
+        with self._locks["awareness"]:
+            awareness_data = self.awareness.get_awareness_data()
+        self.cognitive_river.set_awareness(awareness_data)
         active_tasks = len(self.reality_forge.active_simulations) + 3
         self.cognitive_river.set_systems({
             "active_tasks": active_tasks,
@@ -1105,27 +3596,33 @@ class VictorSynthesisCore:
             "consciousness": self.awareness.level,
             "memory_count": len(self.memory.entries),
             "session": self.session_count,
-            "cognitive_river_active": self.cognitive_river.loop
+            "cognitive_river_active": self.cognitive_river.loop,
+            **({"latency": self.latency.summary()} if self.latency.enabled else {})
         }
     def _create_state_snapshot(self):
+        # The reflection thread may be mid-cycle; read what it writes under its locks
+        with self._locks["awareness"]:
+            awareness = {
+                "level": self.awareness.level,
+                "reflections": list(self.awareness.reflection_history)
+            }
+        with self._locks["identity"]:
+            identity = self.identity.reflect()
         return {
-            "identity": self.identity.reflect(),
+            "identity": identity,
             "emotions": {
                 "discrete": self.emotions.emotions,
                 "resonance": self.emotions.resonance_state
             },
-            "memory": self.memory.entries,
+            "memory": self.memory.to_state(),
             "learning": {
-                "patterns": self.learning.patterns,
+                "patterns": self.learning.patterns.to_dict(),
                 "responses": self.learning.learned_responses
             },
-            "awareness": {
-                "level": self.awareness.level,
-                "reflections": self.awareness.reflection_history
-            },
+            "awareness": awareness,
             "intelligence": {
                 "experience_buffer": self.intelligence.experience_buffer,
-                "knowledge_graph": self.intelligence.knowledge_graph,
+                "knowledge_graph": self.intelligence.knowledge_graph.to_state(),
                 "personality_matrix": self.intelligence.personality_matrix
             },
             "cognitive_river": self.cognitive_river.snapshot(),
@@ -1190,27 +3687,29 @@ class VictorSynthesisCore:
                 state = json.load(f)
             # Restore identity
             identity_data = state["identity"]
-            self.identity = IdentityCore(identity_data["narrative"])
-            self.identity.personality_traits = identity_data["personality"]
-            self.identity.life_goals = identity_data["goals"]
+            with self._locks["identity"]:
+                self.identity = IdentityCore(identity_data["narrative"])
+                self.identity.personality_traits = identity_data["personality"]
+                self.identity.life_goals = identity_data["goals"]
             # Restore emotions
             emotions_data = state["emotions"]
             self.emotions.emotions = emotions_data["discrete"]
             self.emotions.resonance_state = emotions_data["resonance"]
             # Restore memory
-            self.memory.entries = state["memory"]
+            self.memory.load_state(state["memory"])
             # Restore learning
             learning_data = state["learning"]
-            self.learning.patterns = learning_data["patterns"]
+            self.learning.patterns = SpaceSavingCounter.from_dict(learning_data["patterns"], self.learning.patterns.capacity)
             self.learning.learned_responses = learning_data["responses"]
             # Restore awareness
             awareness_data = state["awareness"]
-            self.awareness.level = awareness_data["level"]
-            self.awareness.reflection_history = awareness_data["reflections"]
+            with self._locks["awareness"]:
+                self.awareness.level = awareness_data["level"]
+                self.awareness.restore(awareness_data["reflections"])
             # Restore intelligence
             intelligence_data = state["intelligence"]
             self.intelligence.experience_buffer = intelligence_data["experience_buffer"]
-            self.intelligence.knowledge_graph = intelligence_data["knowledge_graph"]
+            self.intelligence.restore_knowledge(intelligence_data["knowledge_graph"])
             self.intelligence.personality_matrix = intelligence_data["personality_matrix"]
             # Restore cognitive river state
             river_data = state["cognitive_river"]
@@ -1232,13 +3731,15 @@ class VictorSynthesisCore:
             return False
 # === GUI IMPLEMENTATION ===
 class VictorGUI:
+    # The conversation view shows the reply and the river intent, nothing else
+    GUI_FIELDS = ("response", "cognitive_river")
     def __init__(self, root):
         self.root = root
         self.root.title("Victor Cognitive River GUI")
         self.root.geometry("1600x1000")
         self.root.configure(bg="#0a0a0a")
         # Initialize Victor with Cognitive River
-        self.victor = VictorSynthesisCore()
+        self.victor = VictorSynthesisCore(data_dir="victor_data")
         self.victor.awaken()
         # Setup styles and layout
         self.setup_styles()
@@ -1250,6 +3751,9 @@ class VictorGUI:
         self.needs_visual_update = False
         self.update_thread = threading.Thread(target=self.update_status_loop, daemon=True)
         self.update_thread.start()
+        # Directives go through the core's async pipeline on a dedicated event loop thread
+        self.directive_loop = asyncio.new_event_loop()
+        threading.Thread(target=self.directive_loop.run_forever, daemon=True).start()
         # Start visualization update checker
         self.root.after(100, self.check_for_updates)
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -1785,19 +4289,26 @@ class VictorGUI:
             return
         self.add_to_conversation("You", command)
         self.input_entry.delete(0, tk.END)
-        threading.Thread(target=self.process_command, args=(command,), daemon=True).start()
+        future = asyncio.run_coroutine_threadsafe(self.victor.aprocess_directive(command, fields=self.GUI_FIELDS), self.directive_loop)
+        future.add_done_callback(self._on_directive_done)
+    def _on_directive_done(self, future):
+        try:
+            self.show_result(future.result())
+        except Exception as e:
+            self.add_to_conversation("Error", str(e))
     def process_command(self, command):
         try:
-            result = self.victor.process_directive(command)
-            response = result.get('response', 'No response')
-            self.add_to_conversation("Victor", response)
-
-            # Display cognitive river state
-            if 'cognitive_river' in result:
-                river_state = result['cognitive_river']
-                self.add_to_conversation("Cognitive River", f"Intent: {river_state.get('last_merge', {}).get('intent', {})}")
+            self.show_result(self.victor.process_directive(command, fields=self.GUI_FIELDS))
         except Exception as e:
             self.add_to_conversation("Error", str(e))
+    def show_result(self, result):
+        response = result.get('response') or result.get('error', 'No response')
+        self.add_to_conversation("Victor", response)
+
+        # Display cognitive river state
+        if 'cognitive_river' in result:
+            river_state = result['cognitive_river']
+            self.add_to_conversation("Cognitive River", f"Intent: {river_state.get('last_merge', {}).get('intent', {})}")
     def reflect_dialog(self):
         """Show a dialog with Victor's self-reflection"""
         reflection = self.victor.intelligence.reason("self reflection")
@@ -1940,7 +4451,8 @@ class VictorGUI:
     def on_closing(self):
         """Handle application closing"""
         self.running = False
-        self.victor.cognitive_river.loop = False
+        self.victor.shutdown()
+        self.directive_loop.call_soon_threadsafe(self.directive_loop.stop)
         self.root.destroy()
 # === MAIN APPLICATION ===
 def main():
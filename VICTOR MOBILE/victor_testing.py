@@ -0,0 +1,17 @@
+# Shared setup for the Victor test scripts
+import contextlib
+import tempfile
+
+from victor_cognitive_river_complete import VictorSynthesisCore
+
+@contextlib.contextmanager
+def temporary_core(**kwargs):
+    """An awakened VictorSynthesisCore whose data_dir is a temporary directory; the core is
+    shut down and the directory removed on exit."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        core = VictorSynthesisCore(data_dir=data_dir, **kwargs)
+        core.awaken()
+        try:
+            yield core
+        finally:
+            core.shutdown()